@@ -3,44 +3,160 @@ Base Agent Class
 Provides common functionality for all specialized agents
 """
 
-import json
-import uuid
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import asyncio
+import atexit
+import logging
+import threading
+import time
+import secrets
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AbstractSet, Dict, Any, List, Optional, Coroutine, Union
 from abc import ABC, abstractmethod
 
+from utils import serialization
 from utils.logger import setup_logger
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Shared event loop for agents that use async clients. It runs in a daemon
+# thread so pooled connections stay bound to one loop across sync calls, and
+# uses uvloop when installed for cheaper socket polling under many requests.
+_event_loop = None
+_event_loop_lock = threading.Lock()
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared agent event loop, starting it on first use"""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(target=_event_loop.run_forever, name="agent-event-loop", daemon=True).start()
+    return _event_loop
+
+class _LogFlusher:
+    """Background writer that serializes and emits agent log records off the hot path"""
+    
+    def __init__(self, interval: float = 0.05, batch_size: int = 64):
+        self._records = deque()
+        self._wakeup = threading.Event()
+        self._interval = interval
+        self._batch_size = batch_size
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, logger: logging.Logger, level: int, prefix: str, timestamp: str, message: str,
+               metadata: Optional[Dict[str, Any]] = None):
+        """Queue a record; it is serialized and written on the next flush"""
+        self._records.append((logger, level, prefix, timestamp, message, metadata))
+        
+        if self._thread is None:
+            self._start()
+        if len(self._records) >= self._batch_size:
+            self._wakeup.set()
+    
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="agent-log-flusher", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The thread must outlive any bad record, or every later record would queue forever
+                pass
+    
+    def flush(self):
+        """Write out every queued record
+        
+        A record whose metadata cannot be encoded is written without it, so one
+        bad record never stops the rest.
+        """
+        records = self._records
+        while records:
+            try:
+                logger, level, prefix, timestamp, message, metadata = records.popleft()
+            except IndexError:
+                break
+            
+            try:
+                line = _encode_record(prefix, timestamp, message, metadata)
+            except Exception as e:
+                line = _encode_record(prefix, timestamp, message, {"metadata_error": f"{type(e).__name__}: {e}"})
+            
+            try:
+                logger.log(level, line)
+            except Exception:
+                pass
+
+_RECORD_KEYS = frozenset(("agent_id", "agent_name", "timestamp", "message"))
+
+def _encode_record(prefix: str, timestamp: str, message: str, metadata: Optional[Dict[str, Any]]) -> str:
+    """Append the per-record fields to an agent's pre-encoded JSON prefix"""
+    if metadata and not _RECORD_KEYS.isdisjoint(metadata):
+        # Metadata overriding a standard key must replace it, so build the full record
+        log_data = serialization.loads(prefix + "}")
+        log_data.update(timestamp=timestamp, message=message)
+        log_data.update(metadata)
+        return serialization.dumps(log_data, default=str)
+    
+    # Values JSON cannot represent (sets, datetimes, objects) are logged as their str()
+    extra = "," + serialization.dumps(metadata, default=str)[1:-1] if metadata else ""
+    return f'{prefix},"timestamp":"{timestamp}","message":{serialization.dumps(message)}{extra}}}'
+
+_log_flusher = _LogFlusher()
+
+_LOG_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING}
+
+# Most recent messages kept per agent; older entries are dropped in O(1)
+MESSAGE_HISTORY_LIMIT = 1024
+
 class BaseAgent(ABC):
     """Abstract base class for all agents in the system"""
     
+    __slots__ = ("name", "role", "tools", "agent_id", "logger", "state", "message_history", "_ts_cache",
+                 "_log_prefix")
+    
     def __init__(self, name: str, role: str, tools: List[str] = None):
         self.name = name
         self.role = role
         self.tools = tools or []
-        self.agent_id = str(uuid.uuid4())
+        self.agent_id = secrets.token_hex(16)
         self.logger = setup_logger(f"agent.{name.lower().replace(' ', '_')}")
         self.state = {}
-        self.message_history = []
+        self.message_history = deque(maxlen=MESSAGE_HISTORY_LIMIT)
+        self._ts_cache = (None, "")
+        # Invariant head of every log record, encoded once without its closing brace
+        self._log_prefix = serialization.dumps({"agent_id": self.agent_id, "agent_name": self.name})[:-1]
+    
+    def utc_timestamp(self) -> str:
+        """Return the current UTC time in ISO format, reusing the formatted date within a second"""
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        cached_seconds, cached_prefix = self._ts_cache
+        
+        if seconds != cached_seconds:
+            cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+            self._ts_cache = (seconds, cached_prefix)
+        
+        return f"{cached_prefix}.{nanos // 1000:06d}"
         
     def log_message(self, message: str, level: str = "info", metadata: Dict[str, Any] = None):
         """Log a message with agent context"""
-        log_data = {
-            "agent_id": self.agent_id,
-            "agent_name": self.name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "message": message
-        }
+        log_level = _LOG_LEVELS.get(level, logging.INFO)
+        if not self.logger.isEnabledFor(log_level):
+            return
         
-        if metadata:
-            log_data.update(metadata)
-            
-        if level == "error":
-            self.logger.error(json.dumps(log_data))
-        elif level == "warning":
-            self.logger.warning(json.dumps(log_data))
-        else:
-            self.logger.info(json.dumps(log_data))
+        _log_flusher.submit(self.logger, log_level, self._log_prefix, self.utc_timestamp(), message,
+                           dict(metadata) if metadata else None)
     
     def update_state(self, key: str, value: Any):
         """Update agent state"""
@@ -54,10 +170,10 @@ class BaseAgent(ABC):
     def send_message(self, recipient_agent: str, message: Dict[str, Any]) -> Dict[str, Any]:
         """Send message to another agent"""
         message_data = {
-            "id": str(uuid.uuid4()),
+            "id": secrets.token_hex(16),
             "from": self.name,
             "to": recipient_agent,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.utc_timestamp(),
             "payload": message
         }
         
@@ -77,11 +193,28 @@ class BaseAgent(ABC):
         """Process received message - override in subclasses"""
         return {"status": "received", "message": "Message processed by base agent"}
     
-    def validate_input(self, data: Dict[str, Any], required_fields: List[str]) -> tuple[bool, str]:
-        """Validate input data has required fields"""
-        missing_fields = [field for field in required_fields if field not in data]
+    def run_async(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the shared event loop and wait for its result"""
+        loop = get_event_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("run_async cannot be called from the agent event loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def validate_input(self, data: Dict[str, Any], required_fields: Union[List[str], AbstractSet[str]]) -> tuple[bool, str]:
+        """Validate input data has required fields
         
-        if missing_fields:
+        Callers validating repeatedly can pass a prebuilt frozenset to skip the conversion.
+        """
+        required = required_fields if isinstance(required_fields, AbstractSet) else frozenset(required_fields)
+        missing = required - data.keys()
+        
+        if missing:
+            missing_fields = [field for field in required_fields if field in missing]
             error_msg = f"Missing required fields: {', '.join(missing_fields)}"
             self.log_message(error_msg, level="error")
             return False, error_msg
@@ -93,7 +226,7 @@ class BaseAgent(ABC):
         response = {
             "agent": self.name,
             "agent_id": self.agent_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.utc_timestamp(),
             "success": success
         }
         
@@ -109,6 +242,13 @@ class BaseAgent(ABC):
         """Execute primary task - must be implemented by subclasses"""
         pass
     
+    async def aexecute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Await execute_task from async code, running it in a worker thread
+        
+        execute_task blocks on run_async, so it must not run on the calling event loop.
+        """
+        return await asyncio.to_thread(self.execute_task, task_data)
+    
     def get_capabilities(self) -> Dict[str, Any]:
         """Return agent capabilities and status"""
         return {
@@ -120,6 +260,9 @@ class BaseAgent(ABC):
             "message_count": len(self.message_history)
         }
     
+    def close(self):
+        """Release resources held by the agent, such as pooled connections; override in subclasses"""
+    
     def reset_state(self):
         """Reset agent state and history"""
         self.state.clear()
@@ -127,19 +270,91 @@ class BaseAgent(ABC):
         self.log_message("Agent state reset")
 
 class AgentCommunicationHub:
-    """Central hub for inter-agent communication"""
+    """Central hub for inter-agent communication
+    
+    Each registered agent acts as an actor with its own message queue, consumed
+    by a task on the shared agent event loop. Messages to one agent are handled
+    in order while different agents process concurrently.
+    """
+    
+    __slots__ = ("agents", "queues", "logger", "_consumers", "_pool")
     
     def __init__(self):
         self.agents = {}
-        self.message_queue = []
+        self.queues = {}
         self.logger = setup_logger("communication_hub")
+        self._consumers = {}
+        # Dedicated workers for synchronous agent handlers; threads are only
+        # spawned on demand, so the cap bounds broadcast parallelism
+        self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="agent-hub")
     
     def register_agent(self, agent: BaseAgent):
         """Register an agent with the communication hub"""
         self.agents[agent.name] = agent
+        self.queues.setdefault(agent.name, asyncio.Queue())
         self.logger.info(f"Agent registered: {agent.name} ({agent.role})")
     
+    async def _consume(self, agent_name: str):
+        """Deliver queued messages to an agent one at a time"""
+        queue = self.queues[agent_name]
+        
+        while True:
+            message, reply = await queue.get()
+            try:
+                agent = self.agents[agent_name]
+                response = await asyncio.get_running_loop().run_in_executor(self._pool, agent.receive_message, message)
+                if not reply.done():
+                    reply.set_result(response)
+            except Exception as e:
+                if not reply.done():
+                    reply.set_exception(e)
+            finally:
+                queue.task_done()
+    
+    async def _deliver(self, agent_name: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Enqueue a message for an agent and wait for its response (runs on the agent loop)"""
+        if agent_name not in self._consumers:
+            self._consumers[agent_name] = asyncio.create_task(self._consume(agent_name))
+        
+        reply = asyncio.get_running_loop().create_future()
+        await self.queues[agent_name].put((message, reply))
+        return await reply
+    
+    async def _deliver_all(self, agent_names: List[str], message: Dict[str, Any]) -> List[Any]:
+        """Fan a message out to several agents concurrently (runs on the agent loop)"""
+        return await asyncio.gather(
+            *[self._deliver(agent_name, message) for agent_name in agent_names],
+            return_exceptions=True
+        )
+    
+    async def _on_agent_loop(self, coro: Coroutine) -> Any:
+        """Await a coroutine on the shared agent loop from any event loop"""
+        loop = get_event_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    def _wait(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the shared agent loop from synchronous code and wait for its result"""
+        loop = get_event_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None:
+            coro.close()
+            raise RuntimeError("Synchronous hub calls cannot be made from an event loop; await the a* variant instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
     def route_message(self, from_agent: str, to_agent: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Route message between agents, blocking until the target responds"""
+        return self._wait(self.aroute_message(from_agent, to_agent, message))
+    
+    def broadcast_message(self, from_agent: str, message: Dict[str, Any], exclude: List[str] = None) -> Dict[str, Any]:
+        """Broadcast message to all agents except excluded ones, blocking until all respond"""
+        return self._wait(self.abroadcast_message(from_agent, message, exclude))
+    
+    async def aroute_message(self, from_agent: str, to_agent: str, message: Dict[str, Any]) -> Dict[str, Any]:
         """Route message between agents"""
         if to_agent not in self.agents:
             error_msg = f"Target agent not found: {to_agent}"
@@ -147,8 +362,7 @@ class AgentCommunicationHub:
             return {"success": False, "error": error_msg}
         
         try:
-            target_agent = self.agents[to_agent]
-            response = target_agent.receive_message(message)
+            response = await self._on_agent_loop(self._deliver(to_agent, message))
             
             self.logger.info(f"Message routed from {from_agent} to {to_agent}")
             return {"success": True, "response": response}
@@ -158,21 +372,30 @@ class AgentCommunicationHub:
             self.logger.error(error_msg)
             return {"success": False, "error": error_msg}
     
-    def broadcast_message(self, from_agent: str, message: Dict[str, Any], exclude: List[str] = None) -> Dict[str, Any]:
+    async def abroadcast_message(self, from_agent: str, message: Dict[str, Any], exclude: List[str] = None) -> Dict[str, Any]:
         """Broadcast message to all agents except excluded ones"""
         exclude = exclude or [from_agent]
-        responses = {}
+        targets = [agent_name for agent_name in self.agents if agent_name not in exclude]
         
-        for agent_name, agent in self.agents.items():
-            if agent_name not in exclude:
-                try:
-                    response = agent.receive_message(message)
-                    responses[agent_name] = response
-                except Exception as e:
-                    responses[agent_name] = {"success": False, "error": str(e)}
+        results = await self._on_agent_loop(self._deliver_all(targets, message))
+        
+        responses = {}
+        for agent_name, result in zip(targets, results):
+            if isinstance(result, Exception):
+                responses[agent_name] = {"success": False, "error": str(result)}
+            else:
+                responses[agent_name] = result
         
         return {"success": True, "responses": responses}
     
+    def close(self):
+        """Stop the per-agent message consumers"""
+        loop = get_event_loop()
+        for consumer in self._consumers.values():
+            loop.call_soon_threadsafe(consumer.cancel)
+        self._consumers.clear()
+        self._pool.shutdown(wait=False)
+    
     def get_agent_status(self) -> Dict[str, Any]:
         """Get status of all registered agents"""
         status = {}
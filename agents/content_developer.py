@@ -6,15 +6,80 @@ Generates high-quality LinkedIn posts from trending topics
 
 import os
 import json
-from datetime import datetime
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+from functools import lru_cache, partial
+from string import Formatter
+from typing import Dict, Any, List, Callable, Optional, Tuple
 
+import httpx
 from agents.base_agent import BaseAgent
-from openai import OpenAI
+from openai import AsyncOpenAI
+from utils import serialization
+from utils.json_stream import IncrementalObjectParser
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """Compile a str.format template into an f-string builder taking keyword fields"""
+    fields = list(dict.fromkeys(field for _, field, _, _ in Formatter().parse(template) if field))
+    source = f"def _build(*, {', '.join(fields)}):\n    return f{template!r}\n"
+    namespace = {}
+    exec(source, {}, namespace)
+    return namespace["_build"]
+
+# First three lines of a block of text; absent lines leave their group as None
+_LEADING_LINES = re.compile(r"([^\n]*)(?:\n([^\n]*))?(?:\n([^\n]*))?")
+
+def _format_trend_analysis(build, hook, main_content, implications, formatted_implications, cta, hashtag_string, topic):
+    return build(
+        trend_title=hook,
+        trend_explanation=main_content,
+        point_1=implications[0] if len(implications) > 0 else "Key development in AI",
+        point_2=implications[1] if len(implications) > 1 else "Impact on professionals",
+        point_3=implications[2] if len(implications) > 2 else "Future opportunities",
+        call_to_action=cta,
+        hashtags=hashtag_string
+    )
+
+def _format_future_outlook(build, hook, main_content, implications, formatted_implications, cta, hashtag_string, topic):
+    future_vision, current_developments, future_indicators = _LEADING_LINES.match(main_content).groups()
+    return build(
+        topic_area=topic,
+        future_vision=future_vision,
+        current_developments=formatted_implications if current_developments is None else current_developments,
+        future_indicators="Continued innovation expected" if future_indicators is None else future_indicators,
+        call_to_action=cta,
+        hashtags=hashtag_string
+    )
+
+def _format_insight_sharing(build, hook, main_content, implications, formatted_implications, cta, hashtag_string, topic):
+    return build(
+        hook=hook,
+        main_insight=main_content,
+        professional_implications=formatted_implications,
+        call_to_action=cta,
+        hashtags=hashtag_string
+    )
+
+_FORMATTERS = {
+    "trend_analysis": _format_trend_analysis,
+    "future_outlook": _format_future_outlook,
+    "insight_sharing": _format_insight_sharing
+}
+
+@lru_cache(maxsize=128)
+def _key_phrase_pattern(phrases: Tuple[str, ...]) -> "re.Pattern":
+    """Compile one alternation over key phrases, longest first so overlaps bold the longer phrase"""
+    return re.compile("|".join(map(re.escape, sorted(phrases, key=len, reverse=True))))
 
 class ContentDeveloperAgent(BaseAgent):
     """Generates branded content from trending AI topics"""
     
+    __slots__ = ("_openai_client", "content_format", "brand_guidelines", "post_templates", "_template_fns",
+                 "_formatters", "_ai_cache", "_ai_cache_maxsize", "_pending_batches", "_prompt_prefix",
+                 "_refine_prompt_prefix")
+    
     def __init__(self):
         super().__init__(
             name="Content Developer Agent",
@@ -22,8 +87,15 @@ class ContentDeveloperAgent(BaseAgent):
             tools=["openai_gpt4", "content_templates", "brand_guidelines"]
         )
         
-        # Initialize OpenAI client
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # OpenAI client is created on first use (see openai_client)
+        self._openai_client = None
+        
+        # LRU cache of generated components keyed by (trend, template) hash
+        self._ai_cache: OrderedDict = OrderedDict()
+        self._ai_cache_maxsize = 256
+        
+        # Batch API jobs awaiting collection: batch_id -> {custom_id: request}
+        self._pending_batches = {}
         
         # Content templates and guidelines
         self.content_format = {
@@ -81,23 +153,69 @@ class ContentDeveloperAgent(BaseAgent):
 
 {hashtags}"""
         }
+        
+        # Compile templates once so formatting skips the str.format parser per post
+        self._template_fns = {name: _compile_template(template) for name, template in self.post_templates.items()}
+        # Bind each template builder to its component mapping once, so formatting is a single call
+        self._formatters = {
+            name: partial(_FORMATTERS[name], build) for name, build in self._template_fns.items()
+        }
+        
+        # Static system prompt, built once so every request shares a cacheable prefix
+        self._prompt_prefix = self.build_prompt_prefix()
+        self._refine_prompt_prefix = self.build_refine_prompt_prefix()
+    
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        """Async OpenAI client, built on first use
+        
+        Uses a pooled HTTP client so concurrent generations reuse connections
+        instead of paying a TLS handshake each. Agents that never generate
+        content skip the client and SSL context setup entirely.
+        """
+        if self._openai_client is None:
+            self._openai_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=32))
+            )
+        return self._openai_client
     
     def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute content development task"""
         task_type = task_data.get("task_type", "generate_content")
         
         if task_type == "generate_content":
-            trend = task_data.get("trend")
             format_type = task_data.get("format", "linkedin_post")
-            return self.generate_content_from_trend(trend, format_type)
+            trends = task_data.get("trends")
+            if trends:
+                return self.run_async(self.generate_content_from_trends(trends, format_type))
+            trend = task_data.get("trend")
+            return self.run_async(self.generate_content_from_trend(trend, format_type))
+        elif task_type == "generate_content_batch":
+            trends = task_data.get("trends", [])
+            return self.run_async(self.generate_content_batch(trends))
+        elif task_type == "collect_content_batch":
+            batch_id = task_data.get("batch_id")
+            return self.run_async(self.collect_content_batch(batch_id))
         elif task_type == "refine_content":
             content = task_data.get("content")
             feedback = task_data.get("feedback")
-            return self.refine_content(content, feedback)
+            return self.run_async(self.refine_content(content, feedback))
         else:
             return self.create_response(False, error=f"Unknown task type: {task_type}")
     
-    def generate_content_from_trend(self, trend: Dict[str, Any], format_type: str = "linkedin_post") -> Dict[str, Any]:
+    async def generate_content_from_trends(self, trends: List[Dict[str, Any]], format_type: str = "linkedin_post") -> Dict[str, Any]:
+        """Generate content for several trends concurrently"""
+        results = await asyncio.gather(*[self.generate_content_from_trend(trend, format_type) for trend in trends])
+        
+        return self.create_response(True, {
+            "results": list(results),
+            "generated_count": sum(1 for result in results if result.get("success")),
+            "trends_processed": len(trends)
+        })
+    
+    async def generate_content_from_trend(self, trend: Dict[str, Any], format_type: str = "linkedin_post",
+                                          partial_queue: asyncio.Queue = None) -> Dict[str, Any]:
         """Generate LinkedIn post content from a trending topic"""
         if not trend:
             return self.create_response(False, error="No trend data provided")
@@ -109,66 +227,211 @@ class ContentDeveloperAgent(BaseAgent):
             template_type = self.select_template_type(trend)
             
             # Generate content using AI
-            generated_content = self.generate_ai_content(trend, template_type)
+            generated_content = await self.generate_ai_content(trend, template_type, partial_queue)
             
             if not generated_content:
                 return self.create_response(False, error="AI content generation failed")
             
-            # Format and structure the content
-            formatted_content = self.format_content(generated_content, template_type)
-            
-            # Add metadata
-            content_package = {
-                "content": formatted_content,
-                "metadata": {
-                    "source_trend": trend.get("title"),
-                    "category": trend.get("category"),
-                    "template_used": template_type,
-                    "generated_at": datetime.utcnow().isoformat(),
-                    "word_count": len(formatted_content.get("text", "").split()),
-                    "character_count": len(formatted_content.get("text", "")),
-                    "estimated_reading_time": self.calculate_reading_time(formatted_content.get("text", ""))
-                }
-            }
-            
-            return self.create_response(True, content_package)
+            return self.create_response(True, self.package_content(trend, generated_content, template_type))
             
         except Exception as e:
             self.log_message(f"Content generation failed: {e}", level="error")
             return self.create_response(False, error=f"Content generation failed: {e}")
     
+    def package_content(self, trend: Dict[str, Any], generated_content: Dict[str, Any], template_type: str) -> Dict[str, Any]:
+        """Format generated components and attach content metadata"""
+        formatted_content = self.format_content(generated_content, template_type)
+        text = formatted_content.get("text", "")
+        word_count = len(text.split())
+        
+        return {
+            "content": formatted_content,
+            "metadata": {
+                "source_trend": trend.get("title"),
+                "category": trend.get("category"),
+                "template_used": template_type,
+                "generated_at": self.utc_timestamp(),
+                "word_count": word_count,
+                "character_count": len(text),
+                "estimated_reading_time": self.calculate_reading_time(word_count=word_count)
+            }
+        }
+    
+    async def generate_content_batch(self, trends: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Submit trends as one OpenAI Batch API job for non-real-time generation"""
+        if not trends:
+            return self.create_response(False, error="No trend data provided")
+        
+        try:
+            requests_by_id = {}
+            lines = []
+            
+            for i, trend in enumerate(trends):
+                custom_id = f"trend-{i}"
+                template_type = self.select_template_type(trend)
+                requests_by_id[custom_id] = {"trend": trend, "template_type": template_type}
+                lines.append(serialization.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self.build_completion_request(trend, template_type)
+                }))
+            
+            batch_file = await self.openai_client.files.create(
+                file=("content_batch.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            
+            batch = await self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            self._pending_batches[batch.id] = requests_by_id
+            self.log_message(f"Submitted content batch {batch.id} with {len(trends)} trends")
+            
+            return self.create_response(True, {
+                "batch_id": batch.id,
+                "status": batch.status,
+                "trends_submitted": len(trends)
+            })
+            
+        except Exception as e:
+            self.log_message(f"Content batch submission failed: {e}", level="error")
+            return self.create_response(False, error=f"Content batch submission failed: {e}")
+    
+    async def collect_content_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Poll a submitted content batch and package its results once complete"""
+        if not batch_id:
+            return self.create_response(False, error="No batch ID provided")
+        
+        try:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            
+            if batch.status != "completed":
+                return self.create_response(True, {"batch_id": batch_id, "status": batch.status, "ready": False})
+            
+            output = await self.openai_client.files.content(batch.output_file_id)
+            requests_by_id = self._pending_batches.pop(batch_id, {})
+            results = {}
+            
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                
+                record = serialization.loads(line)
+                custom_id = record.get("custom_id")
+                request = requests_by_id.get(custom_id, {"trend": {}, "template_type": "insight_sharing"})
+                body = (record.get("response") or {}).get("body") or {}
+                
+                try:
+                    generated_content = serialization.loads(body["choices"][0]["message"]["content"])
+                    results[custom_id] = self.create_response(
+                        True, self.package_content(request["trend"], generated_content, request["template_type"])
+                    )
+                except (KeyError, IndexError, ValueError) as e:
+                    error = record.get("error") or str(e)
+                    results[custom_id] = self.create_response(False, error=f"Batch item failed: {error}")
+            
+            return self.create_response(True, {
+                "batch_id": batch_id,
+                "status": batch.status,
+                "ready": True,
+                "results": results,
+                "generated_count": sum(1 for result in results.values() if result.get("success"))
+            })
+            
+        except Exception as e:
+            self.log_message(f"Content batch collection failed: {e}", level="error")
+            return self.create_response(False, error=f"Content batch collection failed: {e}")
+    
     def select_template_type(self, trend: Dict[str, Any]) -> str:
         """Select the most appropriate template based on trend characteristics"""
         category = trend.get("category", "").lower()
         content_angles = trend.get("content_angles", [])
+        # A single angle may be given as a plain string
+        angles = [content_angles] if isinstance(content_angles, str) else content_angles
         
         # Logic to select template based on trend characteristics
-        if "future" in str(content_angles).lower() or "roadmap" in category:
+        if "roadmap" in category or any("future" in str(angle).lower() for angle in angles):
             return "future_outlook"
         elif trend.get("relevance_score", 0) > 8:
             return "trend_analysis"
         else:
             return "insight_sharing"
     
-    def generate_ai_content(self, trend: Dict[str, Any], template_type: str) -> Dict[str, Any]:
-        """Generate content components using AI"""
+    def _ai_cache_key(self, trend: Dict[str, Any], template_type: str) -> str:
+        """Build a stable cache key from the trend contents and template type"""
+        payload = json.dumps(trend, sort_keys=True, default=str).encode() + template_type.encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    async def generate_ai_content(self, trend: Dict[str, Any], template_type: str,
+                                  partial_queue: asyncio.Queue = None) -> Dict[str, Any]:
+        """Generate content components using AI
+        
+        The completion is streamed. When partial_queue is given, each top-level
+        component is put on it as a (key, value) pair as soon as it is complete,
+        followed by None once generation finishes.
+        """
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            content_prompt = f"""
+            cache_key = self._ai_cache_key(trend, template_type)
+            cached = self._ai_cache.get(cache_key)
+            if cached is not None:
+                self._ai_cache.move_to_end(cache_key)
+                if partial_queue is not None:
+                    for field in cached.items():
+                        await partial_queue.put(field)
+                return cached
+            
+            stream = await self.openai_client.chat.completions.create(
+                **self.build_completion_request(trend, template_type),
+                stream=True
+            )
+            
+            parser = IncrementalObjectParser()
+            chunks = []
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                chunks.append(delta)
+                if partial_queue is not None:
+                    for field in parser.feed(delta):
+                        await partial_queue.put(field)
+            
+            components = serialization.loads("".join(chunks))
+            
+            self._ai_cache[cache_key] = components
+            if len(self._ai_cache) > self._ai_cache_maxsize:
+                self._ai_cache.popitem(last=False)
+            
+            return components
+            
+        except Exception as e:
+            self.log_message(f"AI content generation failed: {e}", level="error")
+            return {}
+        
+        finally:
+            if partial_queue is not None:
+                await partial_queue.put(None)
+    
+    def build_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every generation request
+        
+        Everything invariant across trends lives here so the prefix stays
+        byte-identical between calls and qualifies for OpenAI prompt caching.
+        """
+        return f"""
             You are an expert business consultant and content creator specializing in business optimization, AI innovation strategies, and organizational transformation.
             
             Create a high-quality LinkedIn post that positions expertise in consulting services including business optimization, AI implementation strategies, workshop design, Design Thinking facilitation, and AI tool development.
             
-            Base the post on this trending topic:
-            
-            Title: {trend.get('title', '')}
-            Summary: {trend.get('summary', '')}
-            Category: {trend.get('category', '')}
-            Key Insights: {trend.get('key_insights', [])}
-            Professional Implications: {trend.get('professional_implications', '')}
-            Business Impact: {trend.get('business_impact', '')}
-            Content Angles: {trend.get('content_angles', [])}
+            Base the post on the trending topic provided by the user.
             
             Brand Guidelines:
             - Voice: {self.brand_guidelines['voice']}
@@ -176,8 +439,6 @@ class ContentDeveloperAgent(BaseAgent):
             - Focus: {self.brand_guidelines['focus']}
             - Avoid: {', '.join(self.brand_guidelines['avoid'])}
             
-            Template Type: {template_type}
-            
             Generate content with these components:
             1. Hook (attention-grabbing opening that positions consulting expertise)
             2. Strategic insight or analysis connecting to business optimization challenges (2-3 paragraphs)
@@ -211,25 +472,39 @@ class ContentDeveloperAgent(BaseAgent):
                 "key_phrases": ["phrase1", "phrase2"]
             }}
             """
+    
+    def build_completion_request(self, trend: Dict[str, Any], template_type: str) -> Dict[str, Any]:
+        """Build the chat completion request body for a trend"""
+        trend_prompt = f"""
+            Template Type: {template_type}
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": content_prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=1500
-            )
-            
-            return json.loads(response.choices[0].message.content)
-            
-        except Exception as e:
-            self.log_message(f"AI content generation failed: {e}", level="error")
-            return {}
+            TREND:
+            Title: {trend.get('title', '')}
+            Summary: {trend.get('summary', '')}
+            Category: {trend.get('category', '')}
+            Key Insights: {trend.get('key_insights', [])}
+            Professional Implications: {trend.get('professional_implications', '')}
+            Business Impact: {trend.get('business_impact', '')}
+            Content Angles: {trend.get('content_angles', [])}
+            """
+        
+        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+        # do not change this unless explicitly requested by the user
+        return {
+            "model": "gpt-4o",
+            "messages": [
+                {"role": "system", "content": self._prompt_prefix},
+                {"role": "user", "content": trend_prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 1500
+        }
     
     def format_content(self, content_components: Dict[str, Any], template_type: str) -> Dict[str, Any]:
         """Format content components into final post structure"""
         try:
-            # Get template
-            template = self.post_templates.get(template_type, self.post_templates["insight_sharing"])
+            # Get specialized formatter
+            formatter = self._formatters.get(template_type, self._formatters["insight_sharing"])
             
             # Extract components
             hook = content_components.get("hook", "")
@@ -246,44 +521,15 @@ class ContentDeveloperAgent(BaseAgent):
             # Create hashtag string
             hashtag_string = " ".join(hashtags[:8])  # Limit to 8 hashtags
             
-            # Format the post based on template type
-            if template_type == "trend_analysis":
-                formatted_text = template.format(
-                    trend_title=hook,
-                    trend_explanation=main_content,
-                    point_1=implications[0] if len(implications) > 0 else "Key development in AI",
-                    point_2=implications[1] if len(implications) > 1 else "Impact on professionals", 
-                    point_3=implications[2] if len(implications) > 2 else "Future opportunities",
-                    call_to_action=cta,
-                    hashtags=hashtag_string
-                )
-            elif template_type == "future_outlook":
-                lines = main_content.split('\n')
-                future_vision = lines[0] if lines else main_content[:200]
-                current_developments = lines[1] if len(lines) > 1 else formatted_implications
-                future_indicators = lines[2] if len(lines) > 2 else "Continued innovation expected"
-                
-                formatted_text = template.format(
-                    topic_area=content_components.get("topic", "AI"),
-                    future_vision=future_vision,
-                    current_developments=current_developments,
-                    future_indicators=future_indicators,
-                    call_to_action=cta,
-                    hashtags=hashtag_string
-                )
-            else:  # insight_sharing
-                formatted_text = template.format(
-                    hook=hook,
-                    main_insight=main_content,
-                    professional_implications=formatted_implications,
-                    call_to_action=cta,
-                    hashtags=hashtag_string
-                )
-            
-            # Apply bold formatting to key phrases
-            for phrase in key_phrases:
-                if phrase in formatted_text:
-                    formatted_text = formatted_text.replace(phrase, f"**{phrase}**")
+            formatted_text = formatter(
+                hook, main_content, implications, formatted_implications, cta, hashtag_string,
+                content_components.get("topic", "AI")
+            )
+            
+            # Apply bold formatting to key phrases in a single pass
+            phrases = tuple(sorted({phrase for phrase in key_phrases if phrase}))
+            if phrases:
+                formatted_text = _key_phrase_pattern(phrases).sub(r"**\g<0>**", formatted_text)
             
             return {
                 "text": formatted_text.strip(),
@@ -300,42 +546,27 @@ class ContentDeveloperAgent(BaseAgent):
             self.log_message(f"Content formatting failed: {e}", level="error")
             return {"text": "", "error": str(e)}
     
-    def refine_content(self, content: Dict[str, Any], feedback: str) -> Dict[str, Any]:
+    async def refine_content(self, content: Dict[str, Any], feedback: str) -> Dict[str, Any]:
         """Refine content based on editor feedback"""
         if not content or not feedback:
             return self.create_response(False, error="Missing content or feedback for refinement")
         
         try:
+            refinement_prompt = f"Original Content:\n{content.get('text', '')}\n\nEditor Feedback:\n{feedback}"
+            
             # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
             # do not change this unless explicitly requested by the user
-            refinement_prompt = f"""
-            Refine this LinkedIn post based on the editor feedback:
-            
-            Original Content:
-            {content.get('text', '')}
-            
-            Editor Feedback:
-            {feedback}
-            
-            Brand Guidelines:
-            - Voice: {self.brand_guidelines['voice']}
-            - Avoid: {', '.join(self.brand_guidelines['avoid'])}
-            - Focus: {self.brand_guidelines['focus']}
-            
-            Improve the content while maintaining its core message and structure.
-            Keep it under {self.content_format['max_length']} characters.
-            
-            Return the refined content maintaining the same JSON structure as the original.
-            """
-            
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",
-                messages=[{"role": "user", "content": refinement_prompt}],
+                messages=[
+                    {"role": "system", "content": self._refine_prompt_prefix},
+                    {"role": "user", "content": refinement_prompt}
+                ],
                 response_format={"type": "json_object"},
                 max_tokens=1500
             )
             
-            refined_components = json.loads(response.choices[0].message.content)
+            refined_components = serialization.loads(response.choices[0].message.content)
             
             # Reformat the refined content
             template_type = content.get("template_type", "insight_sharing")
@@ -343,7 +574,7 @@ class ContentDeveloperAgent(BaseAgent):
             
             # Update metadata
             refined_content["metadata"] = content.get("metadata", {})
-            refined_content["metadata"]["refined_at"] = datetime.utcnow().isoformat()
+            refined_content["metadata"]["refined_at"] = self.utc_timestamp()
             refined_content["metadata"]["refinement_feedback"] = feedback
             
             return self.create_response(True, {"content": refined_content})
@@ -352,9 +583,25 @@ class ContentDeveloperAgent(BaseAgent):
             self.log_message(f"Content refinement failed: {e}", level="error")
             return self.create_response(False, error=f"Content refinement failed: {e}")
     
-    def calculate_reading_time(self, text: str) -> int:
-        """Calculate estimated reading time in seconds"""
-        words = len(text.split())
+    def build_refine_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every refinement request"""
+        return f"""
+            Refine the LinkedIn post provided by the user based on the editor feedback.
+            
+            Brand Guidelines:
+            - Voice: {self.brand_guidelines['voice']}
+            - Avoid: {', '.join(self.brand_guidelines['avoid'])}
+            - Focus: {self.brand_guidelines['focus']}
+            
+            Improve the content while maintaining its core message and structure.
+            Keep it under {self.content_format['max_length']} characters.
+            
+            Return the refined content maintaining the same JSON structure as the original.
+            """
+    
+    def calculate_reading_time(self, text: str = "", word_count: Optional[int] = None) -> int:
+        """Calculate estimated reading time in seconds, reusing word_count when already known"""
+        words = len(text.split()) if word_count is None else word_count
         # Average reading speed: 200 words per minute
         reading_time_minutes = words / 200
         return max(1, int(reading_time_minutes * 60))  # Convert to seconds, minimum 1 second
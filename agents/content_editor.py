@@ -6,15 +6,257 @@ Reviews content for quality, accuracy, and brand alignment
 
 import os
 import json
-from datetime import datetime
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel, ConfigDict
 
 from agents.base_agent import BaseAgent
-from openai import OpenAI
+from openai import AsyncOpenAI
+from utils.json_stream import IncrementalObjectParser
+from utils.phrase_matcher import PhraseMatcher
+from utils.retry import with_retry
+
+try:
+    import h2  # noqa: F401  # enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Texts sent per moderation request; the endpoint accepts a list of inputs
+MODERATION_BATCH_SIZE = 32
+
+# Stems that send a post to the Moderations API, matched at the start of a word so inflections
+# ("killed", "bombing", "drugs") count too; posts with none of them, or of the terms below, are cleared locally
+LOCAL_MODERATION_STEMS = {
+    "violence": ["kill", "murder", "shoot", "shot", "bomb", "attack", "assault", "massacre",
+                 "terror", "weapon", "gun", "behead", "slaughter", "torture"],
+    "self_harm": ["suicid", "self-harm", "self harm", "kill myself", "overdos", "cutting myself"],
+    "hate": ["racis", "slur", "inferior race", "ethnic cleansing", "nazi", "genocid"],
+    "harassment": ["idiot", "moron", "stupid", "loser", "shut up", "hate you"],
+    "sexual": ["sexual", "porn", "nude", "nudity"],
+    "illicit": ["drug", "cocaine", "heroin", "hack into", "hacked into", "steal", "stole", "smuggl", "launder"],
+    "profanity": ["damn", "crap", "shit", "fuck", "bitch", "bastard"],
+}
+
+# Short terms matched as whole words only, since as stems they would catch common words
+# ("hello", "method", "stable")
+LOCAL_MODERATION_TERMS = {
+    "violence": ["stab", "stabs", "stabbed", "stabbing"],
+    "sexual": ["sex", "sexy"],
+    "illicit": ["meth"],
+    "profanity": ["hell"],
+}
+
+# Links and personal data are left to the API, since the local check cannot judge them
+LOCAL_MODERATION_SUSPECT = re.compile(
+    r"https?://|www\.|[\w.+-]+@[\w-]+\.[\w.]+|\+?\d[\d\s().-]{8,}\d", re.IGNORECASE
+)
+
+# A word is any run of non-whitespace, matching str.split()
+WORD_PATTERN = re.compile(r"\S+")
+
+# Share of locally cleared posts still sent to the API, to keep checking the local term list
+LOCAL_MODERATION_SAMPLE_RATE = 0.02
+
+# OpenAI requests allowed in flight at once per editor, to stay under rate limits
+MAX_CONCURRENT_REQUESTS = 10
+
+# Connection pool for the shared editor HTTP client; roomy enough that requests never queue on a socket
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+
+# Part of every review cache key; bump when a prompt changes so stale results are not served
+REVIEW_PROMPT_VERSION = "2"
+
+# the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+# do not change this unless explicitly requested by the user
+REVIEW_MODEL = "gpt-4o"
+FACT_CHECK_MODEL = "gpt-4o"
+
+# Brand alignment from embeddings: cosine similarities across this range map onto scores 1-5,
+# and scores strictly inside the borderline band are re-checked with the chat review
+BRAND_EMBEDDING_MODEL = "text-embedding-3-small"
+BRAND_SIMILARITY_RANGE = (0.15, 0.45)
+BRAND_BORDERLINE_SCORES = (2.5, 3.5)
+
+# Output token caps sized to the response schemas with list lengths capped in the prompts, plus headroom
+REVIEW_MAX_TOKENS = 900
+FACT_CHECK_TOKENS_PER_BLOCK = 300
+FACT_CHECK_MAX_TOKENS = 3000
+
+# A line ends a content block when its hash is divisible by this (or it is blank).
+# Boundaries depend only on line content, so unchanged blocks keep their hash across edits.
+CDC_DIVISOR = 8
+
+# Emoji that count as an engaging hook; each is a single code point, so set membership works per character
+HOOK_EMOJIS = frozenset("🔥📈🚀💡⚡🎯")
+
+# Components every post needs, with the label used when one is missing
+REQUIRED_COMPONENTS = (("hook", "hook"), ("main_content", "main content"), ("cta", "call to action"), ("hashtags", "hashtags"))
+
+FACT_CHECK_LISTS = ("verified_claims", "questionable_claims", "inaccurate_claims", "recommendations")
+
+def unit_vector(vector: List[float]) -> List[float]:
+    """Scale a vector to length 1, so cosine similarity is a plain dot product"""
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+def similarity_score(similarity: float) -> float:
+    """Map a cosine similarity onto a 1-5 score"""
+    low, high = BRAND_SIMILARITY_RANGE
+    fraction = min(1.0, max(0.0, (similarity - low) / (high - low)))
+    return round(1 + 4 * fraction, 2)
+
+def review_issue(text: str, severity: Optional[str] = None) -> Dict[str, str]:
+    """Build a structured issue, classifying its severity once when it is emitted
+    
+    Severity is "critical", "warning" or "info"; without an explicit one, issues
+    mentioning "critical" are critical and anything else is a warning.
+    """
+    text = str(text)
+    if severity is None:
+        severity = "critical" if "critical" in text.lower() else "warning"
+    return {"text": text, "severity": severity}
+
+def format_issues(issues: List[Dict[str, str]]) -> str:
+    """Render structured issues as a bulleted list for display"""
+    return "\n".join(f"• {issue['text']}" for issue in issues)
+
+def split_content_blocks(content_text: str) -> List[str]:
+    """Split text into content-defined blocks of lines"""
+    blocks = []
+    current = []
+    
+    for line in content_text.splitlines():
+        if line.strip():
+            current.append(line)
+        digest = hashlib.blake2b(line.encode(), digest_size=8).digest()
+        if not line.strip() or int.from_bytes(digest, "big") % CDC_DIVISOR == 0:
+            if current:
+                blocks.append("\n".join(current))
+            current = []
+    
+    if current:
+        blocks.append("\n".join(current))
+    
+    return blocks
+
+def merge_fact_checks(block_results: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Combine per-block fact checks, weighting scores by block length"""
+    merged = {key: [] for key in FACT_CHECK_LISTS}
+    weighted_score = 0.0
+    total_length = 0
+    
+    for block, result in block_results:
+        try:
+            weighted_score += float(result.get("fact_check_score", 0)) * len(block)
+            total_length += len(block)
+        except (TypeError, ValueError):
+            pass
+        for key in FACT_CHECK_LISTS:
+            merged[key].extend(item for item in result.get(key, []) if item not in merged[key])
+    
+    merged["fact_check_score"] = round(weighted_score / total_length, 2) if total_length else 0
+    merged["blocks_checked"] = len(block_results)
+    
+    return merged
+
+class _StrictModel(BaseModel):
+    """Response schema base; forbidding extras keeps the JSON schema valid for strict structured outputs"""
+    model_config = ConfigDict(extra="forbid")
+
+class CategoryScores(_StrictModel):
+    grammar_clarity: float
+    brand_alignment: float
+    factual_accuracy: float
+    engagement_potential: float
+
+class AIReviewResult(_StrictModel):
+    overall_score: float
+    category_scores: CategoryScores
+    issues: List[str]
+    suggestions: List[str]
+    strengths: List[str]
+    improvement_areas: List[str]
+
+class BrandResult(_StrictModel):
+    score: float
+    voice_consistency: float
+    tone_appropriateness: float
+    message_alignment: float
+    audience_value: float
+    issues: List[str]
+    suggestions: List[str]
+
+class FullReviewResult(_StrictModel):
+    ai_review: AIReviewResult
+    brand_alignment: BrandResult
+
+class AIReviewOnlyResult(_StrictModel):
+    ai_review: AIReviewResult
+
+class BrandOnlyResult(_StrictModel):
+    brand_alignment: BrandResult
+
+class FactCheckBlock(_StrictModel):
+    block: int
+    fact_check_score: float
+    verified_claims: List[str]
+    questionable_claims: List[str]
+    inaccurate_claims: List[str]
+    recommendations: List[str]
+
+class FactCheckResult(_StrictModel):
+    blocks: List[FactCheckBlock]
+
+def json_schema_format(model: type) -> Dict[str, Any]:
+    """Structured outputs response_format for a response schema model"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": model.model_json_schema(), "strict": True}
+    }
+
+# Response schema for each set of sections a review request may ask for
+FULL_REVIEW_SECTIONS = ("ai_review", "brand_alignment")
+REVIEW_SCHEMAS = {
+    FULL_REVIEW_SECTIONS: FullReviewResult,
+    ("ai_review",): AIReviewOnlyResult,
+    ("brand_alignment",): BrandOnlyResult
+}
+REVIEW_FORMATS = {sections: json_schema_format(model) for sections, model in REVIEW_SCHEMAS.items()}
+FACT_CHECK_FORMAT = json_schema_format(FactCheckResult)
 
 class ContentEditorAgent(BaseAgent):
     """Reviews and validates content for quality and brand alignment"""
     
+    # One pooled HTTP client for every editor, so re-creating an agent does not reopen sockets
+    _http_client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def shared_http_client(cls) -> httpx.AsyncClient:
+        """HTTP client shared by all editor instances, built on first use"""
+        if cls._http_client is None:
+            cls._http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=HTTP2_AVAILABLE)
+        return cls._http_client
+    
+    async def aclose(self):
+        """Close the shared editor connection pool; editors created afterwards build a new one"""
+        cls = type(self)
+        if cls._http_client is not None:
+            client, cls._http_client = cls._http_client, None
+            await client.aclose()
+    
+    def close(self):
+        """Close the pooled connections on the agent event loop"""
+        self.run_async(self.aclose())
+    
     def __init__(self):
         super().__init__(
             name="Content Editor Agent",
@@ -22,8 +264,18 @@ class ContentEditorAgent(BaseAgent):
             tools=["openai_moderation", "fact_checking", "brand_validation", "content_scoring"]
         )
         
-        # Initialize OpenAI client
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Initialize OpenAI client; retries are handled by with_retry so the SDK's own are disabled
+        self.openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, http_client=self.shared_http_client()
+        )
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        # Batch API review jobs awaiting collection: batch_id -> [{content, moderation_check}]
+        self._pending_batches = {}
+        
+        # LRU cache of moderation, review and fact-check results keyed by content hash
+        self._review_cache: OrderedDict = OrderedDict()
+        self._review_cache_maxsize = 512
         
         # Content quality criteria
         self.quality_criteria = {
@@ -81,183 +333,587 @@ class ContentEditorAgent(BaseAgent):
                 "missing key context"
             ]
         }
+        
+        # All red and yellow flag phrases compiled into one matcher
+        self._flag_matcher = PhraseMatcher({"red": self.content_flags["red_flags"], "yellow": self.content_flags["yellow_flags"]})
+        
+        # Local pre-check that clears obviously safe posts without a moderation request
+        self._local_mod_stem_matcher = PhraseMatcher(LOCAL_MODERATION_STEMS, prefix=True)
+        self._local_mod_matcher = PhraseMatcher(LOCAL_MODERATION_TERMS)
+        self._local_moderation_sample_rate = LOCAL_MODERATION_SAMPLE_RATE
+        
+        # Technical requirement thresholds, unpacked once for validate_technical_requirements
+        requirements = self.brand_standards["content_requirements"]
+        self._length_limits = (requirements["min_length"], requirements["max_length"])
+        self._hashtag_limits = (requirements["hashtag_count"]["min"], requirements["hashtag_count"]["max"])
+        
+        # Brand descriptors scored by embedding similarity; their embeddings are fetched on first use
+        self._brand_axes = {
+            "voice_consistency": [self.brand_standards["voice"]],
+            "tone_appropriateness": self.brand_standards["tone"],
+            "message_alignment": self.brand_standards["messaging_pillars"],
+            "audience_value": ["Practical value for AI professionals and business leaders"]
+        }
+        self._brand_embeddings = None
+        
+        # Static system prompts, built once so each request only adds the content
+        self._review_prompt_prefix = self.build_review_prompt_prefix()
+        self._fact_check_prompt_prefix = self.build_fact_check_prompt_prefix()
     
     def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute content editing task"""
         task_type = task_data.get("task_type", "edit_content")
         
         if task_type == "edit_content":
+            # Support both single content and multiple contents
+            contents = task_data.get("contents")
+            if contents is not None:
+                return self.run_async(self.review_content_batch(contents))
             content = task_data.get("content")
-            return self.review_content(content)
+            return self.run_async(self.review_content(content))
+        elif task_type == "submit_batch_review":
+            contents = task_data.get("contents", [])
+            return self.run_async(self.submit_batch_review(contents))
+        elif task_type == "collect_batch_review":
+            batch_id = task_data.get("batch_id")
+            return self.run_async(self.collect_batch_review(batch_id))
         elif task_type == "fact_check":
             content = task_data.get("content")
-            return self.fact_check_content(content)
+            return self.run_async(self.fact_check_content(content))
         elif task_type == "score_content":
             content = task_data.get("content")
-            return self.score_content(content)
+            return self.run_async(self.score_content(content))
         else:
             return self.create_response(False, error=f"Unknown task type: {task_type}")
     
-    def review_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Comprehensive content review and validation"""
-        if not content:
+    async def review_content_batch(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Review multiple contents, moderating them all up front in batched requests"""
+        if not contents:
             return self.create_response(False, error="No content provided for review")
         
-        self.log_message("Starting comprehensive content review")
+        texts = [(content or {}).get("text", "") for content in contents]
+        moderation_results = await self.run_moderation_check_batch(texts)
+        reviewed_at = self.utc_timestamp()
+        
+        results = await asyncio.gather(*(
+            self.review_content(content, moderation_result=moderation_result, reviewed_at=reviewed_at)
+            for content, moderation_result in zip(contents, moderation_results)
+        ))
+        
+        return self.create_response(True, {
+            "results": results,
+            "reviewed_count": len(results)
+        })
+    
+    async def submit_batch_review(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Submit combined AI and brand reviews for many contents as one OpenAI Batch API job
+        
+        Moderation is free and fast, so it runs immediately; flagged content
+        is not sent to the batch. Results are gathered by collect_batch_review.
+        """
+        if not contents:
+            return self.create_response(False, error="No content provided for review")
         
         try:
-            # Extract content text and components
-            content_text = content.get("text", "")
-            content_components = {
-                "hook": content.get("hook", ""),
-                "main_content": content.get("main_content", ""),
-                "cta": content.get("call_to_action", ""),
-                "hashtags": content.get("hashtags", [])
-            }
+            texts = [(content or {}).get("text", "") for content in contents]
+            moderation_results = await self.run_moderation_check_batch(texts)
             
-            # Perform multiple validation checks
-            review_results = {
-                "content_id": content.get("metadata", {}).get("generated_at", "unknown"),
-                "reviewed_at": datetime.utcnow().isoformat(),
-                "approved": False,
-                "overall_score": 0,
-                "detailed_scores": {},
-                "issues_found": [],
-                "suggestions": [],
-                "moderation_check": {}
-            }
+            items = []
+            lines = []
             
-            # 1. OpenAI Moderation Check
-            moderation_result = self.run_moderation_check(content_text)
-            review_results["moderation_check"] = moderation_result
+            for i, (content, moderation_result) in enumerate(zip(contents, moderation_results)):
+                items.append({"content": content or {}, "moderation_check": moderation_result})
+                if not content or not moderation_result.get("safe", True):
+                    continue
+                
+                content_text, components = self.extract_components(content)
+                lines.append(json.dumps({
+                    "custom_id": f"content-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self.build_full_review_request(content_text, components)
+                }))
             
-            if not moderation_result.get("safe", True):
-                review_results["issues_found"].append("Content flagged by moderation system")
-                return self.create_response(True, review_results)
+            if not lines:
+                # Everything was flagged or empty, so there is nothing to send to the batch
+                return self.create_response(True, {
+                    "batch_id": None,
+                    "status": "completed",
+                    "ready": True,
+                    "results": self._compile_batch_reviews(items, {}),
+                    "reviewed_count": len(items)
+                })
+            
+            batch_file = await self.openai_client.files.create(
+                file=("review_batch.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
             
-            # 2. Comprehensive AI-powered review
-            ai_review = self.run_ai_content_review(content_text, content_components)
+            batch = await self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
             
-            # 3. Technical validation
-            technical_validation = self.validate_technical_requirements(content_text, content_components)
+            self._pending_batches[batch.id] = items
+            self.log_message(f"Submitted review batch {batch.id} with {len(lines)} requests")
             
-            # 4. Brand alignment check  
-            brand_check = self.validate_brand_alignment(content_text)
+            return self.create_response(True, {
+                "batch_id": batch.id,
+                "status": batch.status,
+                "contents_submitted": len(lines),
+                "flagged_count": sum(1 for item in items if not item["moderation_check"].get("safe", True))
+            })
             
-            # Compile all results
-            review_results["detailed_scores"] = {
-                "ai_review_score": ai_review.get("overall_score", 0),
-                "technical_score": technical_validation.get("score", 0),
-                "brand_alignment_score": brand_check.get("score", 0)
-            }
+        except Exception as e:
+            self.log_message(f"Review batch submission failed: {e}", level="error")
+            return self.create_response(False, error=f"Review batch submission failed: {e}")
+    
+    async def collect_batch_review(self, batch_id: str) -> Dict[str, Any]:
+        """Poll a submitted review batch and compile its reviews once complete"""
+        if not batch_id:
+            return self.create_response(False, error="No batch ID provided")
+        
+        try:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            
+            if batch.status != "completed":
+                return self.create_response(True, {"batch_id": batch_id, "status": batch.status, "ready": False})
+            
+            output = await self.openai_client.files.content(batch.output_file_id)
+            outputs = {}
+            
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                
+                record = json.loads(line)
+                body = (record.get("response") or {}).get("body") or {}
+                try:
+                    outputs[record.get("custom_id")] = self.parse_full_review(body["choices"][0]["message"]["content"])
+                except (KeyError, IndexError, TypeError, ValueError) as e:
+                    outputs[record.get("custom_id")] = self._failed_full_review(record.get("error") or e)
             
-            # Calculate overall score
-            scores = list(review_results["detailed_scores"].values())
-            review_results["overall_score"] = sum(scores) / len(scores) if scores else 0
+            results = self._compile_batch_reviews(self._pending_batches.pop(batch_id, []), outputs)
             
-            # Combine issues and suggestions
-            review_results["issues_found"].extend(ai_review.get("issues", []))
-            review_results["issues_found"].extend(technical_validation.get("issues", []))
-            review_results["issues_found"].extend(brand_check.get("issues", []))
+            return self.create_response(True, {
+                "batch_id": batch_id,
+                "status": batch.status,
+                "ready": True,
+                "results": results,
+                "reviewed_count": len(results)
+            })
             
-            review_results["suggestions"].extend(ai_review.get("suggestions", []))
-            review_results["suggestions"].extend(technical_validation.get("suggestions", []))
-            review_results["suggestions"].extend(brand_check.get("suggestions", []))
+        except Exception as e:
+            self.log_message(f"Review batch collection failed: {e}", level="error")
+            return self.create_response(False, error=f"Review batch collection failed: {e}")
+    
+    def _compile_batch_reviews(self, items: List[Dict[str, Any]], outputs: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build review responses for batch items from their parsed batch outputs"""
+        results = []
+        reviewed_at = self.utc_timestamp()
+        
+        for i, item in enumerate(items):
+            content = item["content"]
+            if not content:
+                results.append(self.create_response(False, error="No content provided for review"))
+                continue
             
-            # Determine approval status
-            review_results["approved"] = (
-                review_results["overall_score"] >= 3.5 and  # Minimum score threshold
-                len([issue for issue in review_results["issues_found"] if "critical" in issue.lower()]) == 0
+            review_results = self.new_review_results(content, reviewed_at)
+            review_results["moderation_check"] = item["moderation_check"]
+            
+            if not item["moderation_check"].get("safe", True):
+                review_results["issues_found"].append(review_issue("Content flagged by moderation system", "critical"))
+                results.append(self.create_response(True, review_results))
+                continue
+            
+            full_review = outputs.get(f"content-{i}") or self._failed_full_review("missing from batch output")
+            
+            content_text, components = self.extract_components(content)
+            self.compile_review(
+                review_results, content_text, components,
+                full_review["ai_review"], full_review["brand_alignment"]
             )
+            results.append(self.create_response(True, review_results))
+        
+        return results
+    
+    async def review_content(self, content: Dict[str, Any], moderation_result: Optional[Dict[str, Any]] = None,
+                             reviewed_at: Optional[str] = None) -> Dict[str, Any]:
+        """Comprehensive content review and validation
+        
+        A moderation_result already obtained from run_moderation_check_batch
+        may be passed in to skip the per-item moderation request, and a batch
+        may share one reviewed_at timestamp across its items. Otherwise
+        moderation runs alongside the AI and brand review, which is cancelled
+        as soon as the content is flagged or the review exits early.
+        """
+        if not content:
+            return self.create_response(False, error="No content provided for review")
+        
+        self.log_message("Starting comprehensive content review")
+        
+        review = None
+        try:
+            content_text, content_components = self.extract_components(content)
+            review_results = self.new_review_results(content, reviewed_at)
+            
+            # 1. OpenAI Moderation Check, with the AI review started alongside it
+            if moderation_result is None:
+                review = asyncio.create_task(self.run_review(content_text, content_components))
+                moderation_result = await self.run_moderation_check(content_text)
+            review_results["moderation_check"] = moderation_result
+            
+            if not moderation_result.get("safe", True):
+                review_results["issues_found"].append(review_issue("Content flagged by moderation system", "critical"))
+                return self.create_response(True, review_results)
+            
+            # 2. Comprehensive AI-powered review and 4. brand alignment check
+            full_review = await (review if review is not None else self.run_review(content_text, content_components))
             
-            # Generate feedback summary
-            review_results["feedback_summary"] = self.generate_feedback_summary(review_results)
+            self.compile_review(
+                review_results, content_text, content_components,
+                full_review["ai_review"], full_review["brand_alignment"]
+            )
             
             return self.create_response(True, review_results)
             
         except Exception as e:
             self.log_message(f"Content review failed: {e}", level="error")
             return self.create_response(False, error=f"Content review failed: {e}")
+        
+        finally:
+            # Flagged content, errors and outside cancellation all abandon the review request
+            if review is not None and not review.done():
+                review.cancel()
+    
+    def extract_components(self, content: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Extract the post text and the components reviewed alongside it"""
+        content_text = content.get("text", "")
+        content_components = {
+            "hook": content.get("hook", ""),
+            "main_content": content.get("main_content", ""),
+            "cta": content.get("call_to_action", ""),
+            "hashtags": content.get("hashtags", [])
+        }
+        return content_text, content_components
+    
+    def new_review_results(self, content: Dict[str, Any], reviewed_at: Optional[str] = None) -> Dict[str, Any]:
+        """Create an empty review record for content, optionally sharing a batch's review timestamp"""
+        return {
+            "content_id": content.get("metadata", {}).get("generated_at", "unknown"),
+            "reviewed_at": reviewed_at or self.utc_timestamp(),
+            "approved": False,
+            "overall_score": 0,
+            "detailed_scores": {},
+            "issues_found": [],
+            "suggestions": [],
+            "moderation_check": {}
+        }
     
-    def run_moderation_check(self, content_text: str) -> Dict[str, Any]:
+    def compile_review(self, review_results: Dict[str, Any], content_text: str, components: Dict[str, Any],
+                       ai_review: Dict[str, Any], brand_check: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine AI, technical and brand results into scores, issues and an approval decision"""
+        # 3. Technical validation
+        technical_validation = self.validate_technical_requirements(content_text, components)
+        
+        sources = (ai_review, technical_validation, brand_check)
+        
+        # Compile all results
+        ai_score = ai_review.get("overall_score", 0)
+        technical_score = technical_validation.get("score", 0)
+        brand_score = brand_check.get("score", 0)
+        review_results["detailed_scores"] = {
+            "ai_review_score": ai_score,
+            "technical_score": technical_score,
+            "brand_alignment_score": brand_score
+        }
+        
+        # Calculate overall score
+        review_results["overall_score"] = (ai_score + technical_score + brand_score) / 3
+        
+        # Combine issues and suggestions
+        review_results["issues_found"].extend(
+            review_issue(issue) for issue in chain.from_iterable(source.get("issues", []) for source in sources)
+        )
+        review_results["suggestions"].extend(chain.from_iterable(source.get("suggestions", []) for source in sources))
+        
+        # Determine approval status
+        review_results["approved"] = (
+            review_results["overall_score"] >= 3.5 and  # Minimum score threshold
+            not any(issue["severity"] == "critical" for issue in review_results["issues_found"])
+        )
+        
+        # Generate feedback summary
+        review_results["feedback_summary"] = self.generate_feedback_summary(review_results)
+        
+        return review_results
+    
+    async def run_moderation_check(self, content_text: str) -> Dict[str, Any]:
         """Run OpenAI moderation check on content"""
-        try:
-            response = self.openai_client.moderations.create(input=content_text)
-            result = response.results[0]
-            
-            return {
-                "safe": not result.flagged,
-                "categories": result.categories.model_dump() if hasattr(result, 'categories') else {},
-                "category_scores": result.category_scores.model_dump() if hasattr(result, 'category_scores') else {}
-            }
-            
-        except Exception as e:
-            self.log_message(f"Moderation check failed: {e}", level="warning")
-            return {"safe": True, "error": str(e)}
+        return (await self.run_moderation_check_batch([content_text]))[0]
     
-    def run_ai_content_review(self, content_text: str, components: Dict[str, Any]) -> Dict[str, Any]:
-        """Comprehensive AI-powered content review"""
+    async def run_moderation_check_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Run OpenAI moderation checks on many texts, one request per MODERATION_BATCH_SIZE inputs
+        
+        Texts with a cached result are not sent again, and short texts that
+        pass the local pre-check are cleared without a request.
+        """
+        keys = [self._review_cache_key("moderation", text) for text in texts]
+        results = [self._review_cache_get(key) for key in keys]
+        pending = []
+        
+        for i, result in enumerate(results):
+            if result is not None:
+                continue
+            if self._passes_local_moderation(texts[i]):
+                results[i] = {"safe": True, "categories": {}, "category_scores": {}, "source": "local"}
+            else:
+                pending.append(i)
+        
+        for start in range(0, len(pending), MODERATION_BATCH_SIZE):
+            indices = pending[start:start + MODERATION_BATCH_SIZE]
+            try:
+                response = await with_retry(self._moderate, [texts[i] for i in indices])
+                
+                for i, result in zip(indices, response.results):
+                    results[i] = {
+                        "safe": not result.flagged,
+                        "categories": result.categories.model_dump() if hasattr(result, 'categories') else {},
+                        "category_scores": result.category_scores.model_dump() if hasattr(result, 'category_scores') else {},
+                        "source": "api"
+                    }
+                    self._review_cache_put(keys[i], results[i])
+                
+            except Exception as e:
+                self.log_message(f"Moderation check failed: {e}", level="warning")
+                for i in indices:
+                    results[i] = {"safe": True, "error": str(e)}
+        
+        return results
+    
+    def _passes_local_moderation(self, content_text: str) -> bool:
+        """Whether a text is clearly clean: within the length limit, no flagged terms, links or contact details
+        
+        A small sample of clean texts is reported as not passing so the API keeps checking the term list.
+        The sample is chosen by a hash of the text, so the same text is always moderated the same way.
+        """
+        return (
+            len(content_text) < self._length_limits[1]
+            and not self._local_mod_stem_matcher.search(content_text)
+            and not self._local_mod_matcher.search(content_text)
+            and LOCAL_MODERATION_SUSPECT.search(content_text) is None
+            and self._moderation_sample_point(content_text) >= self._local_moderation_sample_rate
+        )
+    
+    @staticmethod
+    def _moderation_sample_point(content_text: str) -> float:
+        """Stable point in [0, 1) for a text, used to pick the API sample"""
+        digest = hashlib.blake2b(content_text.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64
+    
+    async def _moderate(self, texts: List[str]) -> Any:
+        """Send one moderation request, holding a request slot"""
+        async with self._request_slots:
+            return await self.openai_client.moderations.create(input=texts)
+    
+    async def _embed(self, texts: List[str]) -> Any:
+        """Send one embeddings request, holding a request slot"""
+        async with self._request_slots:
+            return await self.openai_client.embeddings.create(model=BRAND_EMBEDDING_MODEL, input=texts)
+    
+    async def _complete(self, request: Dict[str, Any]) -> Any:
+        """Send one chat completion request, holding a request slot"""
+        async with self._request_slots:
+            return await self.openai_client.chat.completions.create(**request)
+    
+    def _review_cache_key(self, kind: str, *parts: str) -> str:
+        """Build a cache key from the check kind, prompt version and content"""
+        hasher = hashlib.blake2b(f"{REVIEW_PROMPT_VERSION}:{kind}".encode(), digest_size=16)
+        for part in parts:
+            hasher.update(b"\0" + part.encode())
+        return hasher.hexdigest()
+    
+    def _review_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self._review_cache.get(key)
+        if cached is not None:
+            self._review_cache.move_to_end(key)
+        return cached
+    
+    def _review_cache_put(self, key: str, value: Dict[str, Any]):
+        self._review_cache[key] = value
+        if len(self._review_cache) > self._review_cache_maxsize:
+            self._review_cache.popitem(last=False)
+    
+    def build_review_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every review request
+        
+        Brand guidelines, flags and the response format are invariant, so they
+        are rendered once and stay byte-identical for OpenAI prompt caching.
+        """
+        return f"""
+        You are an expert content editor specializing in AI and technology content for LinkedIn.
+        
+        Review the LinkedIn post provided by the user for:
+        1. Grammar, spelling, and clarity
+        2. Professional tone and brand voice consistency  
+        3. Factual accuracy and credibility of claims
+        4. Engagement potential and call-to-action effectiveness
+        5. Overall value for AI professionals and business leaders
+        
+        Separately, score its brand alignment 1-5 on:
+        1. Voice consistency (authoritative yet approachable)
+        2. Appropriate tone (professional, insightful, practical)
+        3. Alignment with messaging pillars
+        4. Value for target audience (AI professionals, business leaders)
+        
+        Brand guidelines:
+        - Voice: {self.brand_standards['voice']}
+        - Tone: {', '.join(self.brand_standards['tone'])}
+        - Messaging pillars: {', '.join(self.brand_standards['messaging_pillars'])}
+        
+        Content flags to watch for:
+        - Red flags: {', '.join(self.content_flags['red_flags'])}
+        - Yellow flags: {', '.join(self.content_flags['yellow_flags'])}
+        
+        Provide specific recommendations, at most 5 short items per list. Scores range from 1 to 5.
+        Put the review in "ai_review" and the brand alignment in "brand_alignment".
+        """
+    
+    def build_full_review_request(self, content_text: str, components: Dict[str, Any],
+                                  sections: Tuple[str, ...] = FULL_REVIEW_SECTIONS) -> Dict[str, Any]:
+        """Build one chat completion request covering the content review and brand alignment, or only some sections
+        
+        Every request shares the same system prompt so it stays cached; the
+        response schema limits the reply to the requested sections.
+        """
+        content_prompt = (
+            f"Content to review:\n{content_text}\n\n"
+            f"Content components:\n"
+            f"- Hook: {components.get('hook', '')}\n"
+            f"- Main content: {components.get('main_content', '')}\n"
+            f"- CTA: {components.get('cta', '')}\n"
+            f"- Hashtags: {', '.join(components.get('hashtags', []))}"
+        )
+        if sections != FULL_REVIEW_SECTIONS:
+            content_prompt += f"\n\nOnly provide {' and '.join(map(repr, sections))}."
+        
+        return {
+            "model": REVIEW_MODEL,
+            "messages": [
+                {"role": "system", "content": self._review_prompt_prefix},
+                {"role": "user", "content": content_prompt}
+            ],
+            "response_format": REVIEW_FORMATS[sections],
+            "max_tokens": REVIEW_MAX_TOKENS
+        }
+    
+    def parse_full_review(self, content: str, sections: Tuple[str, ...] = FULL_REVIEW_SECTIONS) -> Dict[str, Any]:
+        """Validate a review response against the schema for its sections"""
+        return REVIEW_SCHEMAS[sections].model_validate_json(content).model_dump()
+    
+    def _failed_full_review(self, error: Any, sections: Tuple[str, ...] = FULL_REVIEW_SECTIONS) -> Dict[str, Any]:
+        failed = {
+            "ai_review": self._failed_review(f"AI review failed: {error}"),
+            "brand_alignment": self._failed_brand_check(f"Brand alignment check failed: {error}")
+        }
+        return {section: failed[section] for section in sections}
+    
+    def _failed_review(self, issue: str) -> Dict[str, Any]:
+        return {"overall_score": 3.0, "issues": [issue], "suggestions": []}
+    
+    def _failed_brand_check(self, issue: str) -> Dict[str, Any]:
+        return {"score": 3.0, "issues": [issue], "suggestions": []}
+    
+    async def run_full_review(self, content_text: str, components: Dict[str, Any],
+                              partial_queue: asyncio.Queue = None,
+                              sections: Tuple[str, ...] = FULL_REVIEW_SECTIONS) -> Dict[str, Any]:
+        """Run the AI content review and brand alignment check in a single request
+        
+        sections selects which of the two the request asks for, by default both.
+        The completion is streamed. When partial_queue is given, each section
+        is put on it as a (key, value) pair as soon as it is complete, followed
+        by None. If the AI review section already reports a critical issue the
+        content cannot be approved, so the stream is closed without waiting
+        for the brand alignment section.
+        """
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            review_prompt = f"""
-            You are an expert content editor specializing in AI and technology content for LinkedIn.
-            
-            Review this LinkedIn post for:
-            1. Grammar, spelling, and clarity
-            2. Professional tone and brand voice consistency  
-            3. Factual accuracy and credibility of claims
-            4. Engagement potential and call-to-action effectiveness
-            5. Overall value for AI professionals and business leaders
-            
-            Content to review:
-            {content_text}
-            
-            Content components:
-            - Hook: {components.get('hook', '')}
-            - Main content: {components.get('main_content', '')}
-            - CTA: {components.get('cta', '')}
-            - Hashtags: {', '.join(components.get('hashtags', []))}
-            
-            Brand guidelines:
-            - Voice: {self.brand_standards['voice']}
-            - Tone: {', '.join(self.brand_standards['tone'])}
-            - Messaging pillars: {', '.join(self.brand_standards['messaging_pillars'])}
-            
-            Content flags to watch for:
-            - Red flags: {', '.join(self.content_flags['red_flags'])}
-            - Yellow flags: {', '.join(self.content_flags['yellow_flags'])}
-            
-            Provide detailed analysis with specific recommendations.
-            
-            Respond with JSON:
-            {{
-                "overall_score": 4.2,
-                "category_scores": {{
-                    "grammar_clarity": 4.5,
-                    "brand_alignment": 4.0,
-                    "factual_accuracy": 4.0,
-                    "engagement_potential": 4.3
-                }},
-                "issues": ["specific issue 1", "specific issue 2"],
-                "suggestions": ["specific suggestion 1", "specific suggestion 2"],
-                "strengths": ["strength 1", "strength 2"],
-                "improvement_areas": ["area 1", "area 2"]
-            }}
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": review_prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=1500
+            cache_key = self._review_cache_key(
+                "full_review", ",".join(sections), content_text, json.dumps(components, sort_keys=True)
             )
+            cached = self._review_cache_get(cache_key)
+            if cached is not None:
+                if partial_queue is not None:
+                    for section in cached.items():
+                        await partial_queue.put(section)
+                return cached
+            
+            stream = await with_retry(
+                self._complete, {**self.build_full_review_request(content_text, components, sections), "stream": True}
+            )
+            
+            parser = IncrementalObjectParser()
+            chunks = []
+            parsed = {}
             
-            return json.loads(response.choices[0].message.content)
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    
+                    chunks.append(delta)
+                    for key, value in parser.feed(delta):
+                        parsed[key] = value
+                        if partial_queue is not None:
+                            await partial_queue.put((key, value))
+                    
+                    if ("brand_alignment" in sections and "brand_alignment" not in parsed
+                            and self._has_critical_issue(parsed.get("ai_review"))):
+                        self.log_message("Critical issue found, skipping the rest of the review")
+                        return {
+                            "ai_review": AIReviewResult.model_validate(parsed["ai_review"]).model_dump(),
+                            "brand_alignment": self._failed_brand_check("Brand alignment check skipped: critical issue found")
+                        }
+            finally:
+                await stream.close()
+            
+            review = self.parse_full_review("".join(chunks), sections)
+            self._review_cache_put(cache_key, review)
+            
+            return review
             
         except Exception as e:
             self.log_message(f"AI content review failed: {e}", level="warning")
-            return {"overall_score": 3.0, "issues": [f"AI review failed: {e}"], "suggestions": []}
+            return self._failed_full_review(e, sections)
+        
+        finally:
+            if partial_queue is not None:
+                await partial_queue.put(None)
+    
+    async def run_review(self, content_text: str, components: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the AI content review, scoring brand alignment by embedding when that score is clear
+        
+        Only borderline or failed embedding scores leave brand alignment in the
+        chat request, so most posts get a shorter review completion.
+        """
+        brand_check = await self.embedded_brand_check(content_text)
+        if brand_check is None:
+            return await self.run_full_review(content_text, components)
+        
+        review = await self.run_full_review(content_text, components, sections=("ai_review",))
+        return {**review, "brand_alignment": brand_check}
+    
+    def _has_critical_issue(self, section: Optional[Dict[str, Any]]) -> bool:
+        """Whether a review section reports an issue that blocks approval"""
+        return bool(section) and any("critical" in str(issue).lower() for issue in section.get("issues", []))
+    
+    async def run_ai_content_review(self, content_text: str, components: Dict[str, Any]) -> Dict[str, Any]:
+        """Comprehensive AI-powered content review"""
+        review = await self.run_full_review(content_text, components)
+        return review["ai_review"]
     
     def validate_technical_requirements(self, content_text: str, components: Dict[str, Any]) -> Dict[str, Any]:
         """Validate technical content requirements"""
@@ -268,27 +924,18 @@ class ContentEditorAgent(BaseAgent):
         try:
             # Length validation
             char_count = len(content_text)
-            word_count = len(content_text.split())
+            word_count = sum(1 for _ in WORD_PATTERN.finditer(content_text))
+            min_length, max_length = self._length_limits
             
-            if char_count < self.brand_standards["content_requirements"]["min_length"]:
-                issues.append(f"Content too short: {char_count} characters (minimum {self.brand_standards['content_requirements']['min_length']})")
+            if char_count < min_length:
+                issues.append(f"Content too short: {char_count} characters (minimum {min_length})")
                 score -= 1.0
-            elif char_count > self.brand_standards["content_requirements"]["max_length"]:
-                issues.append(f"Content too long: {char_count} characters (maximum {self.brand_standards['content_requirements']['max_length']})")
+            elif char_count > max_length:
+                issues.append(f"Content too long: {char_count} characters (maximum {max_length})")
                 score -= 0.5
             
             # Required elements validation
-            required_elements = self.brand_standards["content_requirements"]["required_elements"]
-            missing_elements = []
-            
-            if not components.get("hook"):
-                missing_elements.append("hook")
-            if not components.get("main_content"):
-                missing_elements.append("main content")
-            if not components.get("cta"):
-                missing_elements.append("call to action")
-            if not components.get("hashtags"):
-                missing_elements.append("hashtags")
+            missing_elements = [label for key, label in REQUIRED_COMPONENTS if not components.get(key)]
             
             if missing_elements:
                 issues.append(f"Missing required elements: {', '.join(missing_elements)}")
@@ -296,17 +943,25 @@ class ContentEditorAgent(BaseAgent):
             
             # Hashtag validation
             hashtag_count = len(components.get("hashtags", []))
-            hashtag_requirements = self.brand_standards["content_requirements"]["hashtag_count"]
+            min_hashtags, max_hashtags = self._hashtag_limits
             
-            if hashtag_count < hashtag_requirements["min"]:
-                issues.append(f"Too few hashtags: {hashtag_count} (minimum {hashtag_requirements['min']})")
+            if hashtag_count < min_hashtags:
+                issues.append(f"Too few hashtags: {hashtag_count} (minimum {min_hashtags})")
                 score -= 0.3
-            elif hashtag_count > hashtag_requirements["max"]:
-                suggestions.append(f"Consider reducing hashtags: {hashtag_count} (recommended maximum {hashtag_requirements['max']})")
+            elif hashtag_count > max_hashtags:
+                suggestions.append(f"Consider reducing hashtags: {hashtag_count} (recommended maximum {max_hashtags})")
                 score -= 0.1
             
+            # Flag phrases used verbatim in the post, found in one pass
+            flagged_phrases = self._flag_matcher.find(content_text)
+            for severity, phrase in flagged_phrases:
+                if severity == "red":
+                    issues.append(f"Red flag phrase: {phrase}")
+                else:
+                    suggestions.append(f"Yellow flag phrase: {phrase}")
+            
             # Structure validation
-            if content_text and not any(emoji in content_text[:50] for emoji in ["🔥", "📈", "🚀", "💡", "⚡", "🎯"]):
+            if content_text and HOOK_EMOJIS.isdisjoint(content_text[:50]):
                 suggestions.append("Consider adding an engaging emoji to the hook")
                 score -= 0.2
             
@@ -317,7 +972,8 @@ class ContentEditorAgent(BaseAgent):
                 "metrics": {
                     "character_count": char_count,
                     "word_count": word_count,
-                    "hashtag_count": hashtag_count
+                    "hashtag_count": hashtag_count,
+                    "flagged_phrase_count": len(flagged_phrases)
                 }
             }
             
@@ -328,56 +984,63 @@ class ContentEditorAgent(BaseAgent):
                 "suggestions": []
             }
     
-    def validate_brand_alignment(self, content_text: str) -> Dict[str, Any]:
-        """Validate content alignment with brand standards"""
+    async def validate_brand_alignment(self, content_text: str) -> Dict[str, Any]:
+        """Validate content alignment with brand standards
+        
+        Scores by embedding similarity to the brand descriptors, falling back
+        to a brand-only chat check when the score is borderline or embedding fails.
+        """
+        brand_check = await self.embedded_brand_check(content_text)
+        if brand_check is not None:
+            return brand_check
+        
+        review = await self.run_full_review(content_text, {}, sections=("brand_alignment",))
+        return review["brand_alignment"]
+    
+    async def embedded_brand_check(self, content_text: str) -> Optional[Dict[str, Any]]:
+        """The embedding brand alignment score, or None when it is borderline or embedding fails"""
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            brand_prompt = f"""
-            Evaluate this content's alignment with our brand standards:
-            
-            Content: {content_text}
-            
-            Brand Standards:
-            - Voice: {self.brand_standards['voice']}
-            - Tone: {', '.join(self.brand_standards['tone'])}
-            - Messaging Pillars: {', '.join(self.brand_standards['messaging_pillars'])}
-            
-            Check for:
-            1. Voice consistency (authoritative yet approachable)
-            2. Appropriate tone (professional, insightful, practical)
-            3. Alignment with messaging pillars
-            4. Value for target audience (AI professionals, business leaders)
-            
-            Score 1-5 and provide specific feedback.
-            
-            Respond with JSON:
-            {{
-                "score": 4.2,
-                "voice_consistency": 4.0,
-                "tone_appropriateness": 4.5,
-                "message_alignment": 4.0,
-                "audience_value": 4.3,
-                "issues": ["issue if any"],
-                "suggestions": ["suggestion if any"]
-            }}
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": brand_prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=800
-            )
-            
-            return json.loads(response.choices[0].message.content)
-            
+            brand_check = await self.score_brand_alignment_by_embedding(content_text)
         except Exception as e:
-            return {
-                "score": 3.0,
-                "issues": [f"Brand alignment check failed: {e}"],
-                "suggestions": []
+            self.log_message(f"Embedding brand alignment failed: {e}", level="warning")
+            return None
+        
+        low, high = BRAND_BORDERLINE_SCORES
+        return None if low < brand_check["score"] < high else brand_check
+    
+    async def score_brand_alignment_by_embedding(self, content_text: str) -> Dict[str, Any]:
+        """Score brand alignment axes by cosine similarity between the content and brand descriptors"""
+        cache_key = self._review_cache_key("brand_embedding", content_text)
+        cached = self._review_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self._brand_embeddings is None:
+            response = await with_retry(self._embed, list(chain.from_iterable(self._brand_axes.values())))
+            vectors = iter([unit_vector(item.embedding) for item in response.data])
+            self._brand_embeddings = {
+                axis: [next(vectors) for _ in descriptors] for axis, descriptors in self._brand_axes.items()
             }
+        
+        response = await with_retry(self._embed, [content_text])
+        content_vector = unit_vector(response.data[0].embedding)
+        
+        # Vectors are unit length, so each dot product is the cosine similarity
+        axis_scores = {}
+        for axis, vectors in self._brand_embeddings.items():
+            similarities = [math.fsum(a * b for a, b in zip(content_vector, vector)) for vector in vectors]
+            axis_scores[axis] = similarity_score(sum(similarities) / len(similarities))
+        
+        brand_check = {
+            "score": round(sum(axis_scores.values()) / len(axis_scores), 2),
+            **axis_scores,
+            "issues": [],
+            "suggestions": [],
+            "method": "embeddings"
+        }
+        self._review_cache_put(cache_key, brand_check)
+        
+        return brand_check
     
     def generate_feedback_summary(self, review_results: Dict[str, Any]) -> str:
         """Generate human-readable feedback summary"""
@@ -396,7 +1059,7 @@ class ContentEditorAgent(BaseAgent):
             # Issues summary
             issues_text = ""
             if issues:
-                issues_text = f"\n🚨 Issues to address:\n" + "\n".join([f"• {issue}" for issue in issues[:5]])
+                issues_text = f"\n🚨 Issues to address:\n" + format_issues(issues[:5])
             
             # Suggestions summary  
             suggestions_text = ""
@@ -408,7 +1071,7 @@ class ContentEditorAgent(BaseAgent):
         except Exception as e:
             return f"Feedback summary generation failed: {e}"
     
-    def fact_check_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    async def fact_check_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Perform detailed fact-checking on content claims"""
         if not content:
             return self.create_response(False, error="No content provided for fact-checking")
@@ -416,61 +1079,80 @@ class ContentEditorAgent(BaseAgent):
         content_text = content.get("text", "")
         
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            fact_check_prompt = f"""
-            Perform fact-checking analysis on this AI-related content:
-            
-            {content_text}
-            
-            Check for:
-            1. Factual accuracy of AI/technology claims
-            2. Credibility of any statistics or data mentioned
-            3. Currency of information (is it up-to-date?)
-            4. Potential exaggerations or unsupported claims
-            5. Technical accuracy of AI concepts
-            
-            Provide specific feedback on any claims that need verification or correction.
-            
-            Respond with JSON:
-            {{
-                "fact_check_score": 4.5,
-                "verified_claims": ["claim 1", "claim 2"],
-                "questionable_claims": ["claim that needs verification"],
-                "inaccurate_claims": ["clearly wrong claim"],
-                "recommendations": ["specific recommendation"]
-            }}
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": fact_check_prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=1000
-            )
+            # Check each content-defined block, so an edited draft only resends the blocks that changed
+            blocks = split_content_blocks(content_text)
+            keys = [self._review_cache_key("fact_check_block", block) for block in blocks]
+            block_results = [self._review_cache_get(key) for key in keys]
+            pending = [i for i, result in enumerate(block_results) if result is None]
             
-            fact_check_results = json.loads(response.choices[0].message.content)
-            fact_check_results["fact_checked_at"] = datetime.utcnow().isoformat()
+            if pending:
+                response = await with_retry(self._complete, self.build_fact_check_request([blocks[i] for i in pending]))
+                
+                checked = FactCheckResult.model_validate_json(response.choices[0].message.content).model_dump()
+                by_number = {result["block"]: result for result in checked["blocks"]}
+                
+                for number, i in enumerate(pending, start=1):
+                    result = by_number.get(number)
+                    if result is None:
+                        self.log_message(f"Fact check response missing block {number}", level="warning")
+                        continue
+                    block_results[i] = result
+                    self._review_cache_put(keys[i], result)
+            
+            fact_check_results = merge_fact_checks(
+                [(block, result) for block, result in zip(blocks, block_results) if result is not None]
+            )
+            fact_check_results["fact_checked_at"] = self.utc_timestamp()
             
             return self.create_response(True, fact_check_results)
             
         except Exception as e:
             return self.create_response(False, error=f"Fact-checking failed: {e}")
     
-    def score_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    def build_fact_check_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every fact-check request"""
+        return """
+        Perform fact-checking analysis on the numbered blocks of AI-related content provided by the user.
+        
+        Check each block for:
+        1. Factual accuracy of AI/technology claims
+        2. Credibility of any statistics or data mentioned
+        3. Currency of information (is it up-to-date?)
+        4. Potential exaggerations or unsupported claims
+        5. Technical accuracy of AI concepts
+        
+        Provide specific feedback on any claims that need verification or correction, at most 5 short items per list.
+        Return one entry per block, numbered as in the input, with a fact_check_score from 1 to 5.
+        """
+    
+    def build_fact_check_request(self, blocks: List[str]) -> Dict[str, Any]:
+        """Build the chat completion request fact-checking numbered content blocks"""
+        numbered_blocks = "\n\n".join(f"[Block {number}]\n{block}" for number, block in enumerate(blocks, start=1))
+        
+        return {
+            "model": FACT_CHECK_MODEL,
+            "messages": [
+                {"role": "system", "content": self._fact_check_prompt_prefix},
+                {"role": "user", "content": numbered_blocks}
+            ],
+            "response_format": FACT_CHECK_FORMAT,
+            "max_tokens": min(FACT_CHECK_TOKENS_PER_BLOCK * len(blocks), FACT_CHECK_MAX_TOKENS)
+        }
+    
+    async def score_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Generate detailed content scoring"""
         if not content:
             return self.create_response(False, error="No content provided for scoring")
         
         # Run a simplified review focused on scoring
-        review_result = self.review_content(content)
+        review_result = await self.review_content(content)
         
         if review_result.get("success"):
             scoring_data = {
                 "overall_score": review_result.get("data", {}).get("overall_score", 0),
                 "detailed_scores": review_result.get("data", {}).get("detailed_scores", {}),
                 "scoring_criteria": self.quality_criteria,
-                "scored_at": datetime.utcnow().isoformat()
+                "scored_at": self.utc_timestamp()
             }
             return self.create_response(True, scoring_data)
         else:
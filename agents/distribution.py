@@ -6,17 +6,77 @@ Handles publishing content to LinkedIn and other social platforms
 
 import os
 import json
-import requests
-from datetime import datetime
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple
 import base64
 
+import httpx
 from agents.base_agent import BaseAgent
-from openai import OpenAI
+from openai import AsyncOpenAI
+from utils import serialization
+from utils.retry import UNSENT_ERRORS, UNSENT_STATUS_CODES, request_with_retry
+
+# The LinkedIn person URN is fixed per access token; re-check it daily in case the token changes hands
+LINKEDIN_URN_TTL = 24 * 60 * 60
+
+FALLBACK_IMAGE_PROMPT = "Professional AI technology illustration, modern blue design, abstract concept art, clean business style, suitable for LinkedIn"
+
+# Invariant parts of platform requests. Request bodies are only serialized, never mutated,
+# so these are shared by reference rather than copied into each request
+LINKEDIN_HEADERS = {"Content-Type": "application/json", "X-Restli-Protocol-Version": "2.0.0"}
+LINKEDIN_VISIBILITY = {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
+LINKEDIN_IMAGE_RECIPES = ["urn:li:digitalmediaRecipe:feedshare-image"]
+LINKEDIN_IMAGE_RELATIONSHIPS = [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
+X_HEADERS = {"Content-Type": "application/json"}
+
+# Platforms whose publish path actually uploads an image
+IMAGE_UPLOAD_PLATFORMS = frozenset({"linkedin"})
+
+# Seconds a publish waits for its image before posting text-only
+IMAGE_WAIT_TIMEOUT = 8.0
+
+# Pooled, keep-alive connections to the platform APIs, with connection failures retried by the transport
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_CONNECT_RETRIES = 3
+
+# Requests allowed in flight at once per platform API, and DALL-E generations (about 50 images/min at ~8s each)
+PLATFORM_CONCURRENCY = {"linkedin": 5, "x": 5}
+IMAGE_CONCURRENCY = 8
 
 class DistributionAgent(BaseAgent):
     """Manages content distribution across social media platforms"""
     
+    # Concurrency limits shared by every distributor on the same event loop: loop -> (platform slots, image slots).
+    # Semaphores bind to the loop that first waits on them, so each loop gets its own
+    _loop_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Dict[str, asyncio.Semaphore], asyncio.Semaphore]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
+    @classmethod
+    def _concurrency_slots(cls) -> Tuple[Dict[str, asyncio.Semaphore], asyncio.Semaphore]:
+        """Platform and image semaphores for the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        slots = cls._loop_slots.get(loop)
+        if slots is None:
+            slots = cls._loop_slots[loop] = (
+                {platform: asyncio.Semaphore(limit) for platform, limit in PLATFORM_CONCURRENCY.items()},
+                asyncio.Semaphore(IMAGE_CONCURRENCY)
+            )
+        return slots
+    
+    @property
+    def _platform_slots(self) -> Dict[str, asyncio.Semaphore]:
+        return self._concurrency_slots()[0]
+    
+    @property
+    def _image_slots(self) -> asyncio.Semaphore:
+        return self._concurrency_slots()[1]
+    
     def __init__(self):
         super().__init__(
             name="Distribution Agent",
@@ -24,8 +84,11 @@ class DistributionAgent(BaseAgent):
             tools=["linkedin_api", "x_api", "dalle_image_generation", "platform_optimization"]
         )
         
-        # Initialize OpenAI client for image generation
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Initialize OpenAI client for image generation; async, so generation can be cancelled past its deadline
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        
+        # Pooled HTTP client for the platform APIs, built on first use and released by close()
+        self._http_client: Optional[httpx.AsyncClient] = None
         
         # Platform configurations
         self.platforms = {
@@ -45,16 +108,56 @@ class DistributionAgent(BaseAgent):
             }
         }
         
+        # Enabled platforms, fixed for the agent's lifetime: ordered for status reports, a set for lookups
+        self._platforms_configured = tuple(p for p, config in self.platforms.items() if config["enabled"])
+        self._enabled_platforms = frozenset(self._platforms_configured)
+        self._image_platforms = frozenset(
+            p for p in self._enabled_platforms if self.platforms[p]["supports_images"] and p in IMAGE_UPLOAD_PLATFORMS
+        )
+        
         # Content optimization settings
         self.optimization_settings = {
             "generate_images": True,
             "image_style": "professional, clean, modern, AI-themed",
             "brand_colors": ["#1e3a8a", "#3b82f6", "#60a5fa", "#93c5fd"],
-            "include_branding": True
+            "include_branding": True,
+            # Have gpt-4o write the DALL-E prompt instead of filling in the template
+            "llm_prompt_rewrite": False
         }
         
-        # Publishing status tracking
-        self.publishing_history = []
+        # Publishing status tracking; only the last 100 attempts are kept
+        self.publishing_history = deque(maxlen=100)
+        
+        # Attempt counters over the entries in publishing_history, updated as entries come and go
+        self._publishing_stats = {"total": 0, "successful": 0, "per_platform": {}}
+        
+        # LRU cache of rewritten image prompts keyed by the content they describe
+        self._image_prompt_cache: OrderedDict = OrderedDict()
+        self._image_prompt_cache_maxsize = 256
+        
+        # LinkedIn person URN per access token hash: (urn, fetched_at on the monotonic clock)
+        self._linkedin_urn_cache: Dict[str, Tuple[str, float]] = {}
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Async HTTP client for this distributor's platform requests, built on first use"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                transport=httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES)
+            )
+        return self._http_client
+    
+    async def aclose(self):
+        """Close the pooled platform and OpenAI connections"""
+        if self._http_client is not None:
+            client, self._http_client = self._http_client, None
+            await client.aclose()
+        await self.openai_client.close()
+    
+    def close(self):
+        """Close the pooled connections on the agent event loop"""
+        self.run_async(self.aclose())
     
     def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute distribution task"""
@@ -63,17 +166,21 @@ class DistributionAgent(BaseAgent):
         if task_type == "publish_content":
             content = task_data.get("content")
             platforms = task_data.get("platforms", ["linkedin"])
-            return self.publish_content(content, platforms)
+            return self.run_async(self.publish_content(content, platforms))
+        elif task_type == "publish_content_batch":
+            contents = task_data.get("contents", [])
+            platforms = task_data.get("platforms", ["linkedin"])
+            return self.run_async(self.publish_content_batch(contents, platforms))
         elif task_type == "generate_image":
             prompt = task_data.get("prompt")
-            return self.generate_content_image(prompt)
+            return self.run_async(self.generate_content_image(prompt, include_base64=task_data.get("include_base64", False)))
         elif task_type == "get_publishing_status":
             return self.get_publishing_status()
         else:
             return self.create_response(False, error=f"Unknown task type: {task_type}")
     
-    def publish_content(self, content: Dict[str, Any], platforms: List[str] = None) -> Dict[str, Any]:
-        """Publish content to specified social platforms"""
+    async def publish_content(self, content: Dict[str, Any], platforms: List[str] = None) -> Dict[str, Any]:
+        """Publish content to specified social platforms, all platforms at once"""
         if not content:
             return self.create_response(False, error="No content provided for publishing")
         
@@ -81,46 +188,37 @@ class DistributionAgent(BaseAgent):
         self.log_message(f"Publishing content to platforms: {', '.join(platforms)}")
         
         try:
-            # Generate visual asset if needed
-            image_data = None
-            if self.optimization_settings["generate_images"]:
-                image_result = self.generate_content_image_from_content(content)
-                if image_result.get("success"):
-                    image_data = image_result.get("data")
+            # Generate visual asset if a target platform will post it, in the background while content is optimized
+            image_task = None
+            if self.optimization_settings["generate_images"] and not self._image_platforms.isdisjoint(platforms):
+                image_task = asyncio.create_task(self._generate_image_async(content))
+            
+            # Optimize content once per enabled platform, ahead of the publish fan-out
+            optimized_at = self.utc_timestamp()
+            optimized = {
+                platform: self.optimize_content_for_platform(content, platform, optimized_at)
+                for platform in dict.fromkeys(platforms)
+                if platform in self._enabled_platforms
+            }
             
-            # Publish to each platform
-            publishing_results = {}
+            # Publish to every platform concurrently; only posts that carry the image wait for it
+            results = await asyncio.gather(
+                *[self._publish_one(content, platform, optimized.get(platform), image_task) for platform in platforms],
+                return_exceptions=True
+            )
             
-            for platform in platforms:
-                if platform not in self.platforms:
-                    publishing_results[platform] = {
-                        "success": False,
-                        "error": f"Platform {platform} not supported"
-                    }
-                    continue
-                
-                if not self.platforms[platform]["enabled"]:
-                    publishing_results[platform] = {
-                        "success": False,
-                        "error": f"Platform {platform} not configured"
-                    }
-                    continue
-                
-                # Optimize content for platform
-                optimized_content = self.optimize_content_for_platform(content, platform)
-                
-                # Publish to platform
-                if platform == "linkedin":
-                    result = self.publish_to_linkedin(optimized_content, image_data)
-                elif platform == "x":
-                    result = self.publish_to_x(optimized_content, image_data)
+            image_data = None
+            if image_task is not None:
+                if image_task.done():
+                    image_data = self._image_data(image_task)
                 else:
-                    result = {"success": False, "error": f"Publishing method not implemented for {platform}"}
-                
+                    image_task.cancel()
+            
+            publishing_results = {}
+            for platform, result in zip(platforms, results):
+                if isinstance(result, Exception):
+                    result = {"success": False, "error": f"Publishing to {platform} failed: {result}"}
                 publishing_results[platform] = result
-                
-                # Log publishing attempt
-                self.log_publishing_attempt(content, platform, result)
             
             # Determine overall success
             successful_publishes = [r for r in publishing_results.values() if r.get("success")]
@@ -131,15 +229,112 @@ class DistributionAgent(BaseAgent):
                 "successful_platforms": len(successful_publishes),
                 "total_platforms": len(platforms),
                 "image_generated": image_data is not None,
-                "published_at": datetime.utcnow().isoformat()
+                "published_at": self.utc_timestamp()
             })
             
         except Exception as e:
             self.log_message(f"Content publishing failed: {e}", level="error")
             return self.create_response(False, error=f"Content publishing failed: {e}")
     
-    def optimize_content_for_platform(self, content: Dict[str, Any], platform: str) -> Dict[str, Any]:
-        """Optimize content for specific platform requirements"""
+    async def publish_content_batch(self, contents: List[Dict[str, Any]], platforms: List[str] = None) -> Dict[str, Any]:
+        """Publish many contents concurrently over the shared connection pool, results in input order
+        
+        Neither LinkedIn's ugcPosts nor X's tweets endpoint accepts batches, so
+        each post is its own request; the per-platform limits keep the burst
+        within rate limits.
+        """
+        if not contents:
+            return self.create_response(False, error="No content provided for publishing")
+        
+        platforms = platforms or ["linkedin"]
+        
+        # Look the LinkedIn profile up once, so the concurrent posts all find it cached
+        access_token = self.platforms["linkedin"]["access_token"]
+        if "linkedin" in platforms and "linkedin" in self._enabled_platforms and access_token:
+            try:
+                await self.get_linkedin_person_urn(
+                    hashlib.sha256(access_token.encode()).hexdigest(),
+                    {**LINKEDIN_HEADERS, "Authorization": f"Bearer {access_token}"}
+                )
+            except Exception as e:
+                self.log_message(f"LinkedIn profile lookup failed: {e}", level="warning")
+        
+        results = await asyncio.gather(*(self.publish_content(content, platforms) for content in contents))
+        
+        return self.create_response(True, {
+            "results": results,
+            "published_count": sum(1 for result in results if result.get("success")),
+            "total_count": len(results)
+        })
+    
+    async def _publish_one(self, content: Dict[str, Any], platform: str, optimized_content: Optional[Dict[str, Any]],
+                           image_task: Optional[asyncio.Task] = None) -> Dict[str, Any]:
+        """Publish content already optimized for one platform and log the attempt"""
+        if platform not in self._enabled_platforms:
+            reason = "not configured" if platform in self.platforms else "not supported"
+            return {"success": False, "error": f"Platform {platform} {reason}"}
+        
+        # Publish to platform
+        if platform == "linkedin":
+            result = await self.publish_to_linkedin(optimized_content, image_task=image_task)
+        elif platform == "x":
+            result = await self.publish_to_x(optimized_content)
+        else:
+            result = {"success": False, "error": f"Publishing method not implemented for {platform}"}
+        
+        # Log publishing attempt
+        self.log_publishing_attempt(content, platform, result)
+        
+        return result
+    
+    async def _generate_image_async(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the content image within the DALL-E concurrency limit
+        
+        The image is decoded here for upload; the raw bytes stay within the publish path.
+        """
+        async with self._image_slots:
+            result = await self.generate_content_image_from_content(content)
+        
+        if result.get("success") and result["data"].get("b64_json"):
+            data = dict(result["data"])
+            data["bytes"] = base64.b64decode(data.pop("b64_json"))
+            result = {**result, "data": data}
+        return result
+    
+    async def _platform_request(self, platform: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a platform API request within the platform's concurrency limit, retrying transient failures
+        
+        JSON bodies must be sent with a Content-Type: application/json header.
+        Lookups are retried on rate limits, server errors and network errors;
+        posts only when the request was certainly not processed, so a retry
+        never publishes twice.
+        """
+        send = getattr(self.http_client, method)
+        # Encode JSON bodies once, with orjson when installed, rather than per attempt with the stdlib encoder
+        if "json" in kwargs:
+            kwargs["content"] = serialization.dumps_bytes(kwargs.pop("json"))
+        retry_on = {} if method == "get" else {"retry_statuses": UNSENT_STATUS_CODES, "retry_errors": UNSENT_ERRORS}
+        async with self._platform_slots[platform]:
+            return await request_with_retry(lambda: send(url, **kwargs), **retry_on)
+    
+    async def _wait_for_image(self, image_task: asyncio.Task) -> Optional[Dict[str, Any]]:
+        """Image data from a generation task, or None if it fails or misses the soft deadline"""
+        done, _ = await asyncio.wait({image_task}, timeout=IMAGE_WAIT_TIMEOUT)
+        if not done:
+            self.log_message("Image generation too slow, publishing without an image", level="warning")
+            return None
+        return self._image_data(image_task)
+    
+    def _image_data(self, image_task: asyncio.Task) -> Optional[Dict[str, Any]]:
+        """Image data from a finished generation task, if it succeeded"""
+        if image_task.cancelled() or image_task.exception() is not None:
+            return None
+        image_result = image_task.result()
+        return image_result.get("data") if image_result.get("success") else None
+    
+    def optimize_content_for_platform(self, content: Dict[str, Any], platform: str,
+                                      optimized_at: Optional[str] = None) -> Dict[str, Any]:
+        """Optimize content for specific platform requirements, optionally sharing one timestamp across platforms"""
         platform_config = self.platforms.get(platform, {})
         max_length = platform_config.get("max_length", 3000)
         
@@ -147,62 +342,60 @@ class DistributionAgent(BaseAgent):
         
         # Truncate if necessary
         if len(content_text) > max_length:
-            # Try to truncate at sentence boundary
-            sentences = content_text.split('. ')
-            truncated = ""
+            # Try to truncate at the last sentence boundary that fits, leaving room for "..."
+            cut = content_text.rfind('. ', 0, max_length - 20)
             
-            for sentence in sentences:
-                if len(truncated + sentence + '. ') <= max_length - 20:  # Leave room for "..."
-                    truncated += sentence + '. '
-                else:
-                    break
-            
-            if not truncated:
-                truncated = content_text[:max_length-3] + "..."
+            if cut < 0:
+                content_text = content_text[:max_length-3] + "..."
             else:
-                truncated = truncated.rstrip() + "..."
-            
-            content_text = truncated
+                content_text = content_text[:cut + 1] + "..."
         
         # Platform-specific optimizations
         if platform == "x":
             # For X/Twitter, prioritize hashtags and make content more concise
             hashtags = content.get("hashtags", [])
-            if hashtags and len(content_text) + len(" ".join(hashtags)) <= max_length:
-                content_text += "\n\n" + " ".join(hashtags[:3])  # Limit hashtags for X
+            if hashtags:
+                hashtag_suffix = "\n\n" + " ".join(hashtags[:3])  # Limit hashtags for X
+                if len(content_text) + len(hashtag_suffix) <= max_length:
+                    content_text += hashtag_suffix
         
         return {
             **content,
             "text": content_text,
             "platform": platform,
-            "optimized_at": datetime.utcnow().isoformat()
+            "optimized_at": optimized_at or self.utc_timestamp()
         }
     
-    def publish_to_linkedin(self, content: Dict[str, Any], image_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Publish content to LinkedIn"""
+    async def publish_to_linkedin(self, content: Dict[str, Any], image_data: Dict[str, Any] = None,
+                                  image_task: Optional[asyncio.Task] = None) -> Dict[str, Any]:
+        """Publish content to LinkedIn
+        
+        The image may be given as a generation task still in flight, which is
+        awaited only once the author profile has been looked up.
+        """
         access_token = self.platforms["linkedin"]["access_token"]
         
         if not access_token:
             return {"success": False, "error": "LinkedIn access token not configured"}
         
         try:
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-                "X-Restli-Protocol-Version": "2.0.0"
-            }
+            headers = {**LINKEDIN_HEADERS, "Authorization": f"Bearer {access_token}"}
             
-            # Get user profile info
-            profile_response = requests.get(
-                f"{self.platforms['linkedin']['api_endpoint']}/me",
-                headers=headers
-            )
+            token_key = hashlib.sha256(access_token.encode()).hexdigest()
             
-            if profile_response.status_code != 200:
-                return {"success": False, "error": f"Failed to get LinkedIn profile: {profile_response.text}"}
+            # Get user profile info, unless the URN for this token is cached
+            profile = await self.get_linkedin_person_urn(token_key, headers)
+            if not profile["success"]:
+                return profile
+            person_urn = profile["urn"]
             
-            profile_data = profile_response.json()
-            person_urn = f"urn:li:person:{profile_data['id']}"
+            if image_task is not None:
+                image_data = await self._wait_for_image(image_task)
+            
+            # Upload the image bytes to LinkedIn's media API; the post goes out text-only if that fails
+            image_asset = None
+            if image_data and image_data.get("bytes"):
+                image_asset = await self.upload_linkedin_image(image_data["bytes"], person_urn, headers)
             
             # Prepare post data
             post_data = {
@@ -213,44 +406,53 @@ class DistributionAgent(BaseAgent):
                         "shareCommentary": {
                             "text": content.get("text", "")
                         },
-                        "shareMediaCategory": "ARTICLE" if not image_data else "IMAGE"
+                        "shareMediaCategory": "ARTICLE" if not image_asset else "IMAGE"
                     }
                 },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
-                }
+                "visibility": LINKEDIN_VISIBILITY
             }
             
             # Add image if available
-            if image_data and image_data.get("url"):
-                # For simplicity, we'll post as article with image URL
-                # In production, you'd upload the image to LinkedIn's media API first
+            if image_asset:
                 post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [{
                     "status": "READY",
                     "description": {
                         "text": "AI Innovation Insights"
                     },
-                    "media": image_data.get("url"),
+                    "media": image_asset,
                     "title": {
                         "text": content.get("hook", "AI Innovation Update")[:100]
                     }
                 }]
             
             # Post to LinkedIn
-            response = requests.post(
-                f"{self.platforms['linkedin']['api_endpoint']}/ugcPosts",
+            response = await self._platform_request(
+                "linkedin", "post", f"{self.platforms['linkedin']['api_endpoint']}/ugcPosts",
                 headers=headers,
                 json=post_data
             )
             
+            # A cached URN may be stale for this token; refetch the profile and retry once
+            if response.status_code == 401 and profile["cached"]:
+                self._linkedin_urn_cache.pop(token_key, None)
+                profile = await self.get_linkedin_person_urn(token_key, headers)
+                if not profile["success"]:
+                    return profile
+                post_data["author"] = profile["urn"]
+                response = await self._platform_request(
+                    "linkedin", "post", f"{self.platforms['linkedin']['api_endpoint']}/ugcPosts",
+                    headers=headers,
+                    json=post_data
+                )
+            
             if response.status_code in [200, 201]:
-                post_id = response.json().get("id", "unknown")
+                post_id = serialization.loads(response.content).get("id", "unknown")
                 return {
                     "success": True,
                     "platform": "linkedin",
                     "post_id": post_id,
                     "post_url": f"https://www.linkedin.com/feed/update/{post_id}",
-                    "published_at": datetime.utcnow().isoformat()
+                    "published_at": self.utc_timestamp()
                 }
             else:
                 return {
@@ -261,7 +463,64 @@ class DistributionAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": f"LinkedIn publishing failed: {e}"}
     
-    def publish_to_x(self, content: Dict[str, Any], image_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def upload_linkedin_image(self, image_bytes: bytes, person_urn: str, headers: Dict[str, str]) -> Optional[str]:
+        """Register and upload an image with LinkedIn, returning its asset URN"""
+        try:
+            register_response = await self._platform_request(
+                "linkedin", "post", f"{self.platforms['linkedin']['api_endpoint']}/assets?action=registerUpload",
+                headers=headers,
+                json={
+                    "registerUploadRequest": {
+                        "recipes": LINKEDIN_IMAGE_RECIPES,
+                        "owner": person_urn,
+                        "serviceRelationships": LINKEDIN_IMAGE_RELATIONSHIPS
+                    }
+                }
+            )
+            
+            if register_response.status_code not in [200, 201]:
+                self.log_message(f"LinkedIn image registration failed: {register_response.text}", level="warning")
+                return None
+            
+            upload = serialization.loads(register_response.content)["value"]
+            upload_url = upload["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
+            
+            upload_response = await self._platform_request(
+                "linkedin", "put", upload_url,
+                headers={"Authorization": headers["Authorization"]},
+                content=image_bytes
+            )
+            
+            if upload_response.status_code not in [200, 201]:
+                self.log_message(f"LinkedIn image upload failed: {upload_response.status_code}", level="warning")
+                return None
+            
+            return upload["asset"]
+            
+        except Exception as e:
+            self.log_message(f"LinkedIn image upload failed: {e}", level="warning")
+            return None
+    
+    async def get_linkedin_person_urn(self, token_key: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Look up the LinkedIn person URN for an access token, fetching /me only when not cached"""
+        cached = self._linkedin_urn_cache.get(token_key)
+        if cached and time.monotonic() - cached[1] < LINKEDIN_URN_TTL:
+            return {"success": True, "urn": cached[0], "cached": True}
+        
+        profile_response = await self._platform_request(
+            "linkedin", "get", f"{self.platforms['linkedin']['api_endpoint']}/me",
+            headers=headers
+        )
+        
+        if profile_response.status_code != 200:
+            return {"success": False, "error": f"Failed to get LinkedIn profile: {profile_response.text}"}
+        
+        person_urn = f"urn:li:person:{serialization.loads(profile_response.content)['id']}"
+        self._linkedin_urn_cache[token_key] = (person_urn, time.monotonic())
+        
+        return {"success": True, "urn": person_urn, "cached": False}
+    
+    async def publish_to_x(self, content: Dict[str, Any], image_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Publish content to X (Twitter)"""
         # Note: This is a simplified implementation. In production, you'd use proper OAuth 2.0
         # and handle image uploads through X's media API
@@ -272,10 +531,7 @@ class DistributionAgent(BaseAgent):
             return {"success": False, "error": "X access token not configured"}
         
         try:
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
+            headers = {**X_HEADERS, "Authorization": f"Bearer {access_token}"}
             
             tweet_data = {
                 "text": content.get("text", "")
@@ -286,14 +542,14 @@ class DistributionAgent(BaseAgent):
                 # Placeholder - in production, upload media first and get media_id
                 pass
             
-            response = requests.post(
-                f"{self.platforms['x']['api_endpoint']}/tweets",
+            response = await self._platform_request(
+                "x", "post", f"{self.platforms['x']['api_endpoint']}/tweets",
                 headers=headers,
                 json=tweet_data
             )
             
             if response.status_code in [200, 201]:
-                tweet_data = response.json()
+                tweet_data = serialization.loads(response.content)
                 tweet_id = tweet_data.get("data", {}).get("id", "unknown")
                 
                 return {
@@ -301,7 +557,7 @@ class DistributionAgent(BaseAgent):
                     "platform": "x",
                     "post_id": tweet_id,
                     "post_url": f"https://x.com/i/status/{tweet_id}",
-                    "published_at": datetime.utcnow().isoformat()
+                    "published_at": self.utc_timestamp()
                 }
             else:
                 return {
@@ -312,7 +568,7 @@ class DistributionAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": f"X publishing failed: {e}"}
     
-    def generate_content_image_from_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_content_image_from_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Generate an image based on the content"""
         try:
             # Extract key themes from content
@@ -321,16 +577,45 @@ class DistributionAgent(BaseAgent):
             hashtags = content.get("hashtags", [])
             
             # Create image prompt based on content
-            image_prompt = self.create_image_prompt_from_content(content_text, hook, hashtags)
+            image_prompt = await self.create_image_prompt_from_content(content_text, hook, hashtags)
             
-            return self.generate_content_image(image_prompt)
+            # Inline, so uploading the image does not need another download
+            return await self.generate_content_image(image_prompt, include_base64=True)
             
         except Exception as e:
             self.log_message(f"Content-based image generation failed: {e}", level="warning")
             return self.create_response(False, error=f"Image generation failed: {e}")
     
-    def create_image_prompt_from_content(self, content_text: str, hook: str, hashtags: List[str]) -> str:
-        """Create DALL-E prompt based on content"""
+    async def create_image_prompt_from_content(self, content_text: str, hook: str, hashtags: List[str]) -> str:
+        """Create DALL-E prompt based on content, from a template unless LLM rewriting is enabled"""
+        if self.optimization_settings["llm_prompt_rewrite"]:
+            return await self.rewrite_image_prompt(content_text, hook, hashtags)
+        
+        if not (hook or content_text):
+            return FALLBACK_IMAGE_PROMPT
+        
+        preview = " ".join(content_text[:200].split())
+        themes = f" Themes: {', '.join(tag.lstrip('#') for tag in hashtags[:5])}." if hashtags else ""
+        
+        return (
+            f"Abstract AI/technology illustration representing: {hook}. Concept: {preview}.{themes} "
+            f"Professional business illustration, clean modern design, "
+            f"blue palette ({', '.join(self.optimization_settings['brand_colors'][:3])}), "
+            f"high contrast, no text, no people, suitable for LinkedIn."
+        )
+    
+    async def rewrite_image_prompt(self, content_text: str, hook: str, hashtags: List[str]) -> str:
+        """Have gpt-4o write a DALL-E prompt for the content
+        
+        Prompts are cached by hook, preview and hashtags, so retries and
+        repeat publishes of the same draft skip the request.
+        """
+        cache_key = (hook, content_text[:500], tuple(hashtags[:5]))
+        cached = self._image_prompt_cache.get(cache_key)
+        if cached is not None:
+            self._image_prompt_cache.move_to_end(cache_key)
+            return cached
+        
         try:
             # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
             # do not change this unless explicitly requested by the user
@@ -352,7 +637,7 @@ class DistributionAgent(BaseAgent):
             Create a detailed prompt for generating a relevant visual.
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[{"role": "user", "content": prompt_creation}],
                 max_tokens=300
@@ -363,34 +648,43 @@ class DistributionAgent(BaseAgent):
             # Enhance with style specifications
             final_prompt = f"{generated_prompt}. Professional business illustration style, clean design, modern technology aesthetic, blue color palette, high quality, suitable for LinkedIn."
             
+            self._image_prompt_cache[cache_key] = final_prompt
+            if len(self._image_prompt_cache) > self._image_prompt_cache_maxsize:
+                self._image_prompt_cache.popitem(last=False)
+            
             return final_prompt
             
         except Exception as e:
             # Fallback to generic prompt
-            return f"Professional AI technology illustration, modern blue design, abstract concept art, clean business style, suitable for LinkedIn"
+            return FALLBACK_IMAGE_PROMPT
     
-    def generate_content_image(self, prompt: str) -> Dict[str, Any]:
-        """Generate image using DALL-E"""
+    async def generate_content_image(self, prompt: str, include_base64: bool = False) -> Dict[str, Any]:
+        """Generate image using DALL-E
+        
+        The result carries the image URL, or with include_base64 the image
+        itself as a base64 string under "b64_json".
+        """
         if not prompt:
             return self.create_response(False, error="No prompt provided for image generation")
         
         try:
             self.log_message(f"Generating image with prompt: {prompt[:100]}...")
             
-            response = self.openai_client.images.generate(
+            response = await self.openai_client.images.generate(
                 model="dall-e-3",
                 prompt=prompt,
                 size="1024x1024",
                 quality="standard",
+                response_format="b64_json" if include_base64 else "url",
                 n=1
             )
             
-            image_url = response.data[0].url
+            image = {"b64_json": response.data[0].b64_json} if include_base64 else {"url": response.data[0].url}
             
             return self.create_response(True, {
-                "url": image_url,
+                **image,
                 "prompt": prompt,
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": self.utc_timestamp(),
                 "model": "dall-e-3",
                 "size": "1024x1024"
             })
@@ -407,46 +701,52 @@ class DistributionAgent(BaseAgent):
             "success": result.get("success", False),
             "post_id": result.get("post_id"),
             "error": result.get("error"),
-            "attempted_at": datetime.utcnow().isoformat()
+            "attempted_at": self.utc_timestamp()
         }
         
+        # The deque drops its oldest entry on append once full; take it out of the counters first
+        if len(self.publishing_history) == self.publishing_history.maxlen:
+            self._count_publishing_attempt(self.publishing_history[0], -1)
+        
         self.publishing_history.append(log_entry)
+        self._count_publishing_attempt(log_entry, 1)
+    
+    def _count_publishing_attempt(self, entry: Dict[str, Any], delta: int):
+        """Add (delta=1) or remove (delta=-1) a history entry from the attempt counters"""
+        successful = delta if entry.get("success") else 0
+        self._publishing_stats["total"] += delta
+        self._publishing_stats["successful"] += successful
         
-        # Keep only last 100 entries
-        if len(self.publishing_history) > 100:
-            self.publishing_history = self.publishing_history[-100:]
+        per_platform = self._publishing_stats["per_platform"]
+        platform = entry.get("platform", "unknown")
+        stats = per_platform.setdefault(platform, {"total": 0, "successful": 0})
+        stats["total"] += delta
+        stats["successful"] += successful
+        if not stats["total"]:
+            del per_platform[platform]
     
     def get_publishing_status(self) -> Dict[str, Any]:
         """Get publishing history and status"""
         try:
             # Calculate success rates
-            total_attempts = len(self.publishing_history)
-            successful_attempts = len([h for h in self.publishing_history if h.get("success")])
+            total_attempts = self._publishing_stats["total"]
+            successful_attempts = self._publishing_stats["successful"]
             
             success_rate = (successful_attempts / total_attempts * 100) if total_attempts > 0 else 0
             
-            # Platform breakdown
-            platform_stats = {}
-            for entry in self.publishing_history:
-                platform = entry.get("platform", "unknown")
-                if platform not in platform_stats:
-                    platform_stats[platform] = {"total": 0, "successful": 0}
-                
-                platform_stats[platform]["total"] += 1
-                if entry.get("success"):
-                    platform_stats[platform]["successful"] += 1
-            
-            # Calculate platform success rates
-            for platform, stats in platform_stats.items():
-                stats["success_rate"] = (stats["successful"] / stats["total"] * 100) if stats["total"] > 0 else 0
+            # Platform breakdown with success rates
+            platform_stats = {
+                platform: {**stats, "success_rate": stats["successful"] / stats["total"] * 100}
+                for platform, stats in self._publishing_stats["per_platform"].items()
+            }
             
             return self.create_response(True, {
                 "total_attempts": total_attempts,
                 "successful_attempts": successful_attempts,
                 "success_rate": round(success_rate, 1),
                 "platform_stats": platform_stats,
-                "recent_attempts": self.publishing_history[-10:],  # Last 10 attempts
-                "platforms_configured": [p for p, config in self.platforms.items() if config["enabled"]]
+                "recent_attempts": list(self.publishing_history)[-10:],  # Last 10 attempts
+                "platforms_configured": list(self._platforms_configured)
             })
             
         except Exception as e:
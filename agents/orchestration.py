@@ -4,12 +4,60 @@ Chief Content Officer / Workflow Manager
 Coordinates the entire content creation pipeline
 """
 
-import json
-from datetime import datetime
-from typing import Dict, Any, List
+import asyncio
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Type
 
 from agents.base_agent import BaseAgent
-from utils.logger import setup_logger
+from agents.content_developer import ContentDeveloperAgent
+from agents.content_editor import ContentEditorAgent
+from agents.scheduler import SchedulerAgent
+from agents.trend_researcher import TrendResearcherAgent
+from utils.ids import time_ordered_id
+from utils.phrase_matcher import PhraseMatcher
+
+# Sub-agent requests in flight at once across a pipeline run
+MAX_PARALLEL_AGENTS = 3
+
+# Seconds each sub-agent request may take before the pipeline gives up on it
+STAGE_TIMEOUTS = {"trends": 180.0, "content": 90.0, "editing": 90.0, "scheduling": 30.0}
+
+# Consecutive timed out or failed sub-agent requests after which a run stops calling agents
+BREAKER_THRESHOLD = 3
+
+# Most recent pipeline errors kept in the status; older entries are dropped
+ERROR_HISTORY_LIMIT = 100
+
+def iso_from_ns(ts_ns: int) -> str:
+    """Format a time.time_ns() value as an ISO UTC timestamp with microseconds"""
+    seconds, nanos = divmod(ts_ns, 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))}.{nanos // 1000:06d}"
+
+# Per-run counters reported alongside the run's status
+RUN_COUNTERS = ("posts_generated", "posts_approved", "posts_published")
+
+@dataclass(slots=True)
+class RunContext:
+    """State of one pipeline run, kept off the agent so one agent can serve concurrent runs"""
+    run_id: Optional[str] = None
+    stage: str = "idle"
+    counters: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(RUN_COUNTERS, 0))
+    errors: deque = field(default_factory=lambda: deque(maxlen=ERROR_HISTORY_LIMIT))
+    # Content generated in the run, keyed by content_id
+    store: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Sub-agent requests in a row that timed out or raised
+    consecutive_failures: int = 0
+
+# Pipeline request key -> (sub-agent class, task_type, label used in errors)
+_AGENT_DISPATCH = {
+    "trends": (TrendResearcherAgent, "research_trends", "Trend research"),
+    "content": (ContentDeveloperAgent, "generate_content", "Content generation"),
+    "editing": (ContentEditorAgent, "edit_content", "Content editing"),
+    "scheduling": (SchedulerAgent, "schedule_content", "Content scheduling"),
+}
 
 class OrchestrationAgent(BaseAgent):
     """Manages the overall content workflow and coordinates between agents"""
@@ -35,260 +83,332 @@ class OrchestrationAgent(BaseAgent):
             ]
         }
         
-        # Pipeline status tracking
-        self.pipeline_status = {
-            "current_run_id": None,
-            "stage": "idle",
-            "posts_generated": 0,
-            "posts_approved": 0,
-            "posts_published": 0,
-            "errors": []
+        # Lowercased required sections, matched against lowercased text
+        self._required_sections_lc = tuple(section.lower() for section in self.validation_rules["required_sections"])
+        # All pillars compiled into one matcher so the text is scanned once; like a substring
+        # test, a pillar also matches inside longer words (e.g. "AI Innovations")
+        self._pillar_matcher = PhraseMatcher({"pillar": self.validation_rules["topic_pillars"]}, anywhere=True)
+        
+        # Trend research task, identical on every run
+        self._trend_task_payload = {
+            "task_type": _AGENT_DISPATCH["trends"][1],
+            "topics": tuple(self.validation_rules["topic_pillars"]),
+            "max_trends": 10
         }
         
+        # Most recently started run, reported by get_pipeline_status
+        self._last_run = RunContext()
+        
+        # Sub-agents, constructed on first request and reused across runs
+        self._agents = {}
+        
+    def _agent(self, agent_class: Type[BaseAgent]) -> BaseAgent:
+        """Return this orchestrator's instance of a sub-agent class"""
+        agent = self._agents.get(agent_class)
+        if agent is None:
+            agent = self._agents[agent_class] = agent_class()
+        return agent
+    
     def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute orchestration task"""
         task_type = task_data.get("task_type", "run_pipeline")
         
         if task_type == "run_pipeline":
-            return self.run_content_pipeline()
+            return self.run_content_pipeline(task_data.get("include_detail", False))
         elif task_type == "validate_content":
+            # Support both single content and multiple contents
+            contents = task_data.get("contents")
+            if contents is not None:
+                return self.validate_contents(contents)
             return self.validate_content(task_data.get("content"))
         elif task_type == "get_status":
             return self.get_pipeline_status()
         else:
             return self.create_response(False, error=f"Unknown task type: {task_type}")
     
-    def run_content_pipeline(self) -> Dict[str, Any]:
+    def run_content_pipeline(self, include_detail: bool = False, run: Optional[RunContext] = None) -> Dict[str, Any]:
         """Run the complete content generation pipeline"""
-        import uuid
+        return self.run_async(self.arun_content_pipeline(include_detail, run))
+    
+    async def _process_trend(self, run: RunContext, trend: Dict[str, Any], semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """Generate, edit and schedule one post, returning a reference to the scheduled post or None if a stage failed
+        
+        Stages pass the post by its content_id in the run store rather than as a payload.
+        The semaphore bounds sub-agent requests in flight across all of the run's trends.
+        """
+        async with semaphore:
+            content_result = await self.request_content_generation(run, trend)
+        
+        if not content_result.get("success"):
+            self.log_message(f"Content generation failed for trend {trend.get('title', '')!r}: {content_result.get('error')}", level="warning")
+            return None
+        run.counters["posts_generated"] += 1
+        
+        content_id = content_result["data"]["content_id"]
+        
+        async with semaphore:
+            edit_result = await self.request_content_editing(run, content_id)
+        
+        if not (edit_result.get("success") and edit_result.get("data", {}).get("approved")):
+            self.log_message(f"Content rejected by editor: {edit_result.get('data', {}).get('feedback', edit_result.get('error', 'Unknown reason'))}", level="warning")
+            return None
+        run.counters["posts_approved"] += 1
         
-        run_id = str(uuid.uuid4())
-        self.pipeline_status["current_run_id"] = run_id
-        self.pipeline_status["stage"] = "starting"
-        self.pipeline_status["errors"] = []
+        async with semaphore:
+            schedule_result = await self.request_content_scheduling(run, content_id)
+        
+        if not schedule_result.get("success"):
+            self.log_message(f"Content scheduling failed: {schedule_result.get('error')}", level="warning")
+            return None
+        run.counters["posts_published"] += 1
+        
+        schedule = schedule_result.get("data", {})
+        return {"id": content_id, "job_id": schedule.get("job_id"), "scheduled_time": schedule.get("scheduled_time")}
+    
+    async def arun_content_pipeline(self, include_detail: bool = False, run: Optional[RunContext] = None) -> Dict[str, Any]:
+        """Run the complete content generation pipeline
+        
+        Each trend moves through generation, editing and scheduling on its own, so
+        one post can be edited while another is still being written. The response
+        lists scheduled post ids; include_detail adds each post's job details.
+        
+        All run state lives in a RunContext, so concurrent runs on one agent do not
+        interfere. Callers may pass their own context to inspect the run afterwards.
+        """
+        run = run if run is not None else RunContext()
+        run_id = run.run_id = time_ordered_id()
+        run.stage = "starting"
+        self._last_run = run
         
         self.log_message(f"Starting content pipeline run: {run_id}")
         
+        tasks = []
         try:
             # Stage 1: Research trends
-            self.pipeline_status["stage"] = "researching_trends"
-            trends_result = self.request_trend_research()
+            run.stage = "researching_trends"
+            trends_result = await self.request_trend_research(run)
             
             if not trends_result.get("success"):
-                return self.handle_pipeline_error("Trend research failed", trends_result.get("error"))
+                return self.handle_pipeline_error("Trend research failed", trends_result.get("error"), run)
             
             trends = trends_result.get("data", {}).get("trends", [])
             if not trends:
-                return self.handle_pipeline_error("No trends found", "Trend researcher returned empty results")
+                return self.handle_pipeline_error("No trends found", "Trend researcher returned empty results", run)
             
             self.log_message(f"Found {len(trends)} trending topics")
             
-            # Stage 2: Generate content
-            self.pipeline_status["stage"] = "generating_content"
-            content_results = []
-            
-            # Generate 3 posts from top trends
-            top_trends = trends[:3]
-            
-            for i, trend in enumerate(top_trends):
-                content_result = self.request_content_generation(trend)
-                
-                if content_result.get("success"):
-                    content_results.append(content_result.get("data"))
-                    self.pipeline_status["posts_generated"] += 1
-                else:
-                    self.log_message(f"Content generation failed for trend {i+1}: {content_result.get('error')}", level="warning")
-            
-            if not content_results:
-                return self.handle_pipeline_error("Content generation failed", "No content was generated")
-            
-            # Stage 3: Edit and validate content
-            self.pipeline_status["stage"] = "editing_content"
-            approved_content = []
+            # Stage 2: Generate, edit and schedule 3 posts from top trends
+            run.stage = "processing_trends"
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_AGENTS)
+            tasks = [asyncio.create_task(self._process_trend(run, trend, semaphore)) for trend in trends[:3]]
+            scheduled_posts = []
             
-            for content in content_results:
-                edit_result = self.request_content_editing(content)
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    scheduled = await next_done
+                except Exception as e:
+                    self.log_message(f"Trend processing failed: {e}", level="warning")
+                    continue
                 
-                if edit_result.get("success") and edit_result.get("data", {}).get("approved"):
-                    approved_content.append(edit_result.get("data"))
-                    self.pipeline_status["posts_approved"] += 1
-                else:
-                    self.log_message(f"Content rejected by editor: {edit_result.get('data', {}).get('feedback', 'Unknown reason')}", level="warning")
-            
-            if not approved_content:
-                return self.handle_pipeline_error("Content editing failed", "No content was approved by editor")
+                if scheduled is not None:
+                    scheduled_posts.append(scheduled)
             
-            # Stage 4: Schedule and distribute
-            self.pipeline_status["stage"] = "scheduling_content"
-            scheduled_posts = []
+            if not run.counters["posts_generated"]:
+                return self.handle_pipeline_error("Content generation failed", "No content was generated", run)
             
-            for content in approved_content:
-                schedule_result = self.request_content_scheduling(content)
-                
-                if schedule_result.get("success"):
-                    scheduled_posts.append(schedule_result.get("data"))
-                    self.pipeline_status["posts_published"] += 1
-                else:
-                    self.log_message(f"Content scheduling failed: {schedule_result.get('error')}", level="warning")
+            if not run.counters["posts_approved"]:
+                return self.handle_pipeline_error("Content editing failed", "No content was approved by editor", run)
             
             # Complete pipeline
-            self.pipeline_status["stage"] = "completed"
+            run.stage = "completed"
             
-            return self.create_response(True, {
+            result = {
                 "run_id": run_id,
-                "posts_generated": self.pipeline_status["posts_generated"],
-                "posts_approved": self.pipeline_status["posts_approved"], 
+                "posts_generated": run.counters["posts_generated"],
+                "posts_approved": run.counters["posts_approved"],
                 "posts_scheduled": len(scheduled_posts),
-                "scheduled_posts": scheduled_posts
-            })
+                "scheduled_post_ids": [post["id"] for post in scheduled_posts]
+            }
+            if include_detail:
+                result["scheduled_posts"] = scheduled_posts
+            
+            return self.create_response(True, result)
             
         except Exception as e:
-            return self.handle_pipeline_error("Pipeline execution error", str(e))
+            return self.handle_pipeline_error("Pipeline execution error", str(e), run)
+        
+        finally:
+            for task in tasks:
+                task.cancel()
     
-    def handle_pipeline_error(self, error_type: str, error_message: str) -> Dict[str, Any]:
-        """Handle pipeline errors and update status"""
-        self.pipeline_status["stage"] = "error"
-        self.pipeline_status["errors"].append({
+    def handle_pipeline_error(self, error_type: str, error_message: str, run: Optional[RunContext] = None) -> Dict[str, Any]:
+        """Handle pipeline errors and update the run's status (the latest run by default)"""
+        run = run if run is not None else self._last_run
+        run.stage = "error"
+        run.errors.append({
             "type": error_type,
             "message": error_message,
-            "timestamp": datetime.utcnow().isoformat()
+            "ts_ns": time.time_ns()
         })
         
         self.log_message(f"Pipeline error - {error_type}: {error_message}", level="error")
         
         return self.create_response(False, error=f"{error_type}: {error_message}")
     
-    def request_trend_research(self) -> Dict[str, Any]:
-        """Request trend research from Trend Researcher Agent"""
-        # This would normally use the communication hub to send messages
-        # For this implementation, we'll simulate the agent interaction
+    async def _dispatch(self, run: RunContext, key: str, task_data: Optional[Dict[str, Any]] = None, **payload) -> Dict[str, Any]:
+        """Send a task to the sub-agent registered under key in _AGENT_DISPATCH
+        
+        A prebuilt task_data is sent as is; otherwise the task is built from the payload.
+        Each request is bounded by its stage timeout, and once BREAKER_THRESHOLD requests
+        in a row have timed out or raised, the rest of the run fails fast without calling out.
+        """
+        agent_class, task_type, label = _AGENT_DISPATCH[key]
+        if run.consecutive_failures >= BREAKER_THRESHOLD:
+            return self.create_response(False, error=f"{label} skipped: too many consecutive agent failures")
         
+        if task_data is None:
+            task_data = {"task_type": task_type, **payload}
         try:
-            from agents.trend_researcher import TrendResearcherAgent
-            researcher = TrendResearcherAgent()
-            
-            task_data = {
-                "task_type": "research_trends",
-                "topics": self.validation_rules["topic_pillars"],
-                "max_trends": 10
-            }
-            
-            return researcher.execute_task(task_data)
-            
+            result = await asyncio.wait_for(self._agent(agent_class).aexecute_task(task_data), STAGE_TIMEOUTS[key])
+        except asyncio.TimeoutError:
+            run.consecutive_failures += 1
+            self.log_message(f"{label} request timed out after {STAGE_TIMEOUTS[key]}s", level="error")
+            return self.create_response(False, error=f"{label} request timed out")
         except Exception as e:
-            self.log_message(f"Failed to request trend research: {e}", level="error")
-            return self.create_response(False, error=f"Trend research request failed: {e}")
+            run.consecutive_failures += 1
+            self.log_message(f"Failed to request {label.lower()}: {e}", level="error")
+            return self.create_response(False, error=f"{label} request failed: {e}")
+        
+        run.consecutive_failures = 0
+        return result
     
-    def request_content_generation(self, trend: Dict[str, Any]) -> Dict[str, Any]:
-        """Request content generation from Content Developer Agent"""
-        try:
-            from agents.content_developer import ContentDeveloperAgent
-            developer = ContentDeveloperAgent()
-            
-            task_data = {
-                "task_type": "generate_content",
-                "trend": trend,
-                "format": "linkedin_post"
-            }
-            
-            return developer.execute_task(task_data)
-            
-        except Exception as e:
-            self.log_message(f"Failed to request content generation: {e}", level="error")
-            return self.create_response(False, error=f"Content generation request failed: {e}")
+    async def request_trend_research(self, run: RunContext) -> Dict[str, Any]:
+        """Request trend research from Trend Researcher Agent"""
+        return await self._dispatch(run, "trends", self._trend_task_payload)
     
-    def request_content_editing(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Request content editing from Content Editor Agent"""
-        try:
-            from agents.content_editor import ContentEditorAgent
-            editor = ContentEditorAgent()
-            
-            task_data = {
-                "task_type": "edit_content",
-                "content": content
-            }
-            
-            return editor.execute_task(task_data)
-            
-        except Exception as e:
-            self.log_message(f"Failed to request content editing: {e}", level="error")
-            return self.create_response(False, error=f"Content editing request failed: {e}")
+    async def request_content_generation(self, run: RunContext, trend: Dict[str, Any]) -> Dict[str, Any]:
+        """Request content generation from Content Developer Agent
+        
+        The generated content is kept in the run store; the response carries only its content_id.
+        """
+        result = await self._dispatch(run, "content", trend=trend, format="linkedin_post")
+        if not result.get("success"):
+            return result
+        
+        content_id = secrets.token_hex(8)
+        run.store[content_id] = result.get("data") or {}
+        return self.create_response(True, {"content_id": content_id})
     
-    def request_content_scheduling(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Request content scheduling from Scheduler Agent"""
-        try:
-            from agents.scheduler import SchedulerAgent
-            scheduler = SchedulerAgent()
-            
-            task_data = {
-                "task_type": "schedule_content",
-                "content": content
-            }
-            
-            return scheduler.execute_task(task_data)
-            
-        except Exception as e:
-            self.log_message(f"Failed to request content scheduling: {e}", level="error")
-            return self.create_response(False, error=f"Content scheduling request failed: {e}")
+    async def request_content_editing(self, run: RunContext, content_id: str) -> Dict[str, Any]:
+        """Request content editing from Content Editor Agent for stored content
+        
+        The review verdict is recorded on the stored content and returned without the full review.
+        """
+        content = run.store[content_id]
+        result = await self._dispatch(run, "editing", content=content)
+        if not result.get("success"):
+            return result
+        
+        review = result.get("data", {})
+        verdict = {
+            "content_id": content_id,
+            "approved": review.get("approved", False),
+            "overall_score": review.get("overall_score", 0),
+            "feedback": "; ".join(issue["text"] for issue in review.get("issues_found", [])) or "Score below approval threshold"
+        }
+        content["review"] = verdict
+        return self.create_response(True, verdict)
+    
+    async def request_content_scheduling(self, run: RunContext, content_id: str) -> Dict[str, Any]:
+        """Request content scheduling from Scheduler Agent for stored content"""
+        content = run.store[content_id]
+        result = await self._dispatch(run, "scheduling", content=content)
+        if result.get("success"):
+            content["schedule"] = result.get("data", {})
+        return result
+    
+    def _check_content(self, content: Dict[str, Any], min_len: int, max_len: int) -> Dict[str, Any]:
+        """Run the length, structure and topic checks on one content item"""
+        text = content.get("text", "")
+        text_lc = text.lower()
+        n = len(text)
+        issues = []
+        
+        # Length validation
+        length_check = min_len <= n <= max_len
+        if not length_check:
+            issues.append(f"Content length {n} outside range {min_len}-{max_len}")
+        
+        # Structure validation
+        structure_check = all(
+            section in text_lc or content.get(section)
+            for section in self._required_sections_lc
+        )
+        if not structure_check:
+            issues.append("Missing required sections (hook, insight, CTA, hashtags)")
+        
+        # Topic alignment validation
+        topic_alignment = self._pillar_matcher.search(text_lc)
+        if not topic_alignment:
+            issues.append("Content does not align with topic pillars")
+        
+        # Calculate overall score
+        checks_passed = length_check + structure_check + topic_alignment
+        
+        return {
+            "length_check": length_check,
+            "structure_check": structure_check,
+            "topic_alignment": topic_alignment,
+            "score": (checks_passed / 3) * 5,  # Scale to 1-5
+            "issues": issues
+        }
     
     def validate_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Validate content against brand guidelines and quality standards"""
         if not content:
             return self.create_response(False, error="No content provided for validation")
         
-        validation_results = {
-            "length_check": False,
-            "structure_check": False,
-            "topic_alignment": False,
-            "score": 0,
-            "issues": []
-        }
-        
         try:
-            text = content.get("text", "")
-            
-            # Length validation
-            if self.validation_rules["min_length"] <= len(text) <= self.validation_rules["max_length"]:
-                validation_results["length_check"] = True
-            else:
-                validation_results["issues"].append(f"Content length {len(text)} outside range {self.validation_rules['min_length']}-{self.validation_rules['max_length']}")
-            
-            # Structure validation
-            has_required_sections = all(
-                section in text.lower() or content.get(section) 
-                for section in self.validation_rules["required_sections"]
-            )
-            
-            if has_required_sections:
-                validation_results["structure_check"] = True
-            else:
-                validation_results["issues"].append("Missing required sections (hook, insight, CTA, hashtags)")
-            
-            # Topic alignment validation
-            topic_match = any(
-                topic.lower() in text.lower() 
-                for topic in self.validation_rules["topic_pillars"]
-            )
-            
-            if topic_match:
-                validation_results["topic_alignment"] = True
-            else:
-                validation_results["issues"].append("Content does not align with topic pillars")
+            return self.create_response(True, self._check_content(
+                content, self.validation_rules["min_length"], self.validation_rules["max_length"]
+            ))
             
-            # Calculate overall score
-            checks_passed = sum([
-                validation_results["length_check"],
-                validation_results["structure_check"], 
-                validation_results["topic_alignment"]
-            ])
-            
-            validation_results["score"] = (checks_passed / 3) * 5  # Scale to 1-5
+        except Exception as e:
+            return self.create_response(False, error=f"Content validation failed: {e}")
+    
+    def validate_contents(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate many contents in one call, reading the rules once for the whole batch
+        
+        Results are in input order; a missing item fails every check.
+        """
+        if not contents:
+            return self.create_response(False, error="No content provided for validation")
+        
+        min_len = self.validation_rules["min_length"]
+        max_len = self.validation_rules["max_length"]
+        check = self._check_content
+        
+        try:
+            results = [check(content or {}, min_len, max_len) for content in contents]
             
-            return self.create_response(True, validation_results)
+            return self.create_response(True, {
+                "results": results,
+                "validated_count": len(results)
+            })
             
         except Exception as e:
             return self.create_response(False, error=f"Content validation failed: {e}")
     
     def get_pipeline_status(self) -> Dict[str, Any]:
-        """Get current pipeline status"""
-        return self.create_response(True, self.pipeline_status)
+        """Get the status of the most recently started run, formatting error timestamps only now"""
+        run = self._last_run
+        errors = [
+            {"type": error["type"], "message": error["message"], "timestamp": iso_from_ns(error["ts_ns"])}
+            for error in run.errors
+        ]
+        return self.create_response(True, {
+            "current_run_id": run.run_id,
+            "stage": run.stage,
+            **run.counters,
+            "errors": errors
+        })
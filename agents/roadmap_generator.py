@@ -4,16 +4,323 @@ Strategic Planning Specialist / AI Transformation Architect
 Creates comprehensive AI implementation roadmaps for business transformation
 """
 
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
+import math
 import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+import httpx
+from openai import AsyncOpenAI
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from .base_agent import BaseAgent
+from .content_editor import unit_vector
+from utils import serialization
+from utils.json_stream import IncrementalObjectParser
+from utils.phrase_matcher import PhraseMatcher
+
+# Connection pool for the shared roadmap client; each roadmap request holds up to two connections
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# Generated roadmaps and risk assessments are reused for a week, up to this many entries
+ROADMAP_CACHE_TTL = 7 * 24 * 3600
+ROADMAP_CACHE_MAXSIZE = 256
+
+# Requests whose objectives and context embed at least this close to a cached request reuse its result
+SEMANTIC_CACHE_THRESHOLD = 0.93
+CACHE_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Set ROADMAP_SEMANTIC_CACHE=0 to only reuse results for identical requests, without embedding them
+SEMANTIC_CACHE_ENABLED = os.getenv("ROADMAP_SEMANTIC_CACHE", "1") != "0"
+
+# Low temperatures and a fixed seed keep the JSON output short and reproducible,
+# with output capped to the response schemas plus headroom
+ROADMAP_TEMPERATURE = 0.2
+RISK_TEMPERATURE = 0.3
+COMPLETION_SEED = 42
+ROADMAP_MAX_TOKENS = 2500
+RISK_MAX_TOKENS = 1500
+
+# Roadmaps requested together share one completion of at most this many, with this many completions in flight
+ROADMAP_BATCH_SIZE = 4
+MAX_CONCURRENT_ROADMAP_BATCHES = 3
+
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+# Design Thinking focus for phases whose names contain any of these words, checked in order
+DESIGN_THINKING_FOCUS = (
+    (frozenset({"planning", "assessment"}), MappingProxyType({
+        "design_thinking_focus": "Empathize & Define",
+        "activities": (
+            "User research and stakeholder interviews",
+            "Problem definition and user journey mapping",
+            "Define success criteria from user perspective"
+        )
+    })),
+    (frozenset({"implementation", "development"}), MappingProxyType({
+        "design_thinking_focus": "Ideate & Prototype",
+        "activities": (
+            "Solution brainstorming sessions",
+            "Rapid prototyping and MVP development",
+            "User feedback integration"
+        )
+    })),
+    (frozenset({"testing", "validation"}), MappingProxyType({
+        "design_thinking_focus": "Test & Iterate",
+        "activities": (
+            "User testing and feedback collection",
+            "Solution refinement based on insights",
+            "Continuous improvement planning"
+        )
+    }))
+)
+
+WORKSHOP_PARTICIPANTS = ("Stakeholders", "Technical Team", "End Users")
+WORKSHOP_DELIVERABLES = ("Phase-specific action plan", "Risk mitigation strategies", "Resource allocation plan")
+
+# Objective keywords for each framework, checked in this order; objectives matching none get ai_implementation.
+# Keywords match anywhere, like a substring test, so "reoptimization" and "strategy's" count too
+FRAMEWORK_KEYWORDS = {
+    "business_optimization": ("optimization", "efficiency"),
+    "ai_innovation_strategy": ("innovation", "strategy")
+}
+FRAMEWORK_MATCHER = PhraseMatcher(FRAMEWORK_KEYWORDS, anywhere=True)
+
+@functools.lru_cache(maxsize=4096)
+def select_framework_for_objectives(objectives: Tuple[str, ...]) -> str:
+    """Roadmap framework for a set of objectives; every keyword is found in one pass over them"""
+    matched = {framework for framework, _ in FRAMEWORK_MATCHER.find("\n".join(objectives))}
+    return next((framework for framework in FRAMEWORK_KEYWORDS if framework in matched), "ai_implementation")
+
+@functools.lru_cache(maxsize=None)
+def _methodology_for_phase_count(phase_count: int) -> str:
+    if phase_count <= 3:
+        return "lean_startup"
+    elif phase_count <= 5:
+        return "agile_ai"
+    return "design_thinking"
+
+# Readiness factors with the assessment field and default score (out of 10) for each
+READINESS_FACTORS = (
+    ("leadership_support", "leadership_buy_in", 5),
+    ("data_maturity", "data_quality", 3),
+    ("technical_capabilities", "tech_team_skills", 4),
+    ("change_management", "change_readiness", 3),
+    ("budget_allocation", "budget_commitment", 4)
+)
+
+# Readiness levels by minimum readiness percentage, highest first
+READINESS_LEVELS = (
+    (80, "High - Ready for Implementation"),
+    (60, "Medium - Preparation Needed"),
+    (0, "Low - Significant Preparation Required")
+)
+
+def score_readiness(scores: Tuple[float, ...]) -> Tuple[float, str]:
+    """Readiness percentage and level for factor scores out of 10"""
+    percentage = sum(scores) / (len(scores) * 10) * 100
+    level = next((label for threshold, label in READINESS_LEVELS if percentage >= threshold), READINESS_LEVELS[-1][1])
+    return percentage, level
+
+def score_readiness_batch(assessments: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+    """Readiness percentage and level for each assessment, for bulk benchmarking"""
+    return [
+        score_readiness(tuple(assessment.get(field, default) for _, field, default in READINESS_FACTORS))
+        for assessment in assessments
+    ]
+
+# Words that raise the probability of a risk category in the rule-based assessment
+RISK_TRIGGERS = {
+    "Technical Complexity": frozenset({"predictive", "forecasting", "forecast", "personalization", "recommendation",
+                                       "recommendations", "vision", "nlp", "chatbot", "chatbots", "models", "model"}),
+    "Data Quality & Availability": frozenset({"data", "analytics", "insights", "reporting", "reports", "dashboards",
+                                              "silos", "legacy", "quality"}),
+    "Organizational Readiness": frozenset({"beginning", "starting", "new", "first", "journey", "exploring"}),
+    "Budget & Resource Constraints": frozenset({"small", "startup", "limited", "low", "tight", "budget", "costs", "cost"}),
+    "Regulatory Compliance": frozenset({"healthcare", "finance", "financial", "banking", "insurance", "pharmaceutical",
+                                        "government", "legal", "compliance", "privacy", "regulated"}),
+    "Change Management": frozenset({"transform", "transformation", "workforce", "employees", "staff", "culture",
+                                    "processes", "process", "workflows"}),
+    "Technology Integration": frozenset({"integrate", "integration", "systems", "legacy", "erp", "crm", "platform",
+                                         "infrastructure"}),
+    "Skills & Training Gaps": frozenset({"skills", "talent", "training", "team", "expertise", "hiring"}),
+}
+
+# Inputs made only of these words get the rule-based risk assessment instead of a model call
+RISK_VOCABULARY = frozenset().union(*RISK_TRIGGERS.values(), {
+    "a", "an", "and", "the", "of", "to", "for", "in", "on", "with", "our", "we", "by", "across", "at", "from",
+    "into", "more", "better", "all", "using", "through", "via", "is", "are", "be", "not", "no", "it", "its",
+    "ai", "ml", "machine", "learning", "automation", "automate", "automated", "intelligent", "smart",
+    "improve", "improved", "improving", "increase", "reduce", "optimize", "optimise", "enhance", "streamline",
+    "scale", "build", "launch", "implement", "adopt", "deploy", "develop", "create", "support", "enable", "drive",
+    "business", "businesses", "company", "organization", "organisation", "enterprise", "operations",
+    "operational", "efficiency", "productivity", "performance", "growth", "revenue", "sales", "profit",
+    "customer", "customers", "service", "services", "experience", "satisfaction", "retention", "engagement",
+    "marketing", "content", "supply", "chain", "inventory", "logistics", "demand", "pricing", "product",
+    "products", "decision", "decisions", "making", "risk", "fraud", "detection",
+    "management", "strategy", "strategic", "innovation", "competitive", "advantage", "time", "manual", "tasks",
+    "retail", "ecommerce", "e", "commerce", "manufacturing", "technology", "tech", "education", "consulting",
+    "hospitality", "media", "telecommunications", "energy", "real", "estate", "general",
+    "medium", "large", "mid", "size", "sized", "midsize", "sme",
+    "current", "state", "adoption", "pilot", "pilots", "standard", "challenges", "challenge", "high",
+    "slow", "growing", "competition", "market", "digital",
+})
+
+@dataclass(slots=True)
+class PhaseTable:
+    """Roadmap phases stored column-wise, with one list per phase field"""
+    names: List[str] = field(default_factory=list)
+    durations: List[str] = field(default_factory=list)
+    objectives: List[List[str]] = field(default_factory=list)
+    activities: List[List[str]] = field(default_factory=list)
+    deliverables: List[List[str]] = field(default_factory=list)
+    
+    @classmethod
+    def from_phases(cls, phases: List[Dict[str, Any]]) -> "PhaseTable":
+        """Build a table from the phase objects of a generated roadmap"""
+        table = cls()
+        for phase in phases:
+            table.names.append(phase.get("name", ""))
+            table.durations.append(phase.get("duration", ""))
+            table.objectives.append(phase.get("objectives", []))
+            table.activities.append(phase.get("activities", []))
+            table.deliverables.append(phase.get("deliverables", []))
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    @property
+    def phases(self) -> Iterator[Dict[str, Any]]:
+        """Phase objects rebuilt from the columns, one at a time"""
+        for name, duration, objectives, activities, deliverables in zip(
+            self.names, self.durations, self.objectives, self.activities, self.deliverables
+        ):
+            yield {"name": name, "duration": duration, "objectives": objectives,
+                   "activities": activities, "deliverables": deliverables}
+    
+    def all_deliverables(self) -> List[str]:
+        """Deliverables of every phase, in phase order"""
+        return list(itertools.chain.from_iterable(self.deliverables))
+
+class RoadmapCache:
+    """Two-tier in-process cache of generated results
+    
+    Results are found by an exact hash of their inputs, or failing that by the
+    nearest cached inputs by embedding. Semantic matches are only considered
+    within a scope (e.g. the same framework, industry and budget), so only the
+    free-text part of a request is ever matched approximately. Entries are
+    stored with their input text and embedded lazily, the first time a lookup
+    in their scope needs to compare against them.
+    """
+    
+    def __init__(self, maxsize: int = ROADMAP_CACHE_MAXSIZE, ttl: float = ROADMAP_CACHE_TTL,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD, semantic: bool = SEMANTIC_CACHE_ENABLED):
+        # key -> (expires_at, scope, text, value), oldest first
+        self._entries: OrderedDict = OrderedDict()
+        # scope -> {key: unit-length input vector, or None until embedded}
+        self._vectors: Dict[str, Dict[str, Optional[List[float]]]] = {}
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._threshold = threshold
+        self.semantic = semantic
+    
+    @staticmethod
+    def digest(*parts: str) -> str:
+        hasher = hashlib.sha256()
+        for part in parts:
+            hasher.update(part.encode() + b"\0")
+        return hasher.hexdigest()
+    
+    def _remove(self, key: str):
+        _, scope, _, _ = self._entries.pop(key)
+        vectors = self._vectors[scope]
+        del vectors[key]
+        if not vectors:
+            del self._vectors[scope]
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the result stored under an exact key, if present and fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[3]
+    
+    def has_scope(self, scope: str) -> bool:
+        """Whether any entry could match a lookup in scope semantically"""
+        return self.semantic and scope in self._vectors
+    
+    def unembedded(self, scope: str) -> List[Tuple[str, str]]:
+        """(key, text) of the entries in scope that have no vector yet"""
+        return [(key, self._entries[key][2]) for key, vector in self._vectors.get(scope, {}).items() if vector is None]
+    
+    def set_vector(self, key: str, vector: List[float]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._vectors[entry[1]][key] = vector
+    
+    def get_similar(self, scope: str, vector: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the fresh result in scope whose unit-length input vector is most similar, if close enough"""
+        embedded = [(key, entry_vector) for key, entry_vector in self._vectors.get(scope, {}).items()
+                    if entry_vector is not None]
+        if not embedded:
+            return None
+        
+        keys = [key for key, _ in embedded]
+        if np is not None:
+            similarities = (np.asarray([v for _, v in embedded]) @ np.asarray(vector)).tolist()
+        else:
+            similarities = [math.fsum(a * b for a, b in zip(vector, v)) for _, v in embedded]
+        
+        # Most similar first, skipping any that have expired
+        for similarity, key in sorted(zip(similarities, keys), reverse=True):
+            if similarity < self._threshold:
+                break
+            result = self.get(key)
+            if result is not None:
+                return result
+        return None
+    
+    def put(self, key: str, scope: str, text: str, vector: Optional[List[float]], value: Dict[str, Any]):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self._ttl, scope, text, value)
+        self._vectors.setdefault(scope, {})[key] = vector
+        if len(self._entries) > self._maxsize:
+            self._remove(next(iter(self._entries)))
 
 class RoadmapGeneratorAgent(BaseAgent):
     """Generates strategic AI implementation roadmaps for business transformation"""
     
+    # One OpenAI client for every roadmap generator, so the process keeps a single connection pool
+    _openai_client: Optional[AsyncOpenAI] = None
+    
+    @classmethod
+    def shared_openai_client(cls) -> AsyncOpenAI:
+        """OpenAI client shared by all roadmap generator instances, built on first use"""
+        if cls._openai_client is None:
+            cls._openai_client = AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"), http_client=httpx.AsyncClient(limits=HTTP_LIMITS)
+            )
+        return cls._openai_client
+    
     def __init__(self):
         super().__init__(
             name="Roadmap Generator Agent",
@@ -22,7 +329,11 @@ class RoadmapGeneratorAgent(BaseAgent):
         )
         
         # OpenAI client initialization
-        self.openai_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.openai_client = self.shared_openai_client()
+        
+        # Generated roadmaps and risk assessments, with input embeddings shared between the two lookups
+        self._cache = RoadmapCache()
+        self._cache_embeddings: OrderedDict = OrderedDict()
         
         # Roadmap framework components
         self.roadmap_frameworks = {
@@ -62,6 +373,185 @@ class RoadmapGeneratorAgent(BaseAgent):
             "Technology Integration",
             "Skills & Training Gaps"
         ]
+        
+        # Canned risks per category for the rule-based assessment
+        self._risk_templates: Dict[str, List[Dict[str, Any]]] = {
+            "Technical Complexity": [{
+                "description": "Model performance may fall short of business expectations in production",
+                "probability": "Medium",
+                "impact": "High",
+                "mitigation_strategies": ["Validate use cases with a proof of concept", "Define acceptance metrics before development"]
+            }],
+            "Data Quality & Availability": [{
+                "description": "Incomplete or inconsistent data may limit model accuracy",
+                "probability": "Medium",
+                "impact": "High",
+                "mitigation_strategies": ["Run a data audit in the first phase", "Establish data governance and ownership"]
+            }],
+            "Organizational Readiness": [{
+                "description": "Leadership and teams may not be aligned on AI priorities",
+                "probability": "Medium",
+                "impact": "Medium",
+                "mitigation_strategies": ["Hold executive alignment workshops", "Appoint an AI program sponsor"]
+            }],
+            "Budget & Resource Constraints": [{
+                "description": "Costs may exceed the allocated budget as scope grows",
+                "probability": "Medium",
+                "impact": "Medium",
+                "mitigation_strategies": ["Fund work in phases tied to milestones", "Prioritize quick wins with measurable ROI"]
+            }],
+            "Regulatory Compliance": [{
+                "description": "AI use of personal or sensitive data may breach regulatory requirements",
+                "probability": "Low",
+                "impact": "High",
+                "mitigation_strategies": ["Review use cases with legal and compliance", "Document model decisions for auditability"]
+            }],
+            "Change Management": [{
+                "description": "Staff may resist new AI-supported workflows",
+                "probability": "Medium",
+                "impact": "Medium",
+                "mitigation_strategies": ["Involve end users in design", "Communicate benefits and plan the transition"]
+            }],
+            "Technology Integration": [{
+                "description": "Integrating AI with existing systems may take longer than planned",
+                "probability": "Medium",
+                "impact": "Medium",
+                "mitigation_strategies": ["Map integration points early", "Use APIs and incremental rollout"]
+            }],
+            "Skills & Training Gaps": [{
+                "description": "The team may lack the skills to build and maintain AI solutions",
+                "probability": "Medium",
+                "impact": "Medium",
+                "mitigation_strategies": ["Run AI training for technical staff", "Partner with external experts initially"]
+            }]
+        }
+        
+        # Prompt fragments for the frameworks and risk categories, rendered once
+        self._framework_prompt_fragments = {
+            name: (f"- Phases: {framework['phases']}\n"
+                   f"            - Focus Areas: {framework['focus_areas']}\n"
+                   f"            - Expected Timeline: {framework['timeline']}")
+            for name, framework in self.roadmap_frameworks.items()
+        }
+        self._risk_categories_block = "\n            ".join(f"- {category}" for category in self.risk_categories)
+        
+        # Static system prompts, built once so every request shares a cacheable prefix
+        self._roadmap_prompt_prefix = self.build_roadmap_prompt_prefix()
+        self._risk_prompt_prefix = self.build_risk_prompt_prefix()
+    
+    def build_roadmap_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every roadmap request
+        
+        Every framework and the response schema are described here, so the
+        per-request message only names the framework and the requirements and
+        the prefix stays byte-identical for OpenAI prompt caching.
+        """
+        frameworks = "\n".join(
+            f"""
+            {name}:
+            {fragment}"""
+            for name, fragment in self._framework_prompt_fragments.items()
+        )
+        
+        return f"""
+            You are an expert AI implementation consultant specializing in strategic roadmap development.
+            
+            Create a comprehensive AI implementation roadmap for the requirements provided by the user,
+            following the framework they name.
+            
+            Framework Details:
+            {frameworks}
+            
+            Generate a detailed roadmap with:
+            1. Phase-by-phase breakdown with specific activities
+            2. Key milestones and deliverables for each phase
+            3. Resource requirements (team, technology, budget)
+            4. Success metrics and KPIs
+            5. Strategic recommendations
+            
+            Focus on practical, actionable steps that align with consulting best practices.
+            Include specific deliverables that demonstrate value at each phase.
+            
+            Field guidance:
+            - phases: follow the framework's phases in order, adapted to the industry and objectives;
+              give each phase a duration that fits the overall timeline
+            - milestones: at least one per phase, named after a concrete, verifiable outcome;
+              "phase" must match a phase name exactly and "deadline" counts weeks from the start
+            - resources: roles and technologies the company size and budget range can support
+            - success_metrics: measurable targets tied to the stated objectives
+            - recommendations: the most important strategic advice, each with its rationale
+            
+            Respond with JSON in this format:
+            {{
+                "phases": [
+                    {{
+                        "name": "Phase Name",
+                        "duration": "X weeks/months",
+                        "objectives": ["objective1", "objective2"],
+                        "activities": ["activity1", "activity2"],
+                        "deliverables": ["deliverable1", "deliverable2"]
+                    }}
+                ],
+                "milestones": [
+                    {{
+                        "name": "Milestone Name",
+                        "phase": "Phase Name",
+                        "deadline": "Week X",
+                        "success_criteria": ["criteria1", "criteria2"]
+                    }}
+                ],
+                "resources": {{
+                    "team_requirements": ["role1", "role2"],
+                    "technology_stack": ["tech1", "tech2"],
+                    "estimated_budget": "budget range",
+                    "external_support": ["consultant", "vendor"]
+                }},
+                "success_metrics": [
+                    {{
+                        "metric": "Metric Name",
+                        "target": "Target Value",
+                        "measurement": "How to measure"
+                    }}
+                ],
+                "recommendations": [
+                    {{
+                        "category": "Category",
+                        "recommendation": "Specific recommendation",
+                        "rationale": "Why this is important"
+                    }}
+                ]
+            }}
+            """
+    
+    def build_risk_prompt_prefix(self) -> str:
+        """Build the static system prompt shared by every risk assessment request"""
+        return f"""
+            Analyze the potential risks for the AI implementation project described by the user.
+            
+            Assess risks in these categories:
+            {self._risk_categories_block}
+            
+            For each identified risk, provide:
+            1. Risk description
+            2. Probability (Low/Medium/High)
+            3. Impact (Low/Medium/High)
+            4. Mitigation strategies
+            
+            Respond with JSON:
+            {{
+                "risks": [
+                    {{
+                        "category": "Risk Category",
+                        "description": "Risk description",
+                        "probability": "Low/Medium/High",
+                        "impact": "Low/Medium/High",
+                        "mitigation_strategies": ["strategy1", "strategy2"]
+                    }}
+                ],
+                "overall_risk_level": "Low/Medium/High",
+                "key_recommendations": ["recommendation1", "recommendation2"]
+            }}
+            """
     
     def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute roadmap generation task"""
@@ -69,9 +559,17 @@ class RoadmapGeneratorAgent(BaseAgent):
             task_type = task_data.get("task_type", "generate_roadmap")
             
             if task_type == "generate_roadmap":
-                return self.generate_implementation_roadmap(task_data)
+                return self.run_async(self.generate_implementation_roadmap(task_data))
+            elif task_type == "generate_roadmaps_batch":
+                roadmaps = self.run_async(self.generate_roadmaps_concurrently(task_data.get("requirements_list", [])))
+                return self.create_response(True, {"roadmaps": roadmaps})
             elif task_type == "assess_readiness":
                 return self.assess_organizational_readiness(task_data)
+            elif task_type == "assess_readiness_batch":
+                scores = score_readiness_batch(task_data.get("assessments", []))
+                return self.create_response(True, {"assessments": [
+                    {"readiness_score": percentage, "readiness_level": level} for percentage, level in scores
+                ]})
             elif task_type == "customize_roadmap":
                 return self.customize_roadmap_for_industry(task_data)
             else:
@@ -81,31 +579,34 @@ class RoadmapGeneratorAgent(BaseAgent):
             self.log_message(f"Error executing roadmap generation task: {str(e)}", "error")
             return self.create_response(False, error=str(e))
     
-    def generate_implementation_roadmap(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate comprehensive AI implementation roadmap"""
+    async def generate_implementation_roadmap(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate comprehensive AI implementation roadmap
+        
+        The roadmap and the risk assessment are independent, so both requests run
+        concurrently, and implementation details are worked out from the roadmap
+        phases while the rest of the roadmap is still being generated.
+        """
         try:
-            # Extract requirements
-            business_context = requirements.get("business_context", {})
-            ai_objectives = requirements.get("ai_objectives", [])
-            timeline_preference = requirements.get("timeline", "12 months")
-            budget_range = requirements.get("budget_range", "moderate")
-            industry = requirements.get("industry", "general")
-            company_size = requirements.get("company_size", "medium")
-            
-            # Determine primary framework
-            primary_framework = self.select_roadmap_framework(ai_objectives, business_context)
-            
-            # Generate roadmap using AI
-            roadmap_data = self.generate_ai_roadmap(
-                business_context, ai_objectives, timeline_preference, 
-                budget_range, industry, company_size, primary_framework
+            # Extract requirements and determine primary framework
+            roadmap_args = self.roadmap_arguments(requirements)
+            business_context, ai_objectives, timeline_preference = roadmap_args[:3]
+            primary_framework = roadmap_args[-1]
+            
+            # Generate roadmap using AI, alongside the risk assessment
+            partial_queue = asyncio.Queue()
+            details_task = asyncio.ensure_future(self._details_from_stream(partial_queue, primary_framework))
+            roadmap_data, risk_assessment = await asyncio.gather(
+                self.generate_ai_roadmap(*roadmap_args, partial_queue=partial_queue),
+                self.generate_risk_assessment(business_context, ai_objectives)
             )
             
-            # Add implementation details
-            detailed_roadmap = self.add_implementation_details(roadmap_data, primary_framework)
+            # Add implementation details, unless they were already built from the streamed phases
+            detailed_roadmap = await details_task
+            if detailed_roadmap is None or detailed_roadmap["phases"] != roadmap_data.get("phases", []):
+                detailed_roadmap = self.add_implementation_details(roadmap_data, primary_framework)
             
-            # Generate risk assessment
-            risk_assessment = self.generate_risk_assessment(business_context, ai_objectives)
+            phases = roadmap_data.get("phases", [])
+            phase_table = PhaseTable.from_phases(phases)
             
             # Create final roadmap structure
             complete_roadmap = {
@@ -115,9 +616,9 @@ class RoadmapGeneratorAgent(BaseAgent):
                 "objectives": ai_objectives,
                 "framework": primary_framework,
                 "timeline": timeline_preference,
-                "phases": roadmap_data.get("phases", []),
+                "phases": phases,
                 "milestones": roadmap_data.get("milestones", []),
-                "deliverables": self.extract_deliverables_from_phases(roadmap_data.get("phases", [])),
+                "deliverables": self.extract_deliverables_from_phases(phase_table),
                 "resource_requirements": roadmap_data.get("resources", {}),
                 "risk_assessment": risk_assessment,
                 "success_metrics": roadmap_data.get("success_metrics", []),
@@ -127,41 +628,167 @@ class RoadmapGeneratorAgent(BaseAgent):
                 "methodology": detailed_roadmap.get("methodology", {})
             }
             
-            self.log_message(f"Generated AI implementation roadmap with {len(complete_roadmap['phases'])} phases")
+            self.log_message(f"Generated AI implementation roadmap with {len(phase_table)} phases")
             
             return self.create_response(True, {
                 "roadmap": complete_roadmap,
-                "summary": self.create_roadmap_summary(complete_roadmap)
+                "summary": self.create_roadmap_summary(complete_roadmap, phase_table)
             })
             
         except Exception as e:
             self.log_message(f"Error generating implementation roadmap: {str(e)}", "error")
             return self.create_response(False, error=str(e))
     
+    async def _embed_cache_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        try:
+            response = await self.openai_client.embeddings.create(model=CACHE_EMBEDDING_MODEL, input=texts)
+            return [unit_vector(item.embedding) for item in response.data]
+        except Exception as e:
+            self.log_message(f"Cache embedding failed, using exact matches only: {e}", "warning")
+            return [None] * len(texts)
+    
+    async def _cache_embeddings_of(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed request texts in one call, sharing the request between concurrent lookups of the same text"""
+        # text -> (embedding request, index of the text in it)
+        requests = {text: self._cache_embeddings.get(text) for text in texts}
+        missing = [text for text, request in requests.items() if request is None]
+        if missing:
+            batch = asyncio.ensure_future(self._embed_cache_texts(missing))
+            for i, text in enumerate(missing):
+                requests[text] = self._cache_embeddings[text] = (batch, i)
+            while len(self._cache_embeddings) > 64:
+                self._cache_embeddings.popitem(last=False)
+        
+        vectors = []
+        for text in texts:
+            batch, i = requests[text]
+            vector = (await batch)[i]
+            if vector is None:
+                # Let a later request retry a failed embedding
+                self._cache_embeddings.pop(text, None)
+            vectors.append(vector)
+        return vectors
+    
+    async def _cache_lookup(self, kind: str, business_context: Dict[str, Any], objectives: List[str],
+                            *scope_fields: str) -> Tuple[str, str, str, Optional[List[float]], Optional[Dict[str, Any]]]:
+        """Look up a cached result, returning (key, scope, text, vector, result) for storing a miss later
+        
+        Callers get a shallow copy of a hit, so they may set top-level keys freely.
+        """
+        text = json.dumps({"business_context": business_context, "objectives": objectives}, sort_keys=True, default=str)
+        scope = RoadmapCache.digest(kind, *map(str, scope_fields))
+        key = RoadmapCache.digest(scope, text)
+        
+        cached = self._cache.get(key)
+        vector = None
+        # Only pay for an embedding when there is something in scope to compare it with
+        if cached is None and self._cache.has_scope(scope):
+            # The request and any entries in scope not yet embedded go in a single embeddings call
+            unembedded = self._cache.unembedded(scope)
+            vector, *entry_vectors = await self._cache_embeddings_of([text, *(entry_text for _, entry_text in unembedded)])
+            for (entry_key, _), entry_vector in zip(unembedded, entry_vectors):
+                if entry_vector is not None:
+                    self._cache.set_vector(entry_key, entry_vector)
+            if vector is not None:
+                cached = self._cache.get_similar(scope, vector)
+        
+        return key, scope, text, vector, dict(cached) if cached is not None else None
+    
     def select_roadmap_framework(self, objectives: List[str], context: Dict[str, Any]) -> str:
         """Select the most appropriate roadmap framework"""
-        # Simple framework selection logic
-        objective_text = " ".join(objectives).lower()
-        
-        if "optimization" in objective_text or "efficiency" in objective_text:
-            return "business_optimization"
-        elif "innovation" in objective_text or "strategy" in objective_text:
-            return "ai_innovation_strategy"
-        else:
-            return "ai_implementation"
+        return select_framework_for_objectives(tuple(objectives))
     
-    def generate_ai_roadmap(self, business_context: Dict[str, Any], objectives: List[str], 
-                           timeline: str, budget: str, industry: str, 
-                           company_size: str, framework: str) -> Dict[str, Any]:
-        """Generate roadmap using AI"""
-        try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            prompt = f"""
-            You are an expert AI implementation consultant specializing in strategic roadmap development.
+    def build_completion_request(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
+        """Chat completion arguments for a JSON response to a static system prompt and a request"""
+        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+        # do not change this unless explicitly requested by the user
+        return {
+            "model": "gpt-4o",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "seed": COMPLETION_SEED
+        }
+    
+    async def json_completion(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
+        """Request a JSON completion, asking once more at temperature 0 if the response does not parse"""
+        for attempt_temperature in (temperature, 0.0):
+            response = await self.openai_client.chat.completions.create(
+                **self.build_completion_request(system_prompt, prompt, attempt_temperature, max_tokens)
+            )
             
-            Create a comprehensive AI implementation roadmap based on these requirements:
+            try:
+                return serialization.loads(response.choices[0].message.content)
+            except json.JSONDecodeError:
+                if attempt_temperature == 0.0:
+                    raise
+                self.log_message("Completion was not valid JSON, retrying at temperature 0", "warning")
+    
+    async def stream_json_completion(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int,
+                                     partial_queue: asyncio.Queue = None) -> Dict[str, Any]:
+        """Stream a JSON completion, putting each top-level field on partial_queue as soon as it is complete
+        
+        If the streamed output does not parse, the completion is requested again without streaming.
+        """
+        stream = await self.openai_client.chat.completions.create(
+            **self.build_completion_request(system_prompt, prompt, temperature, max_tokens),
+            stream=True
+        )
+        
+        parser = IncrementalObjectParser() if partial_queue is not None else None
+        chunks = []
+        
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
             
+            chunks.append(delta)
+            if parser is not None:
+                try:
+                    for field in parser.feed(delta):
+                        await partial_queue.put(field)
+                except ValueError:
+                    parser = None
+        
+        try:
+            return serialization.loads("".join(chunks))
+        except json.JSONDecodeError:
+            self.log_message("Streamed completion was not valid JSON, requesting it again", "warning")
+            return await self.json_completion(system_prompt, prompt, temperature, max_tokens)
+    
+    async def _roadmap_cache_lookup(self, business_context: Dict[str, Any], objectives: List[str],
+                                    timeline: str, budget: str, industry: str, company_size: str, framework: str):
+        return await self._cache_lookup(
+            "roadmap", business_context, objectives, framework, industry, company_size, budget, timeline
+        )
+    
+    def roadmap_arguments(self, requirements: Dict[str, Any]) -> Tuple:
+        """Positional arguments for generate_ai_roadmap from a roadmap request, selecting its framework"""
+        business_context = requirements.get("business_context", {})
+        ai_objectives = requirements.get("ai_objectives", [])
+        return (
+            business_context,
+            ai_objectives,
+            requirements.get("timeline", "12 months"),
+            requirements.get("budget_range", "moderate"),
+            requirements.get("industry", "general"),
+            requirements.get("company_size", "medium"),
+            self.select_roadmap_framework(ai_objectives, business_context)
+        )
+    
+    def roadmap_requirements_text(self, business_context: Dict[str, Any], objectives: List[str],
+                                  timeline: str, budget: str, industry: str,
+                                  company_size: str, framework: str) -> str:
+        """Describe one roadmap request for the user message"""
+        objective_lines = "\n".join(f"- {obj}" for obj in objectives)
+        return f"""
             Business Context:
             - Industry: {industry}
             - Company Size: {company_size}
@@ -169,90 +796,125 @@ class RoadmapGeneratorAgent(BaseAgent):
             - Key Challenges: {business_context.get('challenges', 'Standard business challenges')}
             
             AI Objectives:
-            {chr(10).join(f"- {obj}" for obj in objectives)}
+            {objective_lines}
             
             Framework: {framework}
             Timeline: {timeline}
-            Budget Range: {budget}
-            
-            Framework Details:
-            - Phases: {self.roadmap_frameworks[framework]['phases']}
-            - Focus Areas: {self.roadmap_frameworks[framework]['focus_areas']}
-            - Expected Timeline: {self.roadmap_frameworks[framework]['timeline']}
-            
-            Generate a detailed roadmap with:
-            1. Phase-by-phase breakdown with specific activities
-            2. Key milestones and deliverables for each phase
-            3. Resource requirements (team, technology, budget)
-            4. Success metrics and KPIs
-            5. Strategic recommendations
-            
-            Focus on practical, actionable steps that align with consulting best practices.
-            Include specific deliverables that demonstrate value at each phase.
+            Budget Range: {budget}"""
+    
+    async def generate_ai_roadmap(self, business_context: Dict[str, Any], objectives: List[str], 
+                           timeline: str, budget: str, industry: str, 
+                           company_size: str, framework: str,
+                           partial_queue: asyncio.Queue = None) -> Dict[str, Any]:
+        """Generate roadmap using AI, reusing the result for identical or near-identical requests
+        
+        The completion is streamed. When partial_queue is given, each top-level
+        field is put on it as a (key, value) pair as soon as it is complete,
+        followed by None once generation finishes.
+        """
+        try:
+            key, scope, text, vector, cached = await self._roadmap_cache_lookup(
+                business_context, objectives, timeline, budget, industry, company_size, framework
+            )
+            if cached is not None:
+                if partial_queue is not None:
+                    for field in cached.items():
+                        await partial_queue.put(field)
+                return cached
             
-            Respond with JSON in this format:
-            {{
-                "phases": [
-                    {{
-                        "name": "Phase Name",
-                        "duration": "X weeks/months",
-                        "objectives": ["objective1", "objective2"],
-                        "activities": ["activity1", "activity2"],
-                        "deliverables": ["deliverable1", "deliverable2"]
-                    }}
-                ],
-                "milestones": [
-                    {{
-                        "name": "Milestone Name",
-                        "phase": "Phase Name",
-                        "deadline": "Week X",
-                        "success_criteria": ["criteria1", "criteria2"]
-                    }}
-                ],
-                "resources": {{
-                    "team_requirements": ["role1", "role2"],
-                    "technology_stack": ["tech1", "tech2"],
-                    "estimated_budget": "budget range",
-                    "external_support": ["consultant", "vendor"]
-                }},
-                "success_metrics": [
-                    {{
-                        "metric": "Metric Name",
-                        "target": "Target Value",
-                        "measurement": "How to measure"
-                    }}
-                ],
-                "recommendations": [
-                    {{
-                        "category": "Category",
-                        "recommendation": "Specific recommendation",
-                        "rationale": "Why this is important"
-                    }}
-                ]
-            }}
+            prompt = f"""
+            Create an AI implementation roadmap for these requirements:
+            {self.roadmap_requirements_text(business_context, objectives, timeline, budget, industry, company_size, framework)}
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.7
+            roadmap_data = await self.stream_json_completion(
+                self._roadmap_prompt_prefix, prompt, ROADMAP_TEMPERATURE, ROADMAP_MAX_TOKENS, partial_queue
             )
-            
-            roadmap_data = json.loads(response.choices[0].message.content)
-            return roadmap_data
+            self._cache.put(key, scope, text, vector, roadmap_data)
+            return dict(roadmap_data)
             
         except Exception as e:
             self.log_message(f"Error generating AI roadmap: {str(e)}", "error")
             raise e
+        
+        finally:
+            if partial_queue is not None:
+                await partial_queue.put(None)
+    
+    async def _details_from_stream(self, partial_queue: asyncio.Queue, framework: str) -> Optional[Dict[str, Any]]:
+        """Add implementation details to the phases as soon as they are streamed, or None if they never are"""
+        details = None
+        while (field := await partial_queue.get()) is not None:
+            key, value = field
+            if key == "phases" and details is None and isinstance(value, list):
+                details = self.add_implementation_details({"phases": value}, framework)
+        return details
     
-    def extract_deliverables_from_phases(self, phases: List[Dict[str, Any]]) -> List[str]:
+    async def generate_roadmaps_batch(self, requirements_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate roadmap data for several requests with a single completion
+        
+        Results are returned in request order. Cached requests are not sent, and
+        any roadmap missing from the batched response is generated on its own.
+        """
+        arguments = [self.roadmap_arguments(requirements) for requirements in requirements_list]
+        lookups = await asyncio.gather(*(self._roadmap_cache_lookup(*args) for args in arguments))
+        
+        roadmaps: List[Optional[Dict[str, Any]]] = [cached for *_, cached in lookups]
+        pending = [i for i, roadmap in enumerate(roadmaps) if roadmap is None]
+        
+        if len(pending) > 1:
+            inputs = "\n".join(
+                f"Input {n}:{self.roadmap_requirements_text(*arguments[i])}" for n, i in enumerate(pending, 1)
+            )
+            prompt = f"""
+            Generate {len(pending)} independent roadmaps, one per input below and in the same order.
+            Respond with JSON {{"roadmaps": [...]}} where each item follows the format above.
+            
+            {inputs}
+            """
+            
+            try:
+                batch = (await self.json_completion(
+                    self._roadmap_prompt_prefix, prompt, ROADMAP_TEMPERATURE, ROADMAP_MAX_TOKENS * len(pending)
+                )).get("roadmaps", [])
+            except Exception as e:
+                self.log_message(f"Batched roadmap generation failed, generating individually: {str(e)}", "warning")
+                batch = []
+            
+            # Match results to requests by position
+            for i, roadmap_data in zip(pending, batch):
+                if isinstance(roadmap_data, dict):
+                    key, scope, text, vector, _ = lookups[i]
+                    self._cache.put(key, scope, text, vector, roadmap_data)
+                    roadmaps[i] = dict(roadmap_data)
+        
+        missing = [i for i, roadmap in enumerate(roadmaps) if roadmap is None]
+        for i, roadmap_data in zip(missing, await asyncio.gather(*(self.generate_ai_roadmap(*arguments[i]) for i in missing))):
+            roadmaps[i] = roadmap_data
+        
+        return roadmaps
+    
+    async def generate_roadmaps_concurrently(self, requirements_list: List[Dict[str, Any]],
+                                             batch_size: int = ROADMAP_BATCH_SIZE,
+                                             max_concurrency: int = MAX_CONCURRENT_ROADMAP_BATCHES) -> List[Dict[str, Any]]:
+        """Generate roadmap data for many requests in batches, with a bounded number of batches in flight"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.generate_roadmaps_batch(batch)
+        
+        batches = await asyncio.gather(*(
+            run_batch(requirements_list[start:start + batch_size])
+            for start in range(0, len(requirements_list), batch_size)
+        ))
+        return [roadmap for batch in batches for roadmap in batch]
+    
+    def extract_deliverables_from_phases(self, phases: Union[List[Dict[str, Any]], PhaseTable]) -> List[str]:
         """Extract all deliverables from phases"""
-        deliverables = []
-        for phase in phases:
-            phase_deliverables = phase.get("deliverables", [])
-            deliverables.extend(phase_deliverables)
-        return deliverables
+        if isinstance(phases, PhaseTable):
+            return phases.all_deliverables()
+        return list(itertools.chain.from_iterable(phase.get("deliverables", []) for phase in phases))
     
     def add_implementation_details(self, roadmap_data: Dict[str, Any], framework: str) -> Dict[str, Any]:
         """Add detailed implementation specifics to the roadmap"""
@@ -270,13 +932,7 @@ class RoadmapGeneratorAgent(BaseAgent):
     def recommend_methodology(self, roadmap_data: Dict[str, Any]) -> Dict[str, Any]:
         """Recommend implementation methodology based on roadmap characteristics"""
         phase_count = len(roadmap_data.get("phases", []))
-        
-        if phase_count <= 3:
-            recommended = "lean_startup"
-        elif phase_count <= 5:
-            recommended = "agile_ai"
-        else:
-            recommended = "design_thinking"
+        recommended = _methodology_for_phase_count(phase_count)
         
         return {
             "primary": recommended,
@@ -286,112 +942,103 @@ class RoadmapGeneratorAgent(BaseAgent):
     
     def generate_workshop_plan(self, phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate workshop plan for each implementation phase"""
-        workshops = []
-        
-        for i, phase in enumerate(phases):
-            workshop = {
+        return [
+            {
                 "phase": phase["name"],
                 "workshop_name": f"AI Implementation Workshop: {phase['name']}",
                 "duration": "2-3 days",
-                "participants": ["Stakeholders", "Technical Team", "End Users"],
+                "participants": list(WORKSHOP_PARTICIPANTS),
                 "objectives": [
                     f"Align on {phase['name'].lower()} objectives",
                     "Identify potential challenges and solutions",
                     "Create detailed implementation plan"
                 ],
-                "deliverables": [
-                    "Phase-specific action plan",
-                    "Risk mitigation strategies", 
-                    "Resource allocation plan"
-                ]
+                "deliverables": list(WORKSHOP_DELIVERABLES)
             }
-            workshops.append(workshop)
-        
-        return workshops
+            for phase in phases
+        ]
     
     def integrate_design_thinking(self, phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Integrate Design Thinking principles into roadmap phases"""
-        design_thinking_steps = ["Empathize", "Define", "Ideate", "Prototype", "Test"]
         integration_points = []
         
         for phase in phases:
-            if "planning" in phase["name"].lower() or "assessment" in phase["name"].lower():
-                integration_points.append({
-                    "phase": phase["name"],
-                    "design_thinking_focus": "Empathize & Define",
-                    "activities": [
-                        "User research and stakeholder interviews",
-                        "Problem definition and user journey mapping",
-                        "Define success criteria from user perspective"
-                    ]
-                })
-            elif "implementation" in phase["name"].lower() or "development" in phase["name"].lower():
-                integration_points.append({
-                    "phase": phase["name"],
-                    "design_thinking_focus": "Ideate & Prototype",
-                    "activities": [
-                        "Solution brainstorming sessions",
-                        "Rapid prototyping and MVP development",
-                        "User feedback integration"
-                    ]
-                })
-            elif "testing" in phase["name"].lower() or "validation" in phase["name"].lower():
-                integration_points.append({
-                    "phase": phase["name"],
-                    "design_thinking_focus": "Test & Iterate",
-                    "activities": [
-                        "User testing and feedback collection",
-                        "Solution refinement based on insights",
-                        "Continuous improvement planning"
-                    ]
-                })
+            name_tokens = set(TOKEN_PATTERN.findall(phase["name"].lower()))
+            for keywords, focus in DESIGN_THINKING_FOCUS:
+                if not name_tokens.isdisjoint(keywords):
+                    integration_points.append({
+                        "phase": phase["name"],
+                        "design_thinking_focus": focus["design_thinking_focus"],
+                        "activities": list(focus["activities"])
+                    })
+                    break
         
         return integration_points
     
-    def generate_risk_assessment(self, business_context: Dict[str, Any], objectives: List[str]) -> Dict[str, Any]:
-        """Generate comprehensive risk assessment for the implementation"""
+    def rule_based_risk_assessment(self, business_context: Dict[str, Any], objectives: List[str]) -> Optional[Dict[str, Any]]:
+        """Assess risks from the template table, or return None if the input has words it does not cover
+        
+        Categories whose trigger words appear in the input are rated high probability.
+        """
+        text = " ".join([*map(str, business_context.values()), *map(str, objectives)]).lower()
+        tokens = set(TOKEN_PATTERN.findall(text))
+        if not tokens <= RISK_VOCABULARY:
+            return None
+        
+        risks = []
+        for category in self.risk_categories:
+            triggered = not tokens.isdisjoint(RISK_TRIGGERS.get(category, ()))
+            for template in self._risk_templates.get(category, []):
+                risk = {"category": category, **template, "mitigation_strategies": list(template["mitigation_strategies"])}
+                if triggered:
+                    risk["probability"] = "High"
+                risks.append(risk)
+        
+        critical = [risk for risk in risks if risk["probability"] == "High" and risk["impact"] == "High"]
+        elevated = [risk for risk in risks if risk["probability"] == "High"]
+        if len(critical) >= 2:
+            overall_risk_level = "High"
+        elif critical or elevated:
+            overall_risk_level = "Medium"
+        else:
+            overall_risk_level = "Low"
+        
+        key_recommendations = [risk["mitigation_strategies"][0] for risk in elevated]
+        return {
+            "risks": risks,
+            "overall_risk_level": overall_risk_level,
+            "key_recommendations": key_recommendations or ["Review risks at each phase gate"]
+        }
+    
+    async def generate_risk_assessment(self, business_context: Dict[str, Any], objectives: List[str],
+                                       force_llm: bool = False) -> Dict[str, Any]:
+        """Generate comprehensive risk assessment for the implementation
+        
+        Inputs in the common vocabulary are assessed from the rule table; only
+        novel inputs (or force_llm) go to the model.
+        """
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
+            if not force_llm:
+                assessment = self.rule_based_risk_assessment(business_context, objectives)
+                if assessment is not None:
+                    return assessment
+            
+            key, scope, text, vector, cached = await self._cache_lookup("risk", business_context, objectives)
+            if cached is not None:
+                return cached
+            
             prompt = f"""
             Analyze the potential risks for this AI implementation project:
             
-            Business Context: {json.dumps(business_context)}
+            Business Context: {serialization.dumps(business_context)}
             Objectives: {objectives}
-            
-            Assess risks in these categories:
-            {chr(10).join(f"- {category}" for category in self.risk_categories)}
-            
-            For each identified risk, provide:
-            1. Risk description
-            2. Probability (Low/Medium/High)
-            3. Impact (Low/Medium/High)
-            4. Mitigation strategies
-            
-            Respond with JSON:
-            {{
-                "risks": [
-                    {{
-                        "category": "Risk Category",
-                        "description": "Risk description",
-                        "probability": "Low/Medium/High",
-                        "impact": "Low/Medium/High",
-                        "mitigation_strategies": ["strategy1", "strategy2"]
-                    }}
-                ],
-                "overall_risk_level": "Low/Medium/High",
-                "key_recommendations": ["recommendation1", "recommendation2"]
-            }}
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3
+            risk_assessment = await self.json_completion(
+                self._risk_prompt_prefix, prompt, RISK_TEMPERATURE, RISK_MAX_TOKENS
             )
-            
-            return json.loads(response.choices[0].message.content)
+            self._cache.put(key, scope, text, vector, risk_assessment)
+            return dict(risk_assessment)
             
         except Exception as e:
             self.log_message(f"Error generating risk assessment: {str(e)}", "error")
@@ -405,25 +1052,10 @@ class RoadmapGeneratorAgent(BaseAgent):
         """Assess organization's readiness for AI implementation"""
         try:
             readiness_factors = {
-                "leadership_support": assessment_data.get("leadership_buy_in", 5),
-                "data_maturity": assessment_data.get("data_quality", 3),
-                "technical_capabilities": assessment_data.get("tech_team_skills", 4),
-                "change_management": assessment_data.get("change_readiness", 3),
-                "budget_allocation": assessment_data.get("budget_commitment", 4)
+                factor: assessment_data.get(field, default) for factor, field, default in READINESS_FACTORS
             }
             
-            # Calculate overall readiness score
-            total_score = sum(readiness_factors.values())
-            max_score = len(readiness_factors) * 10
-            readiness_percentage = (total_score / max_score) * 100
-            
-            # Determine readiness level
-            if readiness_percentage >= 80:
-                readiness_level = "High - Ready for Implementation"
-            elif readiness_percentage >= 60:
-                readiness_level = "Medium - Preparation Needed"
-            else:
-                readiness_level = "Low - Significant Preparation Required"
+            readiness_percentage, readiness_level = score_readiness(tuple(readiness_factors.values()))
             
             recommendations = self.generate_readiness_recommendations(readiness_factors)
             
@@ -477,10 +1109,10 @@ class RoadmapGeneratorAgent(BaseAgent):
         
         return recommendations
     
-    def create_roadmap_summary(self, roadmap: Dict[str, Any]) -> Dict[str, Any]:
+    def create_roadmap_summary(self, roadmap: Dict[str, Any], phase_table: Optional[PhaseTable] = None) -> Dict[str, Any]:
         """Create executive summary of the roadmap"""
         return {
-            "total_phases": len(roadmap["phases"]),
+            "total_phases": len(phase_table if phase_table is not None else roadmap["phases"]),
             "estimated_timeline": roadmap["timeline"],
             "key_milestones": len(roadmap["milestones"]),
             "primary_framework": roadmap["framework"],
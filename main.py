@@ -162,9 +162,11 @@ class MultiAgentContentSystem:
         except KeyboardInterrupt:
             logger.info("Shutting down system...")
             self.scheduler.shutdown()
+            self.workflow.shutdown()
         except Exception as e:
             logger.error(f"System error: {e}")
             self.scheduler.shutdown()
+            self.workflow.shutdown()
 
 if __name__ == "__main__":
     system = MultiAgentContentSystem()
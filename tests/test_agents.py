@@ -2,22 +2,29 @@
 Unit tests for Multi-Agent AI Content System agents
 """
 
+import asyncio
+import base64
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
+import json
 import os
 import sys
+import time
+
+import httpx
+from openai import RateLimitError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.base_agent import BaseAgent, AgentCommunicationHub
-from agents.orchestration import OrchestrationAgent
+from agents.base_agent import BaseAgent, AgentCommunicationHub, _log_flusher
+from agents.orchestration import OrchestrationAgent, RunContext, BREAKER_THRESHOLD, STAGE_TIMEOUTS
 from agents.trend_researcher import TrendResearcherAgent
 from agents.content_developer import ContentDeveloperAgent
 from agents.content_editor import ContentEditorAgent
 from agents.scheduler import SchedulerAgent
-from agents.distribution import DistributionAgent
-from agents.roadmap_generator import RoadmapGeneratorAgent
+from agents.distribution import DistributionAgent, IMAGE_CONCURRENCY
+from agents.roadmap_generator import RoadmapGeneratorAgent, PhaseTable
 
 
 class TestBaseAgent(unittest.TestCase):
@@ -50,6 +57,41 @@ class TestBaseAgent(unittest.TestCase):
         self.assertEqual(error_response["error"], "Test error")
 
 
+class EchoAgent(BaseAgent):
+    """Minimal concrete agent for exercising BaseAgent and the hub"""
+    
+    def execute_task(self, task_data):
+        return self.create_response(True, task_data)
+
+
+class TestAgentLogging(unittest.TestCase):
+    """Test background flushing of agent log records"""
+    
+    def test_unserializable_metadata_keeps_flusher_alive(self):
+        """Test a record with non-JSON metadata is logged and later records still flush"""
+        class Unprintable:
+            def __str__(self):
+                raise RuntimeError("no str")
+        
+        agent = EchoAgent("Echo Agent", "Test Role")
+        with self.assertLogs(agent.logger, level="INFO") as logs:
+            agent.log_message("with a set", metadata={"x": {1, 2}})
+            agent.log_message("unprintable", metadata={"x": Unprintable()})
+            agent.log_message("after")
+            _log_flusher.flush()
+            # The flusher thread may be writing a record it took before the explicit flush
+            for _ in range(100):
+                if len(logs.records) >= 3:
+                    break
+                time.sleep(0.01)
+        
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual([r["message"] for r in records], ["with a set", "unprintable", "after"])
+        self.assertEqual(records[0]["x"], "{1, 2}")
+        self.assertIn("metadata_error", records[1])
+        self.assertTrue(_log_flusher._thread.is_alive())
+
+
 class TestAgentCommunicationHub(unittest.TestCase):
     """Test AgentCommunicationHub functionality"""
     
@@ -69,6 +111,42 @@ class TestAgentCommunicationHub(unittest.TestCase):
         self.assertIn("Test Agent", status["agents"])
 
 
+class TestAgentMessaging(unittest.TestCase):
+    """Test message routing through the communication hub"""
+    
+    def setUp(self):
+        self.hub = AgentCommunicationHub()
+        for name in ("Agent A", "Agent B", "Agent C"):
+            self.hub.register_agent(EchoAgent(name, "Test Role"))
+    
+    def test_sync_routing_and_close(self):
+        """Test synchronous callers get responses, and close stops the consumers"""
+        routed = self.hub.route_message("Agent A", "Agent B", {"type": "ping"})
+        self.assertTrue(routed["success"])
+        self.assertEqual(routed["response"]["status"], "received")
+        
+        broadcast = self.hub.broadcast_message("Agent A", {"type": "ping"})
+        self.assertEqual(set(broadcast["responses"]), {"Agent B", "Agent C"})
+        
+        consumers = list(self.hub._consumers.values())
+        self.hub.close()
+        
+        self.assertEqual(self.hub._consumers, {})
+        for consumer in consumers:
+            self.assertTrue(asyncio.run_coroutine_threadsafe(self._finished(consumer), consumer.get_loop()).result(1))
+    
+    def test_async_routing(self):
+        """Test the awaitable variant from another event loop"""
+        routed = asyncio.run(self.hub.aroute_message("Agent A", "Agent C", {"type": "ping"}))
+        self.assertTrue(routed["success"])
+        self.hub.close()
+    
+    @staticmethod
+    async def _finished(task):
+        await asyncio.sleep(0)
+        return task.done()
+
+
 class TestOrchestrationAgent(unittest.TestCase):
     """Test OrchestrationAgent functionality"""
     
@@ -87,6 +165,129 @@ class TestOrchestrationAgent(unittest.TestCase):
         self.assertIsInstance(response, dict)
         self.assertIn("success", response)
 
+    def test_pipeline_processes_trends_independently(self):
+        """Test each trend runs through every stage and a failed trend is skipped"""
+        ok = lambda data: {"success": True, "data": data}
+        trends = [{"title": f"Trend {i}"} for i in range(3)]
+        generated = [ok({"content_id": "c1"}), RuntimeError("generation failed"), ok({"content_id": "c3"})]
+
+        with patch.object(self.agent, "request_trend_research", AsyncMock(return_value=ok({"trends": trends}))), \
+             patch.object(self.agent, "request_content_generation", AsyncMock(side_effect=generated)) as generate, \
+             patch.object(self.agent, "request_content_editing", AsyncMock(return_value=ok({"approved": True}))) as edit, \
+             patch.object(self.agent, "request_content_scheduling", AsyncMock(return_value=ok({"post_id": "p"}))):
+            response = self.agent.run_content_pipeline()
+
+        self.assertTrue(response["success"])
+        self.assertEqual(generate.await_count, 3)
+        self.assertEqual(edit.await_count, 2)
+        self.assertEqual(response["data"]["posts_generated"], 2)
+        self.assertEqual(response["data"]["posts_scheduled"], 2)
+        self.assertCountEqual([args.args[1] for args in edit.await_args_list], ["c1", "c3"])
+        self.assertCountEqual(response["data"]["scheduled_post_ids"], ["c1", "c3"])
+        self.assertNotIn("scheduled_posts", response["data"])
+
+    def test_stages_share_stored_content(self):
+        """Test editing and scheduling read generated content from the run store"""
+        content = {"text": "Agentic systems post"}
+        developer, editor, scheduler = Mock(), Mock(), Mock()
+        developer.aexecute_task = AsyncMock(return_value={"success": True, "data": content})
+        editor.aexecute_task = AsyncMock(return_value={"success": True, "data": {"approved": True, "overall_score": 4.2}})
+        scheduler.aexecute_task = AsyncMock(return_value={"success": True, "data": {"job_id": "job"}})
+        self.agent._agents = {ContentDeveloperAgent: developer, ContentEditorAgent: editor, SchedulerAgent: scheduler}
+
+        run = RunContext()
+
+        async def stages():
+            generated = await self.agent.request_content_generation(run, {"title": "Trend"})
+            content_id = generated["data"]["content_id"]
+            await self.agent.request_content_editing(run, content_id)
+            await self.agent.request_content_scheduling(run, content_id)
+            return content_id
+
+        content_id = asyncio.run(stages())
+        scheduled = scheduler.aexecute_task.await_args.args[0]["content"]
+        self.assertIs(scheduled, run.store[content_id])
+        self.assertEqual(scheduled["text"], "Agentic systems post")
+        self.assertTrue(scheduled["review"]["approved"])
+        self.assertEqual(scheduled["schedule"]["job_id"], "job")
+
+    def test_stage_timeout_trips_breaker(self):
+        """Test hung sub-agent requests time out and later requests are skipped"""
+        async def hang(task_data):
+            await asyncio.sleep(1)
+
+        developer = Mock()
+        developer.aexecute_task = AsyncMock(side_effect=hang)
+        self.agent._agents = {ContentDeveloperAgent: developer}
+
+        run = RunContext()
+
+        async def dispatch_all():
+            return [await self.agent._dispatch(run, "content", trend={}) for _ in range(BREAKER_THRESHOLD + 1)]
+
+        with patch.dict(STAGE_TIMEOUTS, {"content": 0.01}):
+            results = asyncio.run(dispatch_all())
+
+        self.assertIn("timed out", results[0]["error"])
+        self.assertIn("skipped", results[-1]["error"])
+        self.assertEqual(developer.aexecute_task.await_count, BREAKER_THRESHOLD)
+
+    def test_status_formats_error_timestamps(self):
+        """Test errors are stored with a numeric timestamp and reported in ISO format"""
+        self.agent.handle_pipeline_error("Trend research failed", "timeout")
+        self.assertIsInstance(self.agent._last_run.errors[0]["ts_ns"], int)
+
+        error = self.agent.get_pipeline_status()["data"]["errors"][0]
+        self.assertEqual(error["type"], "Trend research failed")
+        self.assertRegex(error["timestamp"], r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}$")
+
+    def test_concurrent_runs_keep_separate_state(self):
+        """Test overlapping runs on one agent count their own posts"""
+        ok = lambda data: {"success": True, "data": data}
+
+        async def generate(run, trend):
+            await asyncio.sleep(0.01)
+            content_id = f"{run.run_id}-{trend['title']}"
+            run.store[content_id] = {}
+            return ok({"content_id": content_id})
+
+        research = AsyncMock(side_effect=[ok({"trends": [{"title": "a"}]}), ok({"trends": [{"title": "b"}, {"title": "c"}]})])
+        runs = [RunContext(), RunContext()]
+
+        async def both():
+            return await asyncio.gather(*(self.agent.arun_content_pipeline(run=run) for run in runs))
+
+        with patch.object(self.agent, "request_trend_research", research), \
+             patch.object(self.agent, "request_content_generation", generate), \
+             patch.object(self.agent, "request_content_editing", AsyncMock(return_value=ok({"approved": True}))), \
+             patch.object(self.agent, "request_content_scheduling", AsyncMock(return_value=ok({}))):
+            first, second = asyncio.run(both())
+
+        self.assertEqual(first["data"]["posts_scheduled"], 1)
+        self.assertEqual(second["data"]["posts_scheduled"], 2)
+        self.assertEqual(len(runs[0].store), 1)
+        self.assertEqual(len(runs[1].store), 2)
+
+    def test_validate_content_topic_alignment(self):
+        """Test topic pillars are matched case-insensitively anywhere in the text, including inflected forms"""
+        aligned = self.agent.validate_content({"text": "Why agentic systems change delivery"})
+        plural = self.agent.validate_content({"text": "AI innovations drive growth"})
+        unaligned = self.agent.validate_content({"text": "Why generative models change delivery"})
+        self.assertTrue(aligned["data"]["topic_alignment"])
+        self.assertTrue(plural["data"]["topic_alignment"])
+        self.assertFalse(unaligned["data"]["topic_alignment"])
+
+    def test_validate_contents_batch(self):
+        """Test a batch validates each item like validate_content, in order"""
+        contents = [{"text": "Why agentic systems change delivery"}, None, {"text": "Unrelated"}]
+        response = self.agent.execute_task({"task_type": "validate_content", "contents": contents})
+
+        results = response["data"]["results"]
+        self.assertEqual(response["data"]["validated_count"], 3)
+        self.assertEqual(results[0], self.agent.validate_content(contents[0])["data"])
+        self.assertFalse(results[1]["length_check"])
+        self.assertFalse(results[2]["topic_alignment"])
+
 
 class TestTrendResearcherAgent(unittest.TestCase):
     """Test TrendResearcherAgent functionality"""
@@ -129,6 +330,9 @@ class TestContentDeveloperAgent(unittest.TestCase):
         trend = {"category": "Business Optimization", "title": "Test Trend"}
         template = self.agent.select_template_type(trend)
         self.assertIsInstance(template, str)
+        
+        for angles in (["The future of work"], "The future of work"):
+            self.assertEqual(self.agent.select_template_type({"content_angles": angles}), "future_outlook")
     
     def test_reading_time_calculation(self):
         """Test reading time calculation"""
@@ -136,6 +340,114 @@ class TestContentDeveloperAgent(unittest.TestCase):
         reading_time = self.agent.calculate_reading_time(text)
         self.assertIsInstance(reading_time, int)
         self.assertGreater(reading_time, 0)
+    
+    def test_key_phrase_bolding(self):
+        """Test overlapping key phrases are bolded once, preferring the longest"""
+        components = {
+            "hook": "AI strategy matters",
+            "main_content": "Every AI strategy starts with AI literacy.",
+            "implications": [],
+            "hashtags": ["#AI"],
+            "key_phrases": ["AI", "AI strategy"]
+        }
+        text = self.agent.format_content(components, "insight_sharing")["text"]
+        self.assertIn("Every **AI strategy** starts with **AI** literacy.", text)
+        self.assertNotIn("****", text)
+    
+    def test_concurrent_generation(self):
+        """Test multi-trend generation through the concurrent path"""
+        async def fake_generate(trend, template_type, partial_queue=None):
+            return {"hook": trend["title"], "main_content": "Body", "implications": [], "hashtags": ["#AI"]}
+        
+        with patch.object(ContentDeveloperAgent, "generate_ai_content", side_effect=fake_generate):
+            response = self.agent.execute_task({
+                "task_type": "generate_content",
+                "trends": [{"title": "Trend A"}, {"title": "Trend B"}]
+            })
+        
+        self.assertTrue(response["success"])
+        self.assertEqual(response["data"]["generated_count"], 2)
+    
+    def test_streamed_content_in_small_chunks(self):
+        """Test a long streamed completion fed a few characters at a time yields every component once"""
+        components = {
+            "hook": "A hook with \"quotes\" and {braces}",
+            "main_content": "Long body. " * 1000,
+            "cta": "What do you think?",
+            "hashtags": ["#AI", "#Strategy"],
+            "score": 7
+        }
+        body = json.dumps(components)
+        
+        async def fake_stream(**kwargs):
+            for start in range(0, len(body), 3):
+                yield Mock(choices=[Mock(delta=Mock(content=body[start:start + 3]))])
+        
+        async def generate():
+            queue = asyncio.Queue()
+            result = await self.agent.generate_ai_content({"title": "Streaming"}, "insight_sharing", queue)
+            fields = []
+            while (field := queue.get_nowait()) is not None:
+                fields.append(field)
+            return result, fields
+        
+        create = AsyncMock(side_effect=lambda **kwargs: fake_stream(**kwargs))
+        with patch.object(self.agent.openai_client.chat.completions, "create", create):
+            result, fields = self.agent.run_async(generate())
+        
+        self.assertEqual(result, components)
+        self.assertEqual(fields, list(components.items()))
+    
+    def test_ai_content_cache(self):
+        """Test repeated trends are served from the generation cache"""
+        async def fake_stream(**kwargs):
+            for delta in ['{"hook": ', '"Cached hook"}']:
+                yield Mock(choices=[Mock(delta=Mock(content=delta))])
+        
+        create = AsyncMock(side_effect=lambda **kwargs: fake_stream(**kwargs))
+        trend = {"title": "Test Trend", "summary": "Summary"}
+        
+        with patch.object(self.agent.openai_client.chat.completions, "create", create):
+            first = self.agent.run_async(self.agent.generate_ai_content(trend, "insight_sharing"))
+            second = self.agent.run_async(self.agent.generate_ai_content(dict(trend), "insight_sharing"))
+        
+        self.assertEqual(first, second)
+        self.assertEqual(create.await_count, 1)
+
+
+def ai_review_json(score, issues=()):
+    """Schema-complete ai_review section"""
+    return json.dumps({
+        "overall_score": score,
+        "category_scores": {"grammar_clarity": score, "brand_alignment": score,
+                            "factual_accuracy": score, "engagement_potential": score},
+        "issues": list(issues), "suggestions": [], "strengths": [], "improvement_areas": []
+    })
+
+
+def brand_json(score):
+    """Schema-complete brand_alignment section"""
+    return json.dumps({
+        "score": score, "voice_consistency": score, "tone_appropriateness": score,
+        "message_alignment": score, "audience_value": score, "issues": [], "suggestions": []
+    })
+
+
+class FakeReviewStream:
+    """Async chat completion stream yielding the given content deltas"""
+    
+    def __init__(self, *deltas):
+        self.deltas = deltas
+        self.consumed = 0
+        self.closed = False
+    
+    async def __aiter__(self):
+        for delta in self.deltas:
+            self.consumed += 1
+            yield Mock(choices=[Mock(delta=Mock(content=delta))])
+    
+    async def close(self):
+        self.closed = True
 
 
 class TestContentEditorAgent(unittest.TestCase):
@@ -156,6 +468,206 @@ class TestContentEditorAgent(unittest.TestCase):
         validation = self.agent.validate_technical_requirements(content_text, components)
         self.assertIsInstance(validation, dict)
         self.assertIn("valid", validation)
+    
+    def test_red_flag_phrase_is_a_warning_not_a_rejection(self):
+        """Test red flag phrases are reported as warnings without blocking approval or lowering the score"""
+        components = {"hook": "Hook", "main_content": "Body", "cta": "Comment below", "hashtags": ["#AI", "#Data", "#Ops"]}
+        clean_text = "🚀 " + "Teams adopting AI need a plan for data, skills and governance. " * 3
+        flagged_text = clean_text + "Beware of unrealistic claims and a weak call to action."
+        ai_review = {"overall_score": 4.5, "issues": [], "suggestions": []}
+        brand_check = {"score": 4.5, "issues": [], "suggestions": []}
+        
+        clean = self.agent.compile_review(self.agent.new_review_results({}), clean_text, components, ai_review, brand_check)
+        flagged = self.agent.compile_review(self.agent.new_review_results({}), flagged_text, components, ai_review, brand_check)
+        
+        self.assertTrue(flagged["approved"])
+        self.assertEqual(flagged["detailed_scores"]["technical_score"], clean["detailed_scores"]["technical_score"])
+        self.assertEqual(flagged["issues_found"], [{"text": "Red flag phrase: unrealistic claims", "severity": "warning"}])
+        self.assertIn("Yellow flag phrase: weak call to action", flagged["suggestions"])
+        self.assertIn("Red flag phrase: unrealistic claims", flagged["feedback_summary"])
+        
+        # Low scores still reject the post, with the red flag among its issues
+        low_review = dict(ai_review, overall_score=1.0)
+        low_brand = dict(brand_check, score=1.0)
+        rejected = self.agent.compile_review(self.agent.new_review_results({}), flagged_text, components, low_review, low_brand)
+        self.assertFalse(rejected["approved"])
+        self.assertIn("Red flag phrase: unrealistic claims", [issue["text"] for issue in rejected["issues_found"]])
+    
+    def test_close_releases_shared_http_client(self):
+        """Test close() shuts the shared connection pool and a later editor builds a fresh one"""
+        client = ContentEditorAgent.shared_http_client()
+        
+        self.agent.close()
+        
+        self.assertTrue(client.is_closed)
+        self.assertIsNone(ContentEditorAgent._http_client)
+        self.assertIsNot(ContentEditorAgent().openai_client._client, client)
+    
+    def test_batch_moderation(self):
+        """Test moderation of several texts uses a single request"""
+        def moderation_result(flagged):
+            result = Mock(flagged=flagged)
+            result.categories.model_dump.return_value = {}
+            result.category_scores.model_dump.return_value = {}
+            return result
+        
+        create = AsyncMock(return_value=Mock(results=[moderation_result(False), moderation_result(True)]))
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.moderations.create = create
+        
+        texts = ["first post https://example.com", "second post with a bomb"]
+        results = self.agent.run_async(self.agent.run_moderation_check_batch(texts))
+        
+        create.assert_awaited_once_with(input=texts)
+        self.assertEqual([result["safe"] for result in results], [True, False])
+    
+    def test_local_moderation_prefilter(self):
+        """Test clean short posts are cleared without a moderation request"""
+        create = AsyncMock()
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.moderations.create = create
+        self.agent._local_moderation_sample_rate = 0
+        
+        result = self.agent.run_async(self.agent.run_moderation_check("A practical look at AI adoption"))
+        
+        create.assert_not_awaited()
+        self.assertTrue(result["safe"])
+        self.assertEqual(result["source"], "local")
+    
+    def test_local_moderation_sends_inflected_terms_to_api(self):
+        """Test inflected violent and drug terms are never cleared locally"""
+        self.agent._local_moderation_sample_rate = 0
+        
+        for text in [
+            "Terrorists attacked the office; we are shooting the suspects",
+            "He was killed in the bombing",
+            "The victim was murdered and stabbed",
+            "Selling drugs is a crime",
+            "A drug dealer was arrested"
+        ]:
+            self.assertFalse(self.agent._passes_local_moderation(text), text)
+        
+        self.assertTrue(self.agent._passes_local_moderation("Hello network, building skills for AI adoption"))
+        self.assertTrue(self.agent._passes_local_moderation("A stable method and methodology for AI rollouts"))
+        self.assertFalse(self.agent._passes_local_moderation("Police seized meth at the border"))
+        
+        flagged = Mock(flagged=True, categories=Mock(model_dump=lambda: {}), category_scores=Mock(model_dump=lambda: {}))
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.moderations.create = AsyncMock(return_value=Mock(results=[flagged]))
+        result = self.agent.run_async(self.agent.run_moderation_check("Selling drugs after the bombing"))
+        
+        self.agent.openai_client.moderations.create.assert_awaited_once()
+        self.assertFalse(result["safe"])
+        self.assertEqual(result["source"], "api")
+    
+    def test_local_moderation_sampling_is_deterministic(self):
+        """Test the same clean text is always sampled the same way"""
+        self.agent._local_moderation_sample_rate = 0.5
+        texts = [f"A practical look at AI adoption, part {i}" for i in range(40)]
+        
+        first = [self.agent._passes_local_moderation(text) for text in texts]
+        second = [self.agent._passes_local_moderation(text) for text in texts]
+        
+        self.assertEqual(first, second)
+        self.assertIn(True, first)
+        self.assertIn(False, first)
+    
+    def test_flagged_content_skips_review(self):
+        """Test content flagged by moderation never pays for the AI review"""
+        flagged = Mock(flagged=True)
+        flagged.categories.model_dump.return_value = {}
+        flagged.category_scores.model_dump.return_value = {}
+        create = AsyncMock()
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.moderations.create = AsyncMock(return_value=Mock(results=[flagged]))
+        self.agent.openai_client.chat.completions.create = create
+        
+        response = self.agent.run_async(self.agent.review_content({"text": "A post about a bomb"}))
+        
+        create.assert_not_awaited()
+        self.assertFalse(response["data"]["approved"])
+    
+    def test_brand_alignment_by_embedding(self):
+        """Test a clear embedding similarity scores brand alignment without a chat request"""
+        create = AsyncMock(side_effect=lambda model, input: Mock(data=[Mock(embedding=[1.0, 0.0]) for _ in input]))
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.embeddings.create = create
+        self.agent.openai_client.chat.completions.create = AsyncMock()
+        
+        brand_check = self.agent.run_async(self.agent.validate_brand_alignment("An on-brand post"))
+        
+        self.assertEqual(brand_check["score"], 5.0)
+        self.assertEqual(brand_check["method"], "embeddings")
+        self.assertEqual(create.await_count, 2)
+        self.agent.openai_client.chat.completions.create.assert_not_awaited()
+    
+    def test_review_scores_clear_brand_alignment_by_embedding(self):
+        """Test a clear embedding score drops brand alignment from the review request, and a borderline one keeps it"""
+        content_vectors = {"On-brand post": [1.0, 0.0], "Borderline post": [0.3, 0.95]}
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.embeddings.create = AsyncMock(
+            side_effect=lambda model, input: Mock(data=[Mock(embedding=content_vectors.get(text, [1.0, 0.0])) for text in input])
+        )
+        self.agent.openai_client.chat.completions.create = AsyncMock(side_effect=[
+            FakeReviewStream(f'{{"ai_review": {ai_review_json(4.0)}}}'),
+            FakeReviewStream(f'{{"ai_review": {ai_review_json(4.0)}, "brand_alignment": {brand_json(4.5)}}}')
+        ])
+        
+        clear = self.agent.run_async(self.agent.review_content({"text": "On-brand post"}, moderation_result={"safe": True}))
+        borderline = self.agent.run_async(self.agent.review_content({"text": "Borderline post"}, moderation_result={"safe": True}))
+        
+        formats = [call.kwargs["response_format"]["json_schema"]["name"]
+                   for call in self.agent.openai_client.chat.completions.create.await_args_list]
+        self.assertEqual(formats, ["AIReviewOnlyResult", "FullReviewResult"])
+        self.assertEqual(clear["data"]["detailed_scores"]["brand_alignment_score"], 5.0)
+        self.assertEqual(borderline["data"]["detailed_scores"]["brand_alignment_score"], 4.5)
+    
+    def test_review_cache(self):
+        """Test repeat reviews of the same content reuse the cached result"""
+        create = AsyncMock(side_effect=lambda **kwargs: FakeReviewStream(
+            f'{{"ai_review": {ai_review_json(4.0)}, ', f'"brand_alignment": {brand_json(4.5)}}}'
+        ))
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = create
+        
+        components = {"hook": "Test hook", "hashtags": ["#AI"]}
+        first = self.agent.run_async(self.agent.run_full_review("Same post", components))
+        second = self.agent.run_async(self.agent.run_full_review("Same post", components))
+        
+        self.assertEqual(first, second)
+        self.assertEqual(first["brand_alignment"]["score"], 4.5)
+        self.assertEqual(create.await_count, 1)
+    
+    def test_review_retries_rate_limit(self):
+        """Test a rate-limited review is retried instead of falling back to a neutral score"""
+        response = httpx.Response(429, headers={"retry-after": "0"}, request=httpx.Request("POST", "https://api.openai.com"))
+        create = AsyncMock(side_effect=[
+            RateLimitError("Rate limited", response=response, body=None),
+            FakeReviewStream(f'{{"ai_review": {ai_review_json(4.0)}, "brand_alignment": {brand_json(4.5)}}}')
+        ])
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = create
+        
+        review = self.agent.run_async(self.agent.run_full_review("Retried post", {}))
+        
+        self.assertEqual(review["ai_review"]["overall_score"], 4.0)
+        self.assertEqual(create.await_count, 2)
+    
+    def test_review_stops_on_critical_issue(self):
+        """Test the review stream is closed once the AI review reports a critical issue"""
+        stream = FakeReviewStream(
+            f'{{"ai_review": {ai_review_json(2.0, ["Critical: false claim"])}, ',
+            f'"brand_alignment": {brand_json(4.5)}}}'
+        )
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = AsyncMock(return_value=stream)
+        
+        review = self.agent.run_async(self.agent.run_full_review("Post with a false claim", {}))
+        
+        self.assertEqual(review["ai_review"]["overall_score"], 2.0)
+        self.assertIn("skipped", review["brand_alignment"]["issues"][0])
+        self.assertEqual(stream.consumed, 1)
+        self.assertTrue(stream.closed)
 
 
 class TestSchedulerAgent(unittest.TestCase):
@@ -197,6 +709,202 @@ class TestDistributionAgent(unittest.TestCase):
         optimized = self.agent.optimize_content_for_platform(content, "linkedin")
         self.assertIsInstance(optimized, dict)
         self.assertIn("text", optimized)
+    
+    def test_x_hashtags_fit_limit(self):
+        """Test the hashtags appended for X are the ones checked against the length limit"""
+        content = {"text": "x" * 260, "hashtags": ["#AI", "#ML", "#Data", "#Strategy", "#Leadership"]}
+        optimized = self.agent.optimize_content_for_platform(content, "x")
+        self.assertTrue(optimized["text"].endswith("#AI #ML #Data"))
+        self.assertLessEqual(len(optimized["text"]), 280)
+    
+    def test_image_prompt_from_template(self):
+        """Test the image prompt is built without a chat completion"""
+        self.agent.openai_client = Mock()
+        prompt = self.agent.run_async(
+            self.agent.create_image_prompt_from_content("Agents are changing work.", "AI agents", ["#AI"])
+        )
+        self.assertIn("AI agents", prompt)
+        self.assertIn("Themes: AI", prompt)
+        self.agent.openai_client.chat.completions.create.assert_not_called()
+    
+    def test_content_truncated_at_sentence(self):
+        """Test long content is cut at the last sentence boundary that fits"""
+        content = {"text": "First sentence here. " * 10 + "x" * 300}
+        optimized = self.agent.optimize_content_for_platform(content, "x")
+        self.assertTrue(optimized["text"].endswith("here...."))
+        self.assertLessEqual(len(optimized["text"]), 280)
+    
+    def test_publishing_status_counts_recent_attempts(self):
+        """Test status counters cover only the attempts still in the history"""
+        for i in range(105):
+            self.agent.log_publishing_attempt({}, "x" if i < 5 else "linkedin", {"success": i % 2 == 0})
+        
+        status = self.agent.get_publishing_status()["data"]
+        self.assertEqual(status["total_attempts"], 100)
+        self.assertEqual(status["successful_attempts"], 50)
+        self.assertNotIn("x", status["platform_stats"])
+        self.assertEqual(status["platform_stats"]["linkedin"]["success_rate"], 50.0)
+    
+    def test_publish_to_all_platforms(self):
+        """Test content is published to every enabled platform and unknown platforms fail alone"""
+        with patch.dict(os.environ, {"X_API_KEY": "key"}):
+            self.agent = DistributionAgent()
+        self.agent.optimization_settings["generate_images"] = False
+        self.agent.publish_to_linkedin = AsyncMock(return_value={"success": True, "post_id": "li-1"})
+        self.agent.publish_to_x = AsyncMock(return_value={"success": True, "post_id": "x-1"})
+        
+        response = self.agent.execute_task({
+            "task_type": "publish_content",
+            "content": {"text": "Test post"},
+            "platforms": ["linkedin", "x", "myspace"]
+        })
+        
+        results = response["data"]["publishing_results"]
+        self.assertEqual(response["data"]["successful_platforms"], 2)
+        self.assertEqual(results["x"]["post_id"], "x-1")
+        self.assertFalse(results["myspace"]["success"])
+    
+    def test_publish_batch_keeps_order(self):
+        """Test a batch publish returns one result per content, in input order"""
+        self.agent.optimization_settings["generate_images"] = False
+        self.agent.publish_to_linkedin = AsyncMock(side_effect=lambda content, **kwargs: {
+            "success": True, "post_id": content["text"]
+        })
+        
+        response = self.agent.execute_task({
+            "task_type": "publish_content_batch",
+            "contents": [{"text": "first"}, {"text": "second"}]
+        })
+        
+        post_ids = [result["data"]["publishing_results"]["linkedin"]["post_id"] for result in response["data"]["results"]]
+        self.assertEqual(post_ids, ["first", "second"])
+        self.assertEqual(response["data"]["published_count"], 2)
+    
+    def test_no_image_for_text_only_platforms(self):
+        """Test no image is generated when no target platform can post one"""
+        with patch.dict(os.environ, {"X_API_KEY": "key"}):
+            self.agent = DistributionAgent()
+        self.agent.generate_content_image_from_content = AsyncMock()
+        self.agent.publish_to_x = AsyncMock(return_value={"success": True, "post_id": "x-1"})
+        
+        response = self.agent.run_async(self.agent.publish_content({"text": "Test post"}, ["x"]))
+        
+        self.assertFalse(response["data"]["image_generated"])
+        self.agent.generate_content_image_from_content.assert_not_awaited()
+    
+    def test_concurrency_slots_work_across_event_loops(self):
+        """Test the platform and image limits can be contended from more than one event loop"""
+        async def contend():
+            slots = self.agent._image_slots
+            for _ in range(IMAGE_CONCURRENCY):
+                await slots.acquire()
+            waiter = asyncio.create_task(slots.acquire())
+            await asyncio.sleep(0)
+            slots.release()
+            await waiter
+            for _ in range(IMAGE_CONCURRENCY):
+                slots.release()
+            return slots
+        
+        first = asyncio.run(contend())
+        second = asyncio.run(contend())
+        shared = self.agent.run_async(contend())
+        
+        self.assertIsNot(first, second)
+        self.assertIs(self.agent.run_async(contend()), shared)
+        self.assertIs(DistributionAgent().run_async(contend()), shared)
+    
+    def test_http_client_owned_and_closed_per_agent(self):
+        """Test each distributor owns its HTTP client and close() releases it"""
+        other = DistributionAgent()
+        client = self.agent.run_async(self._http_client_of(self.agent))
+        self.assertIsNot(client, other.run_async(self._http_client_of(other)))
+        
+        self.agent.close()
+        other.close()
+        
+        self.assertTrue(client.is_closed)
+        self.assertIsNone(self.agent._http_client)
+    
+    @staticmethod
+    async def _http_client_of(agent):
+        return agent.http_client
+    
+    def test_generate_image_task_result_is_serializable(self):
+        """Test the image task returns a URL or base64 string, while publishing gets decoded bytes"""
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.images.generate = AsyncMock(side_effect=[
+            Mock(data=[Mock(url="https://images.example/1.png")]),
+            Mock(data=[Mock(b64_json=base64.b64encode(b"png").decode())]),
+            Mock(data=[Mock(b64_json=base64.b64encode(b"png").decode())])
+        ])
+        
+        response = self.agent.execute_task({"task_type": "generate_image", "prompt": "A chart"})
+        self.assertEqual(response["data"]["url"], "https://images.example/1.png")
+        json.dumps(response)
+        
+        response = self.agent.execute_task({"task_type": "generate_image", "prompt": "A chart", "include_base64": True})
+        self.assertEqual(base64.b64decode(response["data"]["b64_json"]), b"png")
+        json.dumps(response)
+        
+        self.agent.create_image_prompt_from_content = AsyncMock(return_value="A chart")
+        result = self.agent.run_async(self.agent._generate_image_async({"text": "Test post"}))
+        self.assertEqual(result["data"]["bytes"], b"png")
+        self.assertNotIn("b64_json", result["data"])
+    
+    def test_linkedin_profile_cached(self):
+        """Test the LinkedIn profile is fetched once and reused for later posts"""
+        request = httpx.Request("GET", "https://api.linkedin.com")
+        self.agent.platforms["linkedin"]["access_token"] = "token"
+        self.agent._http_client = Mock()
+        self.agent._http_client.get = AsyncMock(return_value=httpx.Response(200, json={"id": "abc"}, request=request))
+        self.agent._http_client.post = AsyncMock(return_value=httpx.Response(201, json={"id": "post-1"}, request=request))
+        
+        for _ in range(2):
+            result = self.agent.run_async(self.agent.publish_to_linkedin({"text": "Test post"}))
+            self.assertTrue(result["success"])
+        
+        self.assertEqual(self.agent._http_client.get.await_count, 1)
+        self.assertEqual(json.loads(self.agent._http_client.post.call_args.kwargs["content"])["author"], "urn:li:person:abc")
+    
+    def test_linkedin_image_uploaded(self):
+        """Test generated image bytes are uploaded to LinkedIn and attached as an asset"""
+        request = httpx.Request("POST", "https://api.linkedin.com")
+        upload_url = "https://api.linkedin.com/mediaUpload/1"
+        self.agent.platforms["linkedin"]["access_token"] = "token"
+        self.agent._http_client = Mock()
+        self.agent._http_client.get = AsyncMock(return_value=httpx.Response(200, json={"id": "abc"}, request=request))
+        self.agent._http_client.put = AsyncMock(return_value=httpx.Response(201, request=request))
+        self.agent._http_client.post = AsyncMock(side_effect=[
+            httpx.Response(200, json={"value": {
+                "asset": "urn:li:digitalmediaAsset:1",
+                "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {"uploadUrl": upload_url}}
+            }}, request=request),
+            httpx.Response(201, json={"id": "post-1"}, request=request)
+        ])
+        
+        result = self.agent.run_async(self.agent.publish_to_linkedin({"text": "Test post"}, {"bytes": b"png"}))
+        
+        self.assertTrue(result["success"])
+        self.agent._http_client.put.assert_awaited_once_with(upload_url, headers={"Authorization": "Bearer token"}, content=b"png")
+        post_data = json.loads(self.agent._http_client.post.call_args.kwargs["content"])
+        share = post_data["specificContent"]["com.linkedin.ugc.ShareContent"]
+        self.assertEqual(share["media"][0]["media"], "urn:li:digitalmediaAsset:1")
+    
+    def test_post_retried_after_rate_limit(self):
+        """Test a rate-limited post is retried after the requested delay"""
+        request = httpx.Request("POST", "https://api.twitter.com")
+        self.agent.platforms["x"]["access_token"] = "token"
+        self.agent._http_client = Mock()
+        self.agent._http_client.post = AsyncMock(side_effect=[
+            httpx.Response(429, headers={"retry-after": "0"}, request=request),
+            httpx.Response(201, json={"data": {"id": "tweet-1"}}, request=request)
+        ])
+        
+        result = self.agent.run_async(self.agent.publish_to_x({"text": "Test post"}))
+        
+        self.assertEqual(result["post_id"], "tweet-1")
+        self.assertEqual(self.agent._http_client.post.await_count, 2)
 
 
 class TestRoadmapGeneratorAgent(unittest.TestCase):
@@ -217,6 +925,11 @@ class TestRoadmapGeneratorAgent(unittest.TestCase):
         context = {"industry": "consulting"}
         framework = self.agent.select_roadmap_framework(objectives, context)
         self.assertIn(framework, self.agent.roadmap_frameworks.keys())
+        
+        # Keywords inside longer words count, as with a substring check
+        self.assertEqual(self.agent.select_roadmap_framework(["Reoptimization of routes"], context), "business_optimization")
+        self.assertEqual(self.agent.select_roadmap_framework(["AI innovations"], context), "ai_innovation_strategy")
+        self.assertEqual(self.agent.select_roadmap_framework(["Launch a chatbot"], context), "ai_implementation")
     
     def test_deliverables_extraction(self):
         """Test deliverables extraction from phases"""
@@ -228,6 +941,173 @@ class TestRoadmapGeneratorAgent(unittest.TestCase):
         self.assertEqual(len(deliverables), 4)
         self.assertIn("Phase 1 Report", deliverables)
 
+        table = PhaseTable.from_phases(phases)
+        self.assertEqual(self.agent.extract_deliverables_from_phases(table), deliverables)
+        self.assertEqual(len(table), 2)
+        self.assertEqual([p["deliverables"] for p in table.phases], [p["deliverables"] for p in phases])
+
+    def test_readiness_batch_matches_single_assessment(self):
+        """Test bulk readiness scoring agrees with the single assessment"""
+        assessments = [
+            {"leadership_buy_in": 9, "data_quality": 8, "tech_team_skills": 8, "change_readiness": 8, "budget_commitment": 9},
+            {"leadership_buy_in": 7, "data_quality": 6},
+            {}
+        ]
+        response = self.agent.execute_task({"task_type": "assess_readiness_batch", "assessments": assessments})
+
+        self.assertTrue(response["success"])
+        levels = [a["readiness_level"] for a in response["data"]["assessments"]]
+        self.assertEqual([l.split(" ")[0] for l in levels], ["High", "Low", "Low"])
+        for assessment, scored in zip(assessments, response["data"]["assessments"]):
+            single = self.agent.assess_organizational_readiness(assessment)["data"]
+            self.assertEqual(single["readiness_score"], scored["readiness_score"])
+            self.assertEqual(single["readiness_level"], scored["readiness_level"])
+
+    def test_roadmap_and_risks_requested_together(self):
+        """Test the roadmap and risk assessment requests are in flight at the same time"""
+        in_flight = []
+        roadmap = {"phases": [{"name": "Planning & Preparation", "deliverables": ["Plan"]}], "milestones": []}
+        risks = {"risks": [], "overall_risk_level": "Low", "key_recommendations": []}
+
+        async def create(**kwargs):
+            in_flight.append(kwargs)
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(in_flight), 2)
+            if kwargs.get("stream"):
+                return FakeReviewStream(json.dumps(roadmap)[:20], json.dumps(roadmap)[20:])
+            return Mock(choices=[Mock(message=Mock(content=json.dumps(risks)))])
+
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = AsyncMock(side_effect=create)
+        self.agent.openai_client.embeddings.create = AsyncMock(return_value=Mock(data=[Mock(embedding=[1.0, 0.0])]))
+
+        response = self.agent.execute_task({"task_type": "generate_roadmap", "ai_objectives": ["Forecast lobster harvests"]})
+
+        self.assertTrue(response["success"])
+        result = response["data"]["roadmap"]
+        self.assertEqual(result["deliverables"], ["Plan"])
+        self.assertEqual(result["risk_assessment"]["overall_risk_level"], "Low")
+
+    def test_roadmap_cache_exact_and_semantic_hits(self):
+        """Test repeated and near-identical requests reuse a cached roadmap within the same scope"""
+        roadmap = {"phases": [], "milestones": []}
+        embeddings = {"Automate reporting": [1.0, 0.0], "Automate the reporting": [0.99, 0.14], "Launch a chatbot": [0.0, 1.0]}
+
+        async def embed(model, input):
+            vectors = [next(v for k, v in embeddings.items() if f'"{k}"' in text) for text in input]
+            return Mock(data=[Mock(embedding=vector) for vector in vectors])
+
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.embeddings.create = AsyncMock(side_effect=embed)
+        self.agent.openai_client.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: FakeReviewStream(json.dumps(roadmap))
+        )
+
+        def generate(objective, industry="retail"):
+            return asyncio.run(self.agent.generate_ai_roadmap(
+                {}, [objective], "12 months", "moderate", industry, "medium", "ai_implementation"
+            ))
+
+        generate("Automate reporting")
+        generate("Automate reporting")
+        generate("Automate the reporting")
+        self.assertEqual(self.agent.openai_client.chat.completions.create.await_count, 1)
+        # The near-identical request and the unembedded first entry share one embeddings call
+        self.assertEqual(self.agent.openai_client.embeddings.create.await_count, 1)
+        self.assertEqual(len(self.agent.openai_client.embeddings.create.await_args.kwargs["input"]), 2)
+
+        generate("Launch a chatbot")
+        generate("Automate reporting", industry="banking")
+        self.assertEqual(self.agent.openai_client.chat.completions.create.await_count, 3)
+        # A request in a scope with nothing cached yet is not embedded
+        self.assertEqual(self.agent.openai_client.embeddings.create.await_count, 2)
+
+        self.agent._cache.semantic = False
+        generate("Automate the reporting", industry="banking")
+        self.assertEqual(self.agent.openai_client.chat.completions.create.await_count, 4)
+        self.assertEqual(self.agent.openai_client.embeddings.create.await_count, 2)
+
+    def test_roadmap_details_built_from_streamed_phases(self):
+        """Test implementation details come from the streamed phases, with a fallback for unparseable streams"""
+        phases = [{"name": "Planning & Preparation", "deliverables": ["Plan"]}]
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.embeddings.create = AsyncMock(return_value=Mock(data=[Mock(embedding=[1.0, 0.0])]))
+        self.agent.openai_client.chat.completions.create = AsyncMock(side_effect=[
+            FakeReviewStream('{"phases": ', json.dumps(phases), ', "milestones": [', "]}"),
+            FakeReviewStream('{"phases": [', "oops"),
+            Mock(choices=[Mock(message=Mock(content=json.dumps({"phases": phases})))])
+        ])
+
+        with patch.object(self.agent, "add_implementation_details", wraps=self.agent.add_implementation_details) as details:
+            response = asyncio.run(self.agent.generate_implementation_roadmap({"ai_objectives": ["Automate reporting"]}))
+        self.assertEqual(details.call_count, 1)
+        self.assertEqual(response["data"]["roadmap"]["workshops"][0]["phase"], "Planning & Preparation")
+
+        roadmap = asyncio.run(self.agent.generate_ai_roadmap(
+            {}, ["Launch a chatbot"], "12 months", "moderate", "retail", "medium", "ai_implementation"
+        ))
+        self.assertEqual(roadmap["phases"], phases)
+        self.assertEqual(self.agent.openai_client.chat.completions.create.await_count, 3)
+
+    def test_roadmaps_batch_split_by_index(self):
+        """Test several roadmaps share one completion and are returned in request order"""
+        batch = {"roadmaps": [{"phases": [{"name": "A"}]}, {"phases": [{"name": "B"}]}]}
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.embeddings.create = AsyncMock(return_value=Mock(data=[Mock(embedding=[1.0, 0.0])]))
+        self.agent.openai_client.chat.completions.create = AsyncMock(
+            side_effect=[
+                Mock(choices=[Mock(message=Mock(content=json.dumps(batch)))]),
+                FakeReviewStream(json.dumps({"phases": [{"name": "C"}]}))
+            ]
+        )
+
+        requirements = [
+            {"ai_objectives": ["Automate reporting"], "industry": "retail"},
+            {"ai_objectives": ["Automate reporting"], "industry": "banking"},
+            {"ai_objectives": ["Automate reporting"], "industry": "education"}
+        ]
+        roadmaps = asyncio.run(self.agent.generate_roadmaps_batch(requirements))
+
+        self.assertEqual([r["phases"][0]["name"] for r in roadmaps], ["A", "B", "C"])
+        self.assertEqual(self.agent.openai_client.chat.completions.create.await_count, 2)
+        prompt = self.agent.openai_client.chat.completions.create.await_args_list[0].kwargs["messages"][-1]["content"]
+        self.assertIn("Input 3:", prompt)
+
+    def test_json_completion_retries_unparseable_output(self):
+        """Test a malformed JSON response is requested once more at temperature 0"""
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = AsyncMock(side_effect=[
+            Mock(choices=[Mock(message=Mock(content='{"phases": ['))]),
+            Mock(choices=[Mock(message=Mock(content='{"phases": []}'))])
+        ])
+
+        result = asyncio.run(self.agent.json_completion("system", "prompt", 0.2, 2500))
+
+        self.assertEqual(result, {"phases": []})
+        calls = self.agent.openai_client.chat.completions.create.await_args_list
+        self.assertEqual([c.kwargs["temperature"] for c in calls], [0.2, 0.0])
+        self.assertEqual(calls[0].kwargs["max_tokens"], 2500)
+        self.assertEqual(calls[0].kwargs["seed"], 42)
+
+    def test_rule_based_risk_assessment(self):
+        """Test common inputs are assessed from the rule table and novel ones go to the model"""
+        self.agent.openai_client = Mock()
+        self.agent.openai_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("no model calls"))
+        self.agent.openai_client.embeddings.create = AsyncMock(return_value=Mock(data=[Mock(embedding=[1.0, 0.0])]))
+
+        assessment = asyncio.run(self.agent.generate_risk_assessment(
+            {"industry": "healthcare"}, ["Improve customer service with predictive analytics"]
+        ))
+        self.assertEqual(len(assessment["risks"]), len(self.agent.risk_categories))
+        self.assertEqual(assessment["overall_risk_level"], "High")
+        compliance = next(r for r in assessment["risks"] if r["category"] == "Regulatory Compliance")
+        self.assertEqual(compliance["probability"], "High")
+        self.agent.openai_client.chat.completions.create.assert_not_awaited()
+
+        self.assertIsNone(self.agent.rule_based_risk_assessment({}, ["Forecast lobster harvests"]))
+        asyncio.run(self.agent.generate_risk_assessment({"industry": "retail"}, ["Improve sales"], force_llm=True))
+        self.agent.openai_client.chat.completions.create.assert_awaited_once()
+
 
 if __name__ == "__main__":
     # Create test suite
@@ -0,0 +1,22 @@
+"""
+Identifier helpers
+Time-ordered UUIDs so ids sort by creation time
+"""
+
+import secrets
+import time
+import uuid
+
+def _uuid7() -> uuid.UUID:
+    # 48-bit Unix time in milliseconds, then version 7, variant and 74 random bits (RFC 9562)
+    value = (time.time_ns() // 1_000_000) << 80 | secrets.randbits(80)
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+# The standard library provides uuid7 from Python 3.14
+uuid7 = getattr(uuid, "uuid7", _uuid7)
+
+def time_ordered_id() -> str:
+    """Return a new UUIDv7 string; ids from different milliseconds sort in creation order"""
+    return str(uuid7())
@@ -0,0 +1,148 @@
+"""
+Incremental JSON parsing for streamed model output
+Surfaces top-level object fields as soon as they are complete
+"""
+
+import json
+import re
+from typing import Any, List, Tuple
+
+_WHITESPACE = re.compile(r"\s*")
+
+# Inside a string only quotes and escapes matter; outside, only brackets and quotes
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+
+# A bare scalar (number, true, false, null) ends at the next delimiter
+_SCALAR_END = re.compile(r"[\s,}\]]")
+
+class IncrementalObjectParser:
+    """Parse a JSON object fed in chunks, returning top-level fields as they close
+
+    Each chunk is scanned once: the bracket depth and string state of the
+    field being read are kept between feed() calls, and a field's text is only
+    joined and decoded once it is complete, so parsing stays linear in the
+    length of the stream however it is chunked.
+    """
+
+    def __init__(self):
+        # "start" (before "{"), "key" (before a key, "," or "}"), "colon", "value" or "token" (inside one)
+        self._state = "start"
+        self.done = False
+
+        # The key whose value is being read
+        self._key = None
+
+        # Scan state of the key or value currently being read
+        self._reading_key = False
+        self._parts = []
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def _begin_token(self, char: str, reading_key: bool):
+        self._reading_key = reading_key
+        self._parts = []
+        self._scalar = char not in '{["'
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def _scan_token(self, chunk: str, pos: int) -> int:
+        """Scan the current token from pos, returning where it ends in the chunk or -1 if it continues"""
+        if self._scalar:
+            match = _SCALAR_END.search(chunk, pos)
+            return match.start() if match else -1
+
+        length = len(chunk)
+        while pos < length:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, pos)
+                if match is None:
+                    return -1
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+            else:
+                match = _STRUCTURAL.search(chunk, pos)
+                if match is None:
+                    return -1
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+        return -1
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Add a chunk of text and return any (key, value) pairs completed by it"""
+        fields = []
+        pos = 0
+        length = len(text)
+
+        while pos < length and not self.done:
+            if self._state == "token":
+                start = pos
+                end = self._scan_token(text, pos)
+                if end < 0:
+                    self._parts.append(text[start:])
+                    break
+
+                self._parts.append(text[start:end])
+                value = json.loads("".join(self._parts))
+                self._parts = []
+                pos = end
+
+                if self._reading_key:
+                    self._key = value
+                    self._state = "colon"
+                else:
+                    fields.append((self._key, value))
+                    self._state = "key"
+                continue
+
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos >= length:
+                break
+            char = text[pos]
+
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError(f"Expected JSON object, got {char!r}")
+                self._state = "key"
+                pos += 1
+            elif self._state == "key":
+                if char == "}":
+                    self.done = True
+                    pos += 1
+                elif char == ",":
+                    pos += 1
+                elif char == '"':
+                    self._begin_token(char, reading_key=True)
+                    self._state = "token"
+                else:
+                    raise ValueError(f"Expected a key, got {char!r}")
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' after key {self._key!r}")
+                self._state = "value"
+                pos += 1
+            else:
+                self._begin_token(char, reading_key=False)
+                self._state = "token"
+
+        return fields
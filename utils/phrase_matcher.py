@@ -0,0 +1,39 @@
+"""
+Multi-phrase matching in a single pass over the text
+Compiles every phrase into one regex alternation instead of scanning per phrase
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+class PhraseMatcher:
+    """Find labelled phrases in text, case-insensitively and on word boundaries
+
+    With prefix=True a phrase only needs to start at a word boundary, so a stem
+    such as "kill" also matches "killed" and "killing". With anywhere=True it
+    may occur inside a word too, like a case-insensitive substring test.
+    """
+
+    def __init__(self, phrases: Dict[str, Iterable[str]], prefix: bool = False, anywhere: bool = False):
+        self._labels = {}
+        for label, label_phrases in phrases.items():
+            for phrase in label_phrases:
+                self._labels.setdefault(phrase.lower(), label)
+
+        # Longest first so overlapping phrases match the longer one
+        alternation = "|".join(map(re.escape, sorted(self._labels, key=len, reverse=True)))
+        start = "" if anywhere else r"\b"
+        end = "" if prefix or anywhere else r"\b"
+        self._pattern = re.compile(rf"{start}(?:{alternation}){end}", re.IGNORECASE) if self._labels else None
+
+    def find(self, text: str) -> List[Tuple[str, str]]:
+        """Return (label, phrase) for each distinct phrase found, in order of first appearance"""
+        if self._pattern is None or not text:
+            return []
+
+        hits = dict.fromkeys(match.group(0).lower() for match in self._pattern.finditer(text))
+        return [(self._labels[phrase], phrase) for phrase in hits]
+
+    def search(self, text: str) -> bool:
+        """Whether any phrase occurs in the text"""
+        return self._pattern is not None and self._pattern.search(text) is not None
@@ -0,0 +1,79 @@
+"""
+Retry helpers for OpenAI and platform API calls
+Exponential backoff with jitter, honoring Retry-After on rate limits
+"""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+# Transient failures worth another attempt; APITimeoutError subclasses APIConnectionError
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# HTTP statuses worth another attempt: rate limited or a temporary server fault
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# For requests that must not be repeated once the server may have acted on them (e.g. creating a post):
+# only rate limiting and failures to connect guarantee the request was not processed
+UNSENT_STATUS_CODES = frozenset({429})
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+def response_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Seconds a response asked us to wait, if it says"""
+    if response is None:
+        return None
+
+    try:
+        return max(0.0, float(response.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, if the error response says"""
+    return response_retry_after(getattr(error, "response", None))
+
+def _delay(requested: Optional[float], attempt: int, initial_delay: float, max_delay: float) -> float:
+    if requested is None:
+        requested = initial_delay * 2 ** attempt + random.uniform(0, initial_delay)
+    return min(requested, max_delay)
+
+def backoff_delay(error: Exception, attempt: int, initial_delay: float = 1.0, max_delay: float = 20.0) -> float:
+    """Delay before the next attempt: Retry-After if given, else exponential backoff plus jitter"""
+    return _delay(retry_after(error), attempt, initial_delay, max_delay)
+
+async def with_retry(fn: Callable[..., Awaitable[Any]], *args, attempts: int = 3,
+                     initial_delay: float = 1.0, max_delay: float = 20.0, **kwargs) -> Any:
+    """Await fn(*args, **kwargs), retrying transient OpenAI errors up to attempts times in total"""
+    for attempt in range(attempts):
+        try:
+            return await fn(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(backoff_delay(e, attempt, initial_delay, max_delay))
+
+async def request_with_retry(send: Callable[[], Awaitable[httpx.Response]], attempts: int = 3,
+                             initial_delay: float = 1.0, max_delay: float = 20.0,
+                             retry_statuses: frozenset = RETRYABLE_STATUS_CODES,
+                             retry_errors: tuple = (httpx.TransportError,)) -> httpx.Response:
+    """Await send() for an HTTP response, retrying transport errors and retryable statuses
+
+    The last response is returned even if its status is retryable, so callers
+    report the API error as they would have without retries.
+    """
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await send()
+        except retry_errors:
+            if last_attempt:
+                raise
+            await asyncio.sleep(_delay(None, attempt, initial_delay, max_delay))
+            continue
+
+        if response.status_code not in retry_statuses or last_attempt:
+            return response
+        await asyncio.sleep(_delay(response_retry_after(response), attempt, initial_delay, max_delay))
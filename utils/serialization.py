@@ -0,0 +1,38 @@
+"""
+JSON serialization helpers for hot paths
+Uses orjson when installed and falls back to the standard library
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+# msgspec Structs were considered for agent responses and not adopted: every
+# agent, the workflow and the Flask routes consume create_response payloads as
+# plain dicts, so Structs would need a to_dict shim that copies them back, and
+# agents run in-process with no wire boundary between them. New encoding
+# should go through these helpers rather than a second serializer.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize an object to a compact JSON string
+
+    default is called for objects JSON cannot represent, as with json.dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), default=default)
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize an object to compact UTF-8 JSON bytes, e.g. for a request body"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), default=default).encode()
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string or bytes payload"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -404,15 +404,19 @@ class ContentWorkflow:
             rejected_content = []
             editing_errors = []
             
-            for i, content_item in enumerate(content_list):
+            # Review all content in one task so moderation checks are batched
+            batch_result = editor.execute_task({
+                "task_type": "edit_content",
+                "contents": [content_item.get("content", {}) for content_item in content_list]
+            }) if content_list else {"success": True, "data": {"results": []}}
+            
+            if not batch_result.get("success"):
+                editing_errors.append(batch_result.get("error", "Unknown error"))
+            
+            review_results = batch_result.get("data", {}).get("results", [])
+            
+            for i, (content_item, result) in enumerate(zip(content_list, review_results)):
                 try:
-                    task_data = {
-                        "task_type": "edit_content",
-                        "content": content_item.get("content", {})
-                    }
-                    
-                    result = editor.execute_task(task_data)
-                    
                     if result.get("success"):
                         review_data = result.get("data", {})
                         
@@ -707,3 +711,13 @@ class ContentWorkflow:
         for job_id in old_jobs:
             del self.active_jobs[job_id]
             self.logger.warning(f"Cleaned up stale job: {job_id}")
+    
+    def shutdown(self):
+        """Release agent resources, such as pooled connections, when the system stops"""
+        self.communication_hub.close()
+        
+        for agent_name, agent in self.agents.items():
+            try:
+                agent.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close agent {agent_name}: {e}")